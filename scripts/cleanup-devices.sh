@@ -213,7 +213,7 @@ decommission_by_status() {
 cleanup_local() {
     echo "Cleaning up local simulator data..."
 
-    local db_files=$(find . -name "*.db" -o -name "*.sqlite" 2>/dev/null)
+    local db_files=$(find . -name "*.db" -o -name "*.db-wal" -o -name "*.db-shm" -o -name "*.sqlite" 2>/dev/null)
     local log_files=$(find . -name "simulator.log" 2>/dev/null)
 
     if [ -n "$db_files" ]; then
@@ -4,5 +4,12 @@ from .auth import AuthClient
 from .inventory import InventoryClient
 from .deployments import DeploymentsClient
 from .exceptions import AuthenticationError
+from .session import create_session
 
-__all__ = ["AuthClient", "InventoryClient", "DeploymentsClient", "AuthenticationError"]
+__all__ = [
+    "AuthClient",
+    "InventoryClient",
+    "DeploymentsClient",
+    "AuthenticationError",
+    "create_session",
+]
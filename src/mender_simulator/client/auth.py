@@ -1,22 +1,76 @@
 """Mender Authentication Client."""
 
 import aiohttp
+import asyncio
+import base64
+import hashlib
 import logging
 import json
-from typing import Optional
+import orjson
+import time
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
 
-from ..utils.crypto import sign_data
+from .session import CACHE_MAX_ENTRIES, HeaderCache, create_session
+from ..utils.crypto import sign_data, sign_with_key
 
 logger = logging.getLogger(__name__)
 
+# How long a token validity check result is trusted (seconds)
+TOKEN_VALID_TTL = 60.0
+TOKEN_INVALID_TTL = 5.0
+
+# Re-authenticate this long before a token's exp claim (seconds)
+TOKEN_REFRESH_WINDOW = 60.0
+
+
+def _jwt_expiry(token: str) -> Optional[float]:
+    """
+    Extract the ``exp`` claim (epoch seconds) from a JWT without verifying it.
+
+    The token was issued by the Mender server to this device, so it is
+    trusted; we only need its expiry for local caching decisions.
+
+    Returns:
+        Expiry timestamp, or None if the token cannot be decoded
+    """
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        claims = orjson.loads(base64.urlsafe_b64decode(payload))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
 
 class AuthClient:
     """Handles device authentication with Mender server."""
 
-    def __init__(self, server_url: str, tenant_token: str):
+    def __init__(
+        self,
+        server_url: str,
+        tenant_token: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        refresh_window: float = TOKEN_REFRESH_WINDOW,
+        sign_executor: Optional[Executor] = None
+    ):
         self.server_url = server_url.rstrip('/')
         self.tenant_token = tenant_token
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._url_auth = f"{self.server_url}/api/devices/v1/authentication/auth_requests"
+        self._url_attributes = f"{self.server_url}/api/devices/v1/inventory/device/attributes"
+        self._auth_headers = HeaderCache(content_type=None)
+        self.refresh_window = refresh_window
+        # RSA signing is CPU-bound; run it off the event loop. None uses the
+        # loop's default thread pool.
+        self.sign_executor = sign_executor
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        # token digest -> (is_valid, monotonic expiry of the cached result)
+        self._token_cache: Dict[bytes, Tuple[bool, float]] = {}
+        # device_id -> (token, exp claim in epoch seconds)
+        self._tokens: Dict[str, Tuple[str, float]] = {}
+        self._refresh_locks: Dict[str, asyncio.Lock] = {}
 
     async def __aenter__(self):
         await self._ensure_session()
@@ -26,20 +80,22 @@ class AuthClient:
         await self.close()
 
     async def _ensure_session(self) -> None:
-        """Ensure HTTP session is created."""
+        """Ensure HTTP session is created (only when none was injected)."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = create_session()
+            self._owns_session = True
 
     async def close(self) -> None:
-        """Close the HTTP session."""
-        if self._session and not self._session.closed:
+        """Close the HTTP session if this client created it."""
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
     async def authenticate(
         self,
         identity_data: dict,
         public_key_pem: str,
-        private_key_pem: str
+        private_key_pem: str,
+        signing_key: Optional[Any] = None
     ) -> Optional[str]:
         """
         Authenticate device with Mender server.
@@ -48,24 +104,34 @@ class AuthClient:
             identity_data: Device identity attributes
             public_key_pem: Device's public key in PEM format
             private_key_pem: Device's private key for signing
+            signing_key: Already parsed private key (see
+                utils.crypto.load_private_key); skips re-parsing the PEM
 
         Returns:
             JWT token if successful, None otherwise
         """
         await self._ensure_session()
 
-        url = f"{self.server_url}/api/devices/v1/authentication/auth_requests"
+        url = self._url_auth
 
-        # Prepare the authentication request body
+        # Prepare the authentication request body. id_data keeps the stdlib
+        # formatting: Mender hashes the raw string to identify the device, so
+        # it must stay byte-identical for already-registered devices.
         auth_request = {
             "id_data": json.dumps(identity_data),
             "pubkey": public_key_pem,
             "tenant_token": self.tenant_token
         }
 
-        # Sign the request body
-        request_body = json.dumps(auth_request, separators=(',', ':'))
-        signature = sign_data(private_key_pem, request_body.encode('utf-8'))
+        # Sign the request body (orjson output is compact and already bytes)
+        request_body = orjson.dumps(auth_request)
+        if signing_key is not None:
+            sign, key = sign_with_key, signing_key
+        else:
+            sign, key = sign_data, private_key_pem
+        signature = await asyncio.get_running_loop().run_in_executor(
+            self.sign_executor, sign, key, request_body
+        )
 
         headers = {
             "Content-Type": "application/json",
@@ -73,7 +139,7 @@ class AuthClient:
         }
 
         logger.debug(f"Auth request to: {url}")
-        logger.debug(f"Auth request body: {request_body[:200]}...")
+        logger.debug(f"Auth request body: {request_body[:200].decode('utf-8')}...")
 
         try:
             async with self._session.post(url, data=request_body, headers=headers) as response:
@@ -95,27 +161,140 @@ class AuthClient:
             logger.error(f"Authentication request failed: {e}")
             return None
 
+    async def authenticate_many(
+        self,
+        specs: Iterable[Mapping[str, Any]],
+        concurrency: int = 64
+    ) -> List[Any]:
+        """
+        Authenticate many devices concurrently with bounded parallelism.
+
+        All requests share this client's session, so a warm connection pool
+        is reused instead of opening a connection burst at fleet start.
+
+        Args:
+            specs: Keyword arguments for authenticate(), one mapping per device
+            concurrency: Maximum number of in-flight authentications
+
+        Returns:
+            One result per spec, in order: the token, None, or the exception raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(spec: Mapping[str, Any]) -> Optional[str]:
+            async with semaphore:
+                return await self.authenticate(**spec)
+
+        return await asyncio.gather(
+            *(_one(spec) for spec in specs),
+            return_exceptions=True
+        )
+
+    def token_expires_soon(self, token: str) -> bool:
+        """
+        Check whether a token is within the refresh window of its expiry.
+
+        Tokens without a readable exp claim are never considered expiring;
+        those are only replaced after the server rejects them.
+        """
+        exp = _jwt_expiry(token)
+        return exp is not None and exp - time.time() <= self.refresh_window
+
+    async def get_valid_token(
+        self,
+        device_id: str,
+        identity_data: dict,
+        public_key_pem: str,
+        private_key_pem: str,
+        signing_key: Optional[Any] = None
+    ) -> Optional[str]:
+        """
+        Return a cached token for the device, re-authenticating near expiry.
+
+        Concurrent callers for the same device share a single refresh.
+
+        Args:
+            device_id: Device identifier used as cache key
+            identity_data: Device identity attributes
+            public_key_pem: Device's public key in PEM format
+            private_key_pem: Device's private key for signing
+            signing_key: Already parsed private key, if available
+
+        Returns:
+            JWT token if available, None otherwise
+        """
+        cached = self._tokens.get(device_id)
+        if cached and cached[1] - time.time() > self.refresh_window:
+            return cached[0]
+
+        lock = self._refresh_locks.setdefault(device_id, asyncio.Lock())
+        async with lock:
+            # Another coroutine may have refreshed while we waited
+            cached = self._tokens.get(device_id)
+            if cached and cached[1] - time.time() > self.refresh_window:
+                return cached[0]
+
+            token = await self.authenticate(
+                identity_data, public_key_pem, private_key_pem, signing_key=signing_key
+            )
+            if token:
+                exp = _jwt_expiry(token)
+                self._tokens[device_id] = (token, exp if exp is not None else float("inf"))
+            return token
+
+    def invalidate_token(self, device_id: str) -> None:
+        """Forget the cached token for a device (e.g. after a 401)."""
+        self._tokens.pop(device_id, None)
+
     async def check_token_valid(self, token: str) -> bool:
         """
         Check if the authentication token is still valid.
 
+        Results are cached per token for a short time (and never past the
+        JWT expiry) so that polling loops do not hit the server every call.
+
         Args:
             token: JWT authentication token
 
         Returns:
             True if token is valid, False otherwise
         """
-        await self._ensure_session()
+        key = hashlib.blake2b(token.encode('utf-8'), digest_size=16).digest()
+        now = time.monotonic()
 
-        # Try to access a protected endpoint
-        url = f"{self.server_url}/api/devices/v1/inventory/device/attributes"
+        cached = self._token_cache.get(key)
+        if cached is not None:
+            if cached[1] > now:
+                return cached[0]
+            del self._token_cache[key]
 
-        headers = {
-            "Authorization": f"Bearer {token}"
-        }
+        await self._ensure_session()
 
+        # Try to access a protected endpoint
         try:
-            async with self._session.get(url, headers=headers) as response:
-                return response.status != 401
+            async with self._session.get(
+                self._url_attributes, headers=self._auth_headers.for_token(token)
+            ) as response:
+                valid = response.status != 401
         except aiohttp.ClientError:
             return False
+
+        self._cache_token_validity(key, token, valid, now)
+        return valid
+
+    def _cache_token_validity(self, key: bytes, token: str, valid: bool, now: float) -> None:
+        """Store a token validity result, capped at the token's own expiry."""
+        ttl = TOKEN_VALID_TTL if valid else TOKEN_INVALID_TTL
+        if valid:
+            exp = _jwt_expiry(token)
+            if exp is not None:
+                ttl = min(ttl, exp - time.time())
+        if ttl <= 0:
+            return
+
+        # Lazily prune expired entries so the cache can't grow unbounded
+        if len(self._token_cache) >= CACHE_MAX_ENTRIES:
+            self._token_cache = {
+                k: v for k, v in self._token_cache.items() if v[1] > now
+            }
+        self._token_cache[key] = (valid, now + ttl)
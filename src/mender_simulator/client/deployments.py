@@ -1,15 +1,25 @@
 """Mender Deployments Client."""
 
 import aiohttp
+import asyncio
 import logging
-from typing import Dict, Any, Optional, List
+import orjson
+import time
+from typing import Dict, Any, Optional, List, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
 from .exceptions import AuthenticationError
+from .session import CACHE_MAX_ENTRIES, HeaderCache, create_session
 
 logger = logging.getLogger(__name__)
 
+# How long a "no deployment" (204) answer is reused without asking again
+NO_DEPLOYMENT_TTL = 5.0
+
+# How long a device reuses its successful artifact HEAD check (seconds)
+ARTIFACT_HEAD_TTL = 60.0
+
 
 class DeploymentState(Enum):
     """Possible deployment states."""
@@ -33,9 +43,32 @@ class Deployment:
 class DeploymentsClient:
     """Handles deployment checks and status updates with Mender server."""
 
-    def __init__(self, server_url: str):
+    def __init__(
+        self,
+        server_url: str,
+        session: Optional[aiohttp.ClientSession] = None,
+        no_deployment_ttl: float = NO_DEPLOYMENT_TTL
+    ):
         self.server_url = server_url.rstrip('/')
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._url_deployments = f"{self.server_url}/api/devices/v1/deployments/device/deployments/"
+        self._url_next = self._url_deployments + "next"
+        self._json_headers = HeaderCache()
+        self._auth_headers = HeaderCache(content_type=None)
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self.no_deployment_ttl = no_deployment_ttl
+        # (token, device_type, artifact_name) -> (ETag, Deployment) of the
+        # last 200 response, handed out again when the server answers 304
+        self._last_deployment: Dict[Tuple[str, str, str], Tuple[str, Deployment]] = {}
+        # (token, device_type, artifact_name) -> monotonic expiry of a 204
+        self._no_deployment_until: Dict[Tuple[str, str, str], float] = {}
+        # Successful HEAD checks per device (token) and artifact URI. A HEAD
+        # only proves access for the credentials it was made with, and
+        # artifact URIs are usually presigned per device, so one device's
+        # check never vouches for another's (query strings included).
+        # (token, artifact_uri) -> (content_length, monotonic expiry)
+        self._head_cache: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self._head_locks: Dict[Tuple[str, str], asyncio.Lock] = {}
 
     async def __aenter__(self):
         await self._ensure_session()
@@ -45,20 +78,22 @@ class DeploymentsClient:
         await self.close()
 
     async def _ensure_session(self) -> None:
-        """Ensure HTTP session is created."""
+        """Ensure HTTP session is created (only when none was injected)."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = create_session()
+            self._owns_session = True
 
     async def close(self) -> None:
-        """Close the HTTP session."""
-        if self._session and not self._session.closed:
+        """Close the HTTP session if this client created it."""
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
     async def check_for_deployment(
         self,
         token: str,
         device_type: str,
-        artifact_name: str
+        artifact_name: str,
+        force: bool = False
     ) -> Optional[Deployment]:
         """
         Check for pending deployments.
@@ -67,18 +102,24 @@ class DeploymentsClient:
             token: Authentication JWT token
             device_type: Current device type
             artifact_name: Currently installed artifact
+            force: Ask the server even if it recently had no deployment
 
         Returns:
             Deployment object if available, None otherwise
         """
-        await self._ensure_session()
+        key = (token, device_type, artifact_name)
+        now = time.monotonic()
 
-        url = f"{self.server_url}/api/devices/v1/deployments/device/deployments/next"
+        # Recently told there is nothing to do: skip the request entirely
+        if not force and self._no_deployment_until.get(key, 0.0) > now:
+            return None
 
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        await self._ensure_session()
+
+        headers = self._json_headers.for_token(token)
+        cached = self._last_deployment.get(key)
+        if cached:
+            headers = {**headers, "If-None-Match": cached[0]}
 
         params = {
             "device_type": device_type,
@@ -86,9 +127,15 @@ class DeploymentsClient:
         }
 
         try:
-            async with self._session.get(url, headers=headers, params=params) as response:
-                if response.status == 200:
-                    data = await response.json()
+            async with self._session.get(self._url_next, headers=headers, params=params) as response:
+                if response.status == 304:
+                    # Same deployment as last time, still pending
+                    if cached:
+                        return cached[1]
+                    return None
+
+                elif response.status == 200:
+                    data = orjson.loads(await response.read())
                     artifact = data.get("artifact", {})
 
                     deployment = Deployment(
@@ -98,11 +145,14 @@ class DeploymentsClient:
                         artifact_size=artifact.get("source", {}).get("size", 0)
                     )
 
+                    self._remember_deployment(key, response.headers.get("ETag"), deployment)
                     logger.info(f"Deployment available: {deployment.artifact_name}")
                     return deployment
 
                 elif response.status == 204:
                     # No deployment available
+                    self._last_deployment.pop(key, None)
+                    self._remember_no_deployment(key, now)
                     return None
                 elif response.status == 401:
                     logger.warning("Authentication token expired or invalid")
@@ -116,6 +166,31 @@ class DeploymentsClient:
             logger.error(f"Deployment check request failed: {e}")
             return None
 
+    def _remember_deployment(
+        self, key: Tuple[str, str, str], etag: Optional[str], deployment: Deployment
+    ) -> None:
+        """Keep a deployment for conditional re-checks (only when it has an ETag)."""
+        if not etag:
+            self._last_deployment.pop(key, None)
+            return
+
+        # Keys include the token, so rotated tokens leave stale entries
+        if len(self._last_deployment) >= CACHE_MAX_ENTRIES:
+            self._last_deployment.clear()
+        self._last_deployment[key] = (etag, deployment)
+
+    def _remember_no_deployment(self, key: Tuple[str, str, str], now: float) -> None:
+        """Cache a 204 answer for a short time."""
+        if self.no_deployment_ttl <= 0:
+            return
+
+        # Drop stale entries (e.g. for rotated tokens) so the cache stays small
+        if len(self._no_deployment_until) >= CACHE_MAX_ENTRIES:
+            self._no_deployment_until = {
+                k: v for k, v in self._no_deployment_until.items() if v > now
+            }
+        self._no_deployment_until[key] = now + self.no_deployment_ttl
+
     async def update_deployment_status(
         self,
         token: str,
@@ -137,12 +212,8 @@ class DeploymentsClient:
         """
         await self._ensure_session()
 
-        url = f"{self.server_url}/api/devices/v1/deployments/device/deployments/{deployment_id}/status"
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        url = f"{self._url_deployments}{deployment_id}/status"
+        headers = self._json_headers.for_token(token)
 
         payload: Dict[str, Any] = {
             "status": state.value
@@ -183,12 +254,8 @@ class DeploymentsClient:
         """
         await self._ensure_session()
 
-        url = f"{self.server_url}/api/devices/v1/deployments/device/deployments/{deployment_id}/log"
-
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
+        url = f"{self._url_deployments}{deployment_id}/log"
+        headers = self._json_headers.for_token(token)
 
         payload = {
             "messages": logs
@@ -208,6 +275,42 @@ class DeploymentsClient:
             logger.error(f"Log upload request failed: {e}")
             return False
 
+    async def send_deployment_logs_raw(
+        self,
+        token: str,
+        deployment_id: str,
+        payload: bytes
+    ) -> bool:
+        """
+        Send pre-encoded deployment logs to server.
+
+        Args:
+            token: Authentication JWT token
+            deployment_id: Deployment ID
+            payload: JSON body, i.e. encoded ``{"messages": [...]}``
+
+        Returns:
+            True if successful, False otherwise
+        """
+        await self._ensure_session()
+
+        url = f"{self._url_deployments}{deployment_id}/log"
+        headers = self._json_headers.for_token(token)
+
+        try:
+            async with self._session.put(url, data=payload, headers=headers) as response:
+                if response.status in (200, 204):
+                    logger.debug(f"Logs sent for deployment {deployment_id}")
+                    return True
+                else:
+                    error_text = await response.text()
+                    logger.error(f"Log upload failed ({response.status}): {error_text}")
+                    return False
+
+        except aiohttp.ClientError as e:
+            logger.error(f"Log upload request failed: {e}")
+            return False
+
     async def download_artifact(
         self,
         token: str,
@@ -225,17 +328,42 @@ class DeploymentsClient:
         Returns:
             True if artifact is accessible, False otherwise
         """
+        key = (token, artifact_uri)
+        cached = self._head_cache.get(key)
+        if cached and cached[1] > time.monotonic():
+            logger.debug(f"Artifact accessible (cached), size: {cached[0]} bytes")
+            return True
+
+        # Failed checks leave their lock behind; drop the idle ones
+        if len(self._head_locks) >= CACHE_MAX_ENTRIES:
+            self._head_locks = {
+                k: lock for k, lock in self._head_locks.items() if lock.locked()
+            }
+        lock = self._head_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # A concurrent check for the same device may have finished meanwhile
+            cached = self._head_cache.get(key)
+            if cached and cached[1] > time.monotonic():
+                return True
+            return await self._head_artifact(token, artifact_uri)
+
+    async def _head_artifact(self, token: str, artifact_uri: str) -> bool:
+        """Issue the HEAD request for an artifact and cache a success."""
         await self._ensure_session()
 
-        headers = {
-            "Authorization": f"Bearer {token}"
-        }
-
         try:
-            async with self._session.head(artifact_uri, headers=headers) as response:
+            async with self._session.head(
+                artifact_uri, headers=self._auth_headers.for_token(token)
+            ) as response:
                 if response.status == 200:
                     content_length = response.headers.get("Content-Length", "0")
-                    logger.debug(f"Artifact accessible, size: {content_length} bytes")
+                    try:
+                        size = int(content_length or 0)
+                    except ValueError:
+                        logger.warning(f"Invalid artifact Content-Length: {content_length!r}")
+                        size = 0
+                    logger.debug(f"Artifact accessible, size: {size} bytes")
+                    self._remember_artifact((token, artifact_uri), size)
                     return True
                 else:
                     logger.error(f"Artifact not accessible ({response.status})")
@@ -244,3 +372,15 @@ class DeploymentsClient:
         except aiohttp.ClientError as e:
             logger.error(f"Artifact download check failed: {e}")
             return False
+
+    def _remember_artifact(self, key: Tuple[str, str], content_length: int) -> None:
+        """Cache a successful (token, URI) HEAD result for ARTIFACT_HEAD_TTL seconds."""
+        now = time.monotonic()
+        if len(self._head_cache) >= CACHE_MAX_ENTRIES:
+            self._head_cache = {
+                k: entry for k, entry in self._head_cache.items() if entry[1] > now
+            }
+            # Still full of live entries: start over rather than grow
+            if len(self._head_cache) >= CACHE_MAX_ENTRIES:
+                self._head_cache.clear()
+        self._head_cache[key] = (content_length, now + ARTIFACT_HEAD_TTL)
@@ -2,19 +2,29 @@
 
 import aiohttp
 import logging
-from typing import Dict, Any, List, Optional
+import orjson
+from typing import Dict, Any, Optional, Tuple
 
 from .exceptions import AuthenticationError
+from .session import HeaderCache, create_session
 
 logger = logging.getLogger(__name__)
 
+_BOOL_STR = {True: "true", False: "false"}
+
 
 class InventoryClient:
     """Handles device inventory updates with Mender server."""
 
-    def __init__(self, server_url: str):
+    def __init__(self, server_url: str, session: Optional[aiohttp.ClientSession] = None):
         self.server_url = server_url.rstrip('/')
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._url_attributes = f"{self.server_url}/api/devices/v1/inventory/device/attributes"
+        self._json_headers = HeaderCache()
+        self._auth_headers = HeaderCache(content_type=None)
+        self._session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        # device key -> (token, {attribute: formatted value} last accepted)
+        self._last_sent: Dict[str, Tuple[str, Dict[str, Any]]] = {}
 
     async def __aenter__(self):
         await self._ensure_session()
@@ -24,64 +34,79 @@ class InventoryClient:
         await self.close()
 
     async def _ensure_session(self) -> None:
-        """Ensure HTTP session is created."""
+        """Ensure HTTP session is created (only when none was injected)."""
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession()
+            self._session = create_session()
+            self._owns_session = True
 
     async def close(self) -> None:
-        """Close the HTTP session."""
-        if self._session and not self._session.closed:
+        """Close the HTTP session if this client created it."""
+        if self._owns_session and self._session and not self._session.closed:
             await self._session.close()
 
-    def _format_inventory(self, inventory_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """
-        Format inventory data for Mender API.
-
-        Mender expects inventory as a list of {name, value} objects.
-        """
-        formatted = []
-        for key, value in inventory_data.items():
-            if isinstance(value, list):
-                # Lists are sent as-is
-                formatted.append({"name": key, "value": value})
-            elif isinstance(value, bool):
-                formatted.append({"name": key, "value": str(value).lower()})
-            else:
-                formatted.append({"name": key, "value": str(value)})
-        return formatted
+    @staticmethod
+    def _format_values(inventory_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert attribute values to what Mender stores for them."""
+        # Lists are sent as-is, booleans as lowercase strings
+        return {
+            key: value if isinstance(value, list)
+            else _BOOL_STR[value] if isinstance(value, bool)
+            else str(value)
+            for key, value in inventory_data.items()
+        }
 
     async def update_inventory(
         self,
         token: str,
-        inventory_data: Dict[str, Any]
+        inventory_data: Dict[str, Any],
+        device_id: Optional[str] = None
     ) -> bool:
         """
         Send inventory update to Mender server.
 
+        Attributes are upserted (PATCH), so after the first accepted update
+        for a device and token only the attributes whose values changed are
+        sent; static attributes don't cross the wire again. The request is
+        skipped (and reported as successful) when nothing changed.
+
         Args:
             token: Authentication JWT token
             inventory_data: Device inventory attributes
+            device_id: Optional device key for change detection (defaults to token)
 
         Returns:
             True if successful, False otherwise
         """
-        await self._ensure_session()
-
-        url = f"{self.server_url}/api/devices/v1/inventory/device/attributes"
+        values = self._format_values(inventory_data)
+        key = device_id or token
+
+        # A new token (e.g. after re-acceptance) always gets the full inventory
+        last = self._last_sent.get(key)
+        if last is not None and last[0] == token:
+            previous = last[1]
+            changed = [
+                {"name": name, "value": value}
+                for name, value in values.items()
+                if name not in previous or previous[name] != value
+            ]
+        else:
+            changed = [{"name": name, "value": value} for name, value in values.items()]
+
+        if not changed:
+            logger.debug("Inventory unchanged, skipping update")
+            return True
+
+        body = orjson.dumps(changed)
 
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-
-        formatted_inventory = self._format_inventory(inventory_data)
+        await self._ensure_session()
 
         try:
             async with self._session.patch(
-                url, json=formatted_inventory, headers=headers
+                self._url_attributes, data=body, headers=self._json_headers.for_token(token)
             ) as response:
                 if response.status == 200:
                     logger.debug("Inventory updated successfully")
+                    self._last_sent[key] = (token, values)
                     return True
                 elif response.status == 401:
                     logger.warning("Authentication token expired or invalid")
@@ -107,16 +132,12 @@ class InventoryClient:
         """
         await self._ensure_session()
 
-        url = f"{self.server_url}/api/devices/v1/inventory/device/attributes"
-
-        headers = {
-            "Authorization": f"Bearer {token}"
-        }
-
         try:
-            async with self._session.get(url, headers=headers) as response:
+            async with self._session.get(
+                self._url_attributes, headers=self._auth_headers.for_token(token)
+            ) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = orjson.loads(await response.read())
                     # Convert from list format back to dict
                     return {item["name"]: item["value"] for item in data}
                 else:
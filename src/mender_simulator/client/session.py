@@ -0,0 +1,79 @@
+"""Shared HTTP session factory for Mender clients."""
+
+import aiohttp
+import orjson
+from typing import Dict, Optional
+
+# Connection pool tuned for thousands of devices hitting the same Mender
+# host: no global cap, generous per-host cap, long-lived keep-alive and
+# cached DNS so connections are rarely re-established after warmup.
+CONNECTOR_LIMIT_PER_HOST = 512
+KEEPALIVE_TIMEOUT = 90
+DNS_CACHE_TTL = 300
+
+# Upper bound for the per-token/per-device caches kept by the clients.
+# Clients are shared by the whole fleet, so this must comfortably exceed
+# the number of simulated devices.
+CACHE_MAX_ENTRIES = 65536
+
+# Request timeouts (seconds)
+REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=5, sock_read=20)
+
+
+def _json_serialize(obj) -> str:
+    """Serialize request payloads with orjson instead of stdlib json."""
+    return orjson.dumps(obj).decode('utf-8')
+
+
+def create_session() -> aiohttp.ClientSession:
+    """
+    Create an HTTP session suitable for sharing across the whole fleet.
+
+    A single session (and its connection pool) is meant to be shared by
+    the auth, inventory and deployments clients of every simulated device,
+    so keep-alive connections to the Mender server are reused instead of
+    paying a new TCP/TLS handshake per client.
+
+    Returns:
+        New aiohttp ClientSession
+    """
+    connector = aiohttp.TCPConnector(
+        limit=0,
+        limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        enable_cleanup_closed=True
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=REQUEST_TIMEOUT,
+        json_serialize=_json_serialize
+    )
+
+
+class HeaderCache:
+    """
+    Builds request headers once per token instead of once per request.
+
+    Returned dicts are shared between calls and must not be mutated;
+    copy them first when extra headers are needed.
+    """
+
+    def __init__(self, content_type: Optional[str] = "application/json", max_size: int = CACHE_MAX_ENTRIES):
+        self.content_type = content_type
+        self.max_size = max_size
+        self._headers: Dict[str, Dict[str, str]] = {}
+
+    def for_token(self, token: str) -> Dict[str, str]:
+        """Get the (cached) headers for a bearer token."""
+        headers = self._headers.get(token)
+        if headers is None:
+            # Tokens rotate; rather than tracking usage just start over
+            if len(self._headers) >= self.max_size:
+                self._headers.clear()
+            headers = {"Authorization": f"Bearer {token}"}
+            if self.content_type:
+                headers["Content-Type"] = self.content_type
+            self._headers[token] = headers
+        return headers
@@ -1,49 +1,278 @@
 """Database manager for async SQLite operations."""
 
 import aiosqlite
+import asyncio
 import logging
-from typing import List, Optional
+import orjson
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
 from pathlib import Path
-from datetime import datetime
 
 from .models import Device, DeploymentStatus
+from ..utils.timestamps import now_iso as _now_iso, utcnow as _utcnow
 
 logger = logging.getLogger(__name__)
 
+# Connection tuning: WAL lets readers proceed during writes and, with
+# synchronous=NORMAL, only fsyncs on checkpoints instead of every commit.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+_SAVE_DEVICE_SQL = """
+    INSERT OR REPLACE INTO devices (
+        device_id, identity_data, rsa_private_key, rsa_public_key,
+        industry_profile, current_status, auth_token, inventory_data,
+        created_at, updated_at, last_poll
+    ) VALUES (
+        :device_id, :identity_data, :rsa_private_key, :rsa_public_key,
+        :industry_profile, :current_status, :auth_token, :inventory_data,
+        :created_at, :updated_at, :last_poll
+    )
+"""
+
+_SAVE_DEPLOYMENT_STATUS_SQL = """
+    INSERT OR REPLACE INTO deployment_status (
+        device_id, deployment_id, artifact_name, status,
+        progress, started_at, completed_at, error_message
+    ) VALUES (
+        :device_id, :deployment_id, :artifact_name, :status,
+        :progress, :started_at, :completed_at, :error_message
+    )
+"""
+
+# Single-row mutations use RETURNING (SQLite 3.35+) so the statement itself
+# reports whether the device existed; no separate rowcount/SELECT needed.
+# Older SQLite libraries run them without the clause and check the number
+# of changed rows instead.
+_RETURNING_CLAUSE = " RETURNING device_id"
+_SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+_DELETE_DEVICE_SQL = "DELETE FROM devices WHERE device_id = ? RETURNING device_id"
+_UPDATE_STATUS_SQL = (
+    "UPDATE devices SET current_status = ?, updated_at = ? "
+    "WHERE device_id = ? RETURNING device_id"
+)
+_UPDATE_AUTH_TOKEN_SQL = (
+    "UPDATE devices SET auth_token = ?, updated_at = ? "
+    "WHERE device_id = ? RETURNING device_id"
+)
+_UPDATE_INVENTORY_SQL = (
+    "UPDATE devices SET inventory_data = ?, updated_at = ? "
+    "WHERE device_id = ? RETURNING device_id"
+)
+_UPDATE_DEPLOYMENT_PROGRESS_SQL = (
+    "UPDATE deployment_status SET status = ?, progress = ? "
+    "WHERE device_id = ? AND deployment_id = ? RETURNING device_id"
+)
+# executemany() can't use RETURNING, so the batched flush has its own form
+_FLUSH_DEPLOYMENT_PROGRESS_SQL = (
+    "UPDATE deployment_status SET status = ?, progress = ? "
+    "WHERE device_id = ? AND deployment_id = ?"
+)
+_UPDATE_LAST_POLL_SQL = "UPDATE devices SET last_poll = ?, updated_at = ? WHERE device_id = ?"
+
+# Reads are fixed templates too: sqlite3 keeps compiled statements per
+# connection keyed by their exact text, so every call reuses the plan
+_GET_DEVICE_SQL = "SELECT * FROM devices WHERE device_id = ?"
+# Keyset pagination (device_id is the primary key) for streaming devices
+_DEVICES_PAGE_SQL = "SELECT * FROM devices WHERE device_id > ? ORDER BY device_id LIMIT ?"
+_DEVICES_BY_INDUSTRY_PAGE_SQL = (
+    "SELECT * FROM devices WHERE industry_profile = ? AND device_id > ? "
+    "ORDER BY device_id LIMIT ?"
+)
+_COUNT_DEVICES_SQL = "SELECT COUNT(*) FROM devices"
+_COUNT_BY_INDUSTRY_SQL = "SELECT industry_profile, COUNT(*) FROM devices GROUP BY industry_profile"
+_GET_DEPLOYMENT_STATUS_SQL = (
+    "SELECT * FROM deployment_status WHERE device_id = ? AND deployment_id = ?"
+)
+_ACTIVE_DEPLOYMENTS_SQL = (
+    "SELECT * FROM deployment_status WHERE status NOT IN ('success', 'failure')"
+)
+
 
 class DatabaseManager:
     """Async SQLite database manager for device persistence."""
 
-    def __init__(self, db_path: str = "devices.db"):
-        self.db_path = Path(db_path)
+    def __init__(
+        self,
+        db_path: str = "devices.db",
+        poll_flush_interval: float = 5.0,
+        reader_count: int = 4,
+        progress_flush_interval: float = 0.05
+    ):
+        # Accepts a file path, ":memory:" or a "file:" URI
+        # (e.g. file:name?mode=memory&cache=shared)
+        self._uri = str(db_path).startswith("file:")
+        self._in_memory = str(db_path) == ":memory:" or "mode=memory" in str(db_path)
+        self.db_path = str(db_path) if self._uri or self._in_memory else Path(db_path)
+        self.poll_flush_interval = poll_flush_interval
+        self.progress_flush_interval = progress_flush_interval
+        self.reader_count = reader_count
+        # Single writer connection; reads go through a small pool of
+        # read-only connections so they don't queue behind writes (WAL)
         self._connection: Optional[aiosqlite.Connection] = None
+        self._readers: Optional[asyncio.Queue] = None
+        self._reader_connections: List[aiosqlite.Connection] = []
+        # Every write shares the single writer connection, so a write (and
+        # its commit) or a whole transaction() holds this lock; the task
+        # that opened the transaction() joins it instead of waiting
+        self._write_lock = asyncio.Lock()
+        self._transaction_owner: Optional[asyncio.Task] = None
+        # Write-behind buffer: device_id -> last poll timestamp
+        self._pending_polls: Dict[str, str] = {}
+        # (device_id, deployment_id) -> (status, progress); only the latest
+        # value per deployment is kept until the next flush
+        self._pending_progress: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        # Set while progress is buffered, so the progress flusher only wakes
+        # up when there is something to write
+        self._progress_queued = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._progress_flush_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> None:
         """Initialize database connection and create tables."""
-        self._connection = await aiosqlite.connect(self.db_path)
+        self._connection = await aiosqlite.connect(self.db_path, uri=self._uri)
         self._connection.row_factory = aiosqlite.Row
+        for pragma in _PRAGMAS:
+            await self._connection.execute(pragma)
         await self._create_tables()
+
+        # In-memory databases have no WAL for readers to work from (and
+        # ":memory:" would give every connection its own database), so all
+        # access goes through the writer
+        self._readers = asyncio.Queue()
+        for _ in range(0 if self._in_memory else self.reader_count):
+            reader = await aiosqlite.connect(self.db_path, uri=self._uri)
+            reader.row_factory = aiosqlite.Row
+            await reader.execute("PRAGMA query_only=1")
+            self._reader_connections.append(reader)
+            self._readers.put_nowait(reader)
+
+        self._flush_task = asyncio.create_task(
+            self._flush_loop(self.poll_flush_interval, self.flush_pending_polls)
+        )
+        self._progress_flush_task = asyncio.create_task(
+            self._flush_loop(
+                self.progress_flush_interval, self.flush_pending_progress, self._progress_queued
+            )
+        )
         logger.info(f"Database connected: {self.db_path}")
 
     async def close(self) -> None:
         """Close database connection gracefully."""
+        for task in (self._flush_task, self._progress_flush_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._flush_task = None
+        self._progress_flush_task = None
+
+        for reader in self._reader_connections:
+            await reader.close()
+        self._reader_connections = []
+        self._readers = None
+
         if self._connection:
+            await self.flush_pending_polls()
+            await self.flush_pending_progress()
             await self._connection.close()
             self._connection = None
             logger.info("Database connection closed")
 
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[None]:
+        """
+        Group several writes into a single transaction (and a single commit).
+
+        Writes issued by the same task while the transaction is open skip
+        their own commit. Nested use joins the outer transaction. Writes
+        from other tasks wait until it has been committed or rolled back.
+
+        Example:
+            async with db.transaction():
+                await db.update_device_status(device_id, "updating")
+                await db.save_deployment_status(status)
+        """
+        if self._in_transaction:
+            yield
+            return
+
+        async with self._write_lock:
+            await self._connection.execute("BEGIN")
+            self._transaction_owner = asyncio.current_task()
+            try:
+                yield
+            except BaseException:
+                self._transaction_owner = None
+                await self._connection.rollback()
+                raise
+            self._transaction_owner = None
+            await self._connection.commit()
+
+    @property
+    def _in_transaction(self) -> bool:
+        """Whether the current task has a transaction() open."""
+        owner = self._transaction_owner
+        return owner is not None and owner is asyncio.current_task()
+
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[None]:
+        """
+        Run writes on the writer connection and commit them.
+
+        Waits for the writer (and any other task's transaction) to be free;
+        inside the current task's own transaction() it just joins it.
+        """
+        if self._in_transaction:
+            yield
+            return
+
+        async with self._write_lock:
+            try:
+                yield
+            except BaseException:
+                await self._connection.rollback()
+                raise
+            await self._connection.commit()
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow a read-only connection from the pool.
+
+        Falls back to the writer connection when the pool is disabled or the
+        current task has a transaction open (so its uncommitted writes stay
+        visible).
+        """
+        if not self._reader_connections or self._in_transaction:
+            yield self._connection
+            return
+
+        conn = await self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+
     async def _create_tables(self) -> None:
         """Create required database tables if they don't exist."""
         await self._connection.executescript("""
             CREATE TABLE IF NOT EXISTS devices (
                 device_id TEXT PRIMARY KEY,
-                identity_data TEXT NOT NULL,
+                identity_data BLOB NOT NULL,
                 rsa_private_key TEXT NOT NULL,
                 rsa_public_key TEXT NOT NULL,
                 industry_profile TEXT NOT NULL,
                 current_status TEXT DEFAULT 'idle',
                 auth_token TEXT,
-                inventory_data TEXT,
+                inventory_data BLOB,
                 created_at TEXT NOT NULL,
                 updated_at TEXT NOT NULL,
                 last_poll TEXT
@@ -66,104 +295,220 @@ class DatabaseManager:
             CREATE INDEX IF NOT EXISTS idx_devices_industry ON devices(industry_profile);
             CREATE INDEX IF NOT EXISTS idx_devices_status ON devices(current_status);
             CREATE INDEX IF NOT EXISTS idx_deployment_device ON deployment_status(device_id);
+
+            -- Only in-flight rows; must match the WHERE of get_active_deployments
+            CREATE INDEX IF NOT EXISTS idx_deployment_active ON deployment_status(status)
+                WHERE status NOT IN ('success', 'failure');
         """)
         await self._connection.commit()
 
     async def save_device(self, device: Device) -> None:
         """Insert or update a device in the database."""
-        device.updated_at = datetime.utcnow()
+        device.updated_at = _utcnow()
         data = device.to_dict()
 
-        await self._connection.execute("""
-            INSERT OR REPLACE INTO devices (
-                device_id, identity_data, rsa_private_key, rsa_public_key,
-                industry_profile, current_status, auth_token, inventory_data,
-                created_at, updated_at, last_poll
-            ) VALUES (
-                :device_id, :identity_data, :rsa_private_key, :rsa_public_key,
-                :industry_profile, :current_status, :auth_token, :inventory_data,
-                :created_at, :updated_at, :last_poll
-            )
-        """, data)
-        await self._connection.commit()
+        async with self._write():
+            await self._connection.execute(_SAVE_DEVICE_SQL, data)
         logger.debug(f"Device saved: {device.device_id}")
 
+    async def save_devices_bulk(self, devices: Iterable[Device]) -> None:
+        """Insert or update many devices with one statement and one commit."""
+        now = _utcnow()
+        data = []
+        for device in devices:
+            device.updated_at = now
+            data.append(device.to_dict())
+
+        async with self.transaction():
+            await self._connection.executemany(_SAVE_DEVICE_SQL, data)
+        logger.debug(f"Devices saved: {len(data)}")
+
     async def get_device(self, device_id: str) -> Optional[Device]:
         """Retrieve a device by ID."""
-        async with self._connection.execute(
-            "SELECT * FROM devices WHERE device_id = ?", (device_id,)
-        ) as cursor:
+        async with self._reader() as conn, conn.execute(_GET_DEVICE_SQL, (device_id,)) as cursor:
             row = await cursor.fetchone()
             if row:
-                return Device.from_dict(dict(row))
+                return Device.from_dict(row)
         return None
 
+    async def iter_devices(self, batch_size: int = 500) -> AsyncIterator[Device]:
+        """
+        Stream all devices from the database without loading the whole table.
+
+        Args:
+            batch_size: Number of rows fetched at a time
+
+        Yields:
+            Device objects, one per row, ordered by device ID
+        """
+        async for device in self._iter_device_pages(_DEVICES_PAGE_SQL, (), batch_size):
+            yield device
+
+    async def iter_devices_by_industry(
+        self, industry: str, batch_size: int = 500
+    ) -> AsyncIterator[Device]:
+        """
+        Stream devices for a specific industry profile.
+
+        Args:
+            industry: Industry profile name
+            batch_size: Number of rows fetched at a time
+
+        Yields:
+            Device objects, one per row, ordered by device ID
+        """
+        async for device in self._iter_device_pages(
+            _DEVICES_BY_INDUSTRY_PAGE_SQL, (industry,), batch_size
+        ):
+            yield device
+
+    async def _iter_device_pages(
+        self, sql: str, params: tuple, batch_size: int
+    ) -> AsyncIterator[Device]:
+        """
+        Yield devices page by page, continuing after the last device ID seen.
+
+        Every page borrows a reader only while it is fetched, so a consumer
+        that stops early or stalls between items never holds a pooled
+        connection (device IDs are never empty, so "" precedes them all).
+        """
+        last_id = ""
+        while True:
+            async with self._reader() as conn, conn.execute(
+                sql, (*params, last_id, batch_size)
+            ) as cursor:
+                rows = await cursor.fetchall()
+            for row in rows:
+                yield Device.from_dict(row)
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]["device_id"]
+
     async def get_all_devices(self) -> List[Device]:
         """Retrieve all devices from the database."""
-        devices = []
-        async with self._connection.execute("SELECT * FROM devices") as cursor:
-            async for row in cursor:
-                devices.append(Device.from_dict(dict(row)))
-        return devices
+        return [device async for device in self.iter_devices()]
 
     async def get_devices_by_industry(self, industry: str) -> List[Device]:
         """Retrieve all devices for a specific industry profile."""
-        devices = []
-        async with self._connection.execute(
-            "SELECT * FROM devices WHERE industry_profile = ?", (industry,)
-        ) as cursor:
-            async for row in cursor:
-                devices.append(Device.from_dict(dict(row)))
-        return devices
+        return [device async for device in self.iter_devices_by_industry(industry)]
+
+    async def _exec_update(self, sql: str, params: tuple) -> bool:
+        """
+        Run a single-row ``... RETURNING`` mutation and commit it.
+
+        Returns:
+            True if a row was affected, False otherwise
+        """
+        if not _SUPPORTS_RETURNING:
+            async with self._write(), self._connection.execute(
+                sql.removesuffix(_RETURNING_CLAUSE), params
+            ) as cursor:
+                return cursor.rowcount > 0
+
+        async with self._write(), self._connection.execute(sql, params) as cursor:
+            row = await cursor.fetchone()
+        return row is not None
 
     async def delete_device(self, device_id: str) -> bool:
         """Delete a device from the database."""
-        cursor = await self._connection.execute(
-            "DELETE FROM devices WHERE device_id = ?", (device_id,)
-        )
-        await self._connection.commit()
-        deleted = cursor.rowcount > 0
+        deleted = await self._exec_update(_DELETE_DEVICE_SQL, (device_id,))
         if deleted:
             logger.info(f"Device deleted: {device_id}")
         return deleted
 
-    async def update_device_status(self, device_id: str, status: str) -> None:
-        """Update device status."""
-        await self._connection.execute(
-            "UPDATE devices SET current_status = ?, updated_at = ? WHERE device_id = ?",
-            (status, datetime.utcnow().isoformat(), device_id)
+    async def update_device_status(self, device_id: str, status: str) -> bool:
+        """Update device status. Returns True if the device exists."""
+        return await self._exec_update(
+            _UPDATE_STATUS_SQL,
+            (status, _now_iso(), device_id)
         )
-        await self._connection.commit()
 
-    async def update_device_auth_token(self, device_id: str, token: Optional[str]) -> None:
-        """Update device authentication token."""
-        await self._connection.execute(
-            "UPDATE devices SET auth_token = ?, updated_at = ? WHERE device_id = ?",
-            (token, datetime.utcnow().isoformat(), device_id)
+    async def update_device_auth_token(self, device_id: str, token: Optional[str]) -> bool:
+        """Update device authentication token. Returns True if the device exists."""
+        return await self._exec_update(
+            _UPDATE_AUTH_TOKEN_SQL,
+            (token, _now_iso(), device_id)
         )
-        await self._connection.commit()
 
-    async def update_last_poll(self, device_id: str) -> None:
-        """Update the last poll timestamp for a device."""
-        now = datetime.utcnow().isoformat()
-        await self._connection.execute(
-            "UPDATE devices SET last_poll = ?, updated_at = ? WHERE device_id = ?",
-            (now, now, device_id)
+    async def update_device_inventory(self, device_id: str, inventory_data: Dict) -> bool:
+        """
+        Update only the inventory of a device.
+
+        Cheaper than save_device for telemetry refreshes: identity and
+        RSA keys are neither re-encoded nor rewritten.
+
+        Returns:
+            True if the device exists
+        """
+        return await self._exec_update(
+            _UPDATE_INVENTORY_SQL,
+            (orjson.dumps(inventory_data), _now_iso(), device_id)
         )
-        await self._connection.commit()
+
+    async def update_last_poll(self, device_id: str) -> None:
+        """
+        Record the last poll timestamp for a device.
+
+        The value is only buffered in memory; the background flush task
+        writes all pending timestamps in one batch every
+        ``poll_flush_interval`` seconds (and on close).
+        """
+        self._pending_polls[device_id] = _now_iso()
+
+    async def flush_pending_polls(self) -> None:
+        """Write all buffered last-poll timestamps to the database."""
+        if not self._pending_polls:
+            return
+
+        items: Dict[str, str] = {}
+        try:
+            async with self._write():
+                # Taken only once the writer is ours, so waiting on the lock
+                # (or being cancelled meanwhile) can't lose the batch
+                items, self._pending_polls = self._pending_polls, {}
+                await self._connection.executemany(
+                    _UPDATE_LAST_POLL_SQL,
+                    [(poll, poll, device_id) for device_id, poll in items.items()]
+                )
+        except BaseException:
+            # Keep the batch for the next flush; polls recorded meanwhile win
+            self._pending_polls = {**items, **self._pending_polls}
+            raise
+        logger.debug(f"Flushed last poll for {len(items)} devices")
+
+    async def _flush_loop(
+        self,
+        interval: float,
+        flush: Callable[[], Awaitable[None]],
+        pending: Optional[asyncio.Event] = None
+    ) -> None:
+        """
+        Periodically run one of the write-behind flushes.
+
+        With a ``pending`` event the loop idles until it is set, then waits
+        ``interval`` to coalesce further changes before flushing.
+        """
+        while True:
+            if pending is not None:
+                await pending.wait()
+            await asyncio.sleep(interval)
+            if pending is not None:
+                pending.clear()
+            try:
+                await flush()
+            except Exception as e:
+                logger.error(f"Failed to flush buffered updates: {e}")
 
     async def count_devices(self) -> int:
         """Count total devices in database."""
-        async with self._connection.execute("SELECT COUNT(*) FROM devices") as cursor:
+        async with self._reader() as conn, conn.execute(_COUNT_DEVICES_SQL) as cursor:
             row = await cursor.fetchone()
             return row[0] if row else 0
 
     async def count_devices_by_industry(self) -> dict:
         """Count devices grouped by industry."""
         counts = {}
-        async with self._connection.execute(
-            "SELECT industry_profile, COUNT(*) FROM devices GROUP BY industry_profile"
-        ) as cursor:
+        async with self._reader() as conn, conn.execute(_COUNT_BY_INDUSTRY_SQL) as cursor:
             async for row in cursor:
                 counts[row[0]] = row[1]
         return counts
@@ -172,36 +517,89 @@ class DatabaseManager:
     async def save_deployment_status(self, status: DeploymentStatus) -> None:
         """Save or update deployment status."""
         data = status.to_dict()
-        await self._connection.execute("""
-            INSERT OR REPLACE INTO deployment_status (
-                device_id, deployment_id, artifact_name, status,
-                progress, started_at, completed_at, error_message
-            ) VALUES (
-                :device_id, :deployment_id, :artifact_name, :status,
-                :progress, :started_at, :completed_at, :error_message
-            )
-        """, data)
-        await self._connection.commit()
+        async with self._write():
+            # A full save supersedes any progress still waiting to be flushed
+            # (dropped under the lock, after any in-flight flush has settled)
+            self._pending_progress.pop((status.device_id, status.deployment_id), None)
+            await self._connection.execute(_SAVE_DEPLOYMENT_STATUS_SQL, data)
+
+    async def update_deployment_progress(
+        self, device_id: str, deployment_id: str, status: str, progress: int
+    ) -> bool:
+        """
+        Update only the status and progress of an existing deployment record.
+
+        Returns:
+            True if the deployment record exists
+        """
+        return await self._exec_update(
+            _UPDATE_DEPLOYMENT_PROGRESS_SQL,
+            (status, progress, device_id, deployment_id)
+        )
+
+    async def queue_deployment_progress(
+        self, device_id: str, deployment_id: str, status: str, progress: int
+    ) -> None:
+        """
+        Buffer a status/progress change of an existing deployment record.
+
+        Changes from every simulator are coalesced and written in one batch
+        ``progress_flush_interval`` seconds after the first buffered change
+        (and on close), instead of one UPDATE + commit per progress tick. Reads only see the change
+        after it has been flushed.
+        """
+        self._pending_progress[(device_id, deployment_id)] = (status, progress)
+        self._progress_queued.set()
+
+    async def flush_pending_progress(self) -> None:
+        """Write all buffered deployment progress changes to the database."""
+        if not self._pending_progress:
+            return
+
+        items: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        try:
+            async with self._write():
+                # Taken only once the writer is ours, like flush_pending_polls
+                items, self._pending_progress = self._pending_progress, {}
+                await self._connection.executemany(
+                    _FLUSH_DEPLOYMENT_PROGRESS_SQL,
+                    [
+                        (status, progress, device_id, deployment_id)
+                        for (device_id, deployment_id), (status, progress) in items.items()
+                    ]
+                )
+        except BaseException:
+            # Keep the batch (progress queued meanwhile wins) and retry it
+            self._pending_progress = {**items, **self._pending_progress}
+            self._progress_queued.set()
+            raise
+        logger.debug(f"Flushed deployment progress for {len(items)} deployments")
+
+    async def save_deployment_statuses_bulk(self, statuses: Iterable[DeploymentStatus]) -> None:
+        """Save or update many deployment statuses with one statement and one commit."""
+        statuses = list(statuses)
+        data = [status.to_dict() for status in statuses]
+        async with self.transaction():
+            for status in statuses:
+                self._pending_progress.pop((status.device_id, status.deployment_id), None)
+            await self._connection.executemany(_SAVE_DEPLOYMENT_STATUS_SQL, data)
 
     async def get_deployment_status(
         self, device_id: str, deployment_id: str
     ) -> Optional[DeploymentStatus]:
         """Get deployment status for a device."""
-        async with self._connection.execute(
-            "SELECT * FROM deployment_status WHERE device_id = ? AND deployment_id = ?",
-            (device_id, deployment_id)
+        async with self._reader() as conn, conn.execute(
+            _GET_DEPLOYMENT_STATUS_SQL, (device_id, deployment_id)
         ) as cursor:
             row = await cursor.fetchone()
             if row:
-                return DeploymentStatus.from_dict(dict(row))
+                return DeploymentStatus.from_dict(row)
         return None
 
     async def get_active_deployments(self) -> List[DeploymentStatus]:
         """Get all active (non-completed) deployments."""
         statuses = []
-        async with self._connection.execute(
-            "SELECT * FROM deployment_status WHERE status NOT IN ('success', 'failure')"
-        ) as cursor:
+        async with self._reader() as conn, conn.execute(_ACTIVE_DEPLOYMENTS_SQL) as cursor:
             async for row in cursor:
-                statuses.append(DeploymentStatus.from_dict(dict(row)))
+                statuses.append(DeploymentStatus.from_dict(row))
         return statuses
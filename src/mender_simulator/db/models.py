@@ -1,12 +1,20 @@
 """Data models for device persistence."""
 
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Mapping
 from datetime import datetime
 import json
+import orjson
+import sys
 
+from ..utils.timestamps import isoformat, utcnow
 
-@dataclass
+# Slotted instances are smaller and faster to access; dataclass(slots=True)
+# needs Python 3.10+, older interpreters keep regular instances.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Device:
     """Represents a simulated Mender device."""
 
@@ -18,38 +26,44 @@ class Device:
     current_status: str = "idle"
     auth_token: Optional[str] = None
     inventory_data: Dict[str, Any] = field(default_factory=dict)
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utcnow)
+    updated_at: datetime = field(default_factory=utcnow)
     last_poll: Optional[datetime] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert device to dictionary for database storage."""
         return {
             "device_id": self.device_id,
-            "identity_data": json.dumps(self.identity_data),
+            "identity_data": orjson.dumps(self.identity_data),
             "rsa_private_key": self.rsa_private_key,
             "rsa_public_key": self.rsa_public_key,
             "industry_profile": self.industry_profile,
             "current_status": self.current_status,
             "auth_token": self.auth_token,
-            "inventory_data": json.dumps(self.inventory_data),
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "last_poll": self.last_poll.isoformat() if self.last_poll else None,
+            "inventory_data": orjson.dumps(self.inventory_data),
+            "created_at": isoformat(self.created_at),
+            "updated_at": isoformat(self.updated_at),
+            "last_poll": isoformat(self.last_poll) if self.last_poll else None,
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "Device":
-        """Create device from database row."""
+    def from_dict(cls, data: Mapping[str, Any]) -> "Device":
+        """
+        Create device from database row.
+
+        Accepts any mapping, including sqlite3.Row directly, so callers
+        don't need to copy each row into a dict first. JSON columns may be
+        BLOB (current) or TEXT (databases written by older versions).
+        """
         return cls(
             device_id=data["device_id"],
-            identity_data=json.loads(data["identity_data"]),
+            identity_data=orjson.loads(data["identity_data"]),
             rsa_private_key=data["rsa_private_key"],
             rsa_public_key=data["rsa_public_key"],
             industry_profile=data["industry_profile"],
             current_status=data["current_status"],
             auth_token=data["auth_token"],
-            inventory_data=json.loads(data["inventory_data"]) if data["inventory_data"] else {},
+            inventory_data=orjson.loads(data["inventory_data"]) if data["inventory_data"] else {},
             created_at=datetime.fromisoformat(data["created_at"]),
             updated_at=datetime.fromisoformat(data["updated_at"]),
             last_poll=datetime.fromisoformat(data["last_poll"]) if data["last_poll"] else None,
@@ -57,10 +71,12 @@ class Device:
 
     def get_identity_string(self) -> str:
         """Get identity data as JSON string for Mender API."""
+        # Stdlib formatting on purpose: the server keys devices on this exact
+        # string, so it must stay byte-identical across releases
         return json.dumps(self.identity_data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class DeploymentStatus:
     """Tracks deployment status for a device."""
 
@@ -69,7 +85,7 @@ class DeploymentStatus:
     artifact_name: str
     status: str  # downloading, installing, rebooting, success, failure
     progress: int = 0  # 0-100
-    started_at: datetime = field(default_factory=datetime.utcnow)
+    started_at: datetime = field(default_factory=utcnow)
     completed_at: Optional[datetime] = None
     error_message: Optional[str] = None
 
@@ -81,14 +97,14 @@ class DeploymentStatus:
             "artifact_name": self.artifact_name,
             "status": self.status,
             "progress": self.progress,
-            "started_at": self.started_at.isoformat(),
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "started_at": isoformat(self.started_at),
+            "completed_at": isoformat(self.completed_at) if self.completed_at else None,
             "error_message": self.error_message,
         }
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Any]) -> "DeploymentStatus":
-        """Create from database row."""
+    def from_dict(cls, data: Mapping[str, Any]) -> "DeploymentStatus":
+        """Create from database row (a dict or sqlite3.Row)."""
         return cls(
             device_id=data["device_id"],
             deployment_id=data["deployment_id"],
@@ -6,24 +6,44 @@ for efficient concurrent operation.
 """
 
 import asyncio
+import atexit
+import multiprocessing
+import queue
 import signal
 import sys
 import logging
+import logging.handlers
 import argparse
-from typing import List, Dict, Optional
+import aiohttp
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional
 from pathlib import Path
 
 from .db.database import DatabaseManager
 from .db.models import Device
 from .utils.config import load_config, get_enabled_industries, Config
-from .utils.crypto import generate_rsa_keypair
+from .utils.crypto import generate_keypair
+from .utils.timestamps import now_iso as _now_iso
+from .client.session import create_session
+from .client.auth import AuthClient
+from .client.inventory import InventoryClient
+from .client.deployments import DeploymentsClient
 from .simulation.profiles import IndustryProfile
 from .simulation.device_simulator import DeviceSimulator
 
 
 # Configure logging
-def setup_logging(log_file: str, log_level: str) -> None:
-    """Configure logging for the simulator."""
+def setup_logging(log_file: str, log_level: str) -> logging.handlers.QueueListener:
+    """
+    Configure logging for the simulator.
+
+    Records are handed to a queue and formatted/written by a listener
+    thread, so file and console I/O never block the event loop.
+
+    Returns:
+        The started listener (also stopped automatically at exit)
+    """
     level = getattr(logging, log_level.upper(), logging.INFO)
 
     # Create formatters
@@ -44,15 +64,49 @@ def setup_logging(log_file: str, log_level: str) -> None:
     console_handler.setLevel(level)
     console_handler.setFormatter(console_formatter)
 
-    # Root logger
+    # Root logger only enqueues; the listener does the actual output
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return listener
 
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of devices authenticating (RSA signing) at the same time
+MAX_PARALLEL_AUTH = 32
+
+# Key generation workers must not be forked from this process: by then it
+# runs the aiosqlite and logging listener threads, whose locks a forked
+# child could inherit in a held state
+_KEYGEN_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+@contextmanager
+def _keygen_pool() -> Iterator[ProcessPoolExecutor]:
+    """
+    Process pool for CPU-bound key generation.
+
+    On error or cancellation the queued work is dropped and the pool is
+    not waited for, so the event loop isn't blocked by unneeded keys.
+    """
+    pool = ProcessPoolExecutor(mp_context=_KEYGEN_MP_CONTEXT)
+    try:
+        yield pool
+    except BaseException:
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    pool.shutdown()
+
 
 class FleetOrchestrator:
     """Orchestrates the fleet of simulated devices."""
@@ -60,9 +114,15 @@ class FleetOrchestrator:
     def __init__(self, config: Config):
         self.config = config
         self.db: Optional[DatabaseManager] = None
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.auth_client: Optional[AuthClient] = None
+        self.inventory_client: Optional[InventoryClient] = None
+        self.deployments_client: Optional[DeploymentsClient] = None
+        self.auth_semaphore: Optional[asyncio.Semaphore] = None
         self.simulators: List[DeviceSimulator] = []
         self.tasks: List[asyncio.Task] = []
         self._shutdown_event = asyncio.Event()
+        self._stop_task: Optional[asyncio.Task] = None
 
     async def start(self) -> None:
         """Initialize and start all device simulators."""
@@ -74,6 +134,15 @@ class FleetOrchestrator:
         self.db = DatabaseManager(self.config.simulator.database_path)
         await self.db.connect()
 
+        # One HTTP session (connection pool) and one client per API shared
+        # by every simulator
+        self.session = create_session()
+        server = self.config.server
+        self.auth_client = AuthClient(server.url, server.tenant_token, session=self.session)
+        self.inventory_client = InventoryClient(server.url, session=self.session)
+        self.deployments_client = DeploymentsClient(server.url, session=self.session)
+        self.auth_semaphore = asyncio.Semaphore(MAX_PARALLEL_AUTH)
+
         # Load or create devices
         await self._initialize_devices()
 
@@ -91,8 +160,10 @@ class FleetOrchestrator:
         logger.info("Initiating graceful shutdown...")
 
         # Stop all simulators
-        for simulator in self.simulators:
-            await simulator.stop()
+        await asyncio.gather(
+            *(simulator.stop() for simulator in self.simulators),
+            return_exceptions=True
+        )
 
         # Cancel all tasks
         for task in self.tasks:
@@ -102,6 +173,13 @@ class FleetOrchestrator:
         if self.tasks:
             await asyncio.gather(*self.tasks, return_exceptions=True)
 
+        # Close shared clients and HTTP session
+        for client in (self.auth_client, self.inventory_client, self.deployments_client):
+            if client:
+                await client.close()
+        if self.session and not self.session.closed:
+            await self.session.close()
+
         # Close database
         if self.db:
             await self.db.close()
@@ -111,7 +189,10 @@ class FleetOrchestrator:
 
     def signal_shutdown(self) -> None:
         """Signal the orchestrator to shut down."""
-        asyncio.create_task(self.stop())
+        # Keep a reference so the task isn't garbage collected, and ignore
+        # repeated signals while shutdown is in progress
+        if self._stop_task is None:
+            self._stop_task = asyncio.get_running_loop().create_task(self.stop())
 
     def signal_force_poll(self) -> None:
         """Signal all devices to perform an immediate poll cycle."""
@@ -121,6 +202,20 @@ class FleetOrchestrator:
         for simulator in self.simulators:
             simulator.force_poll()
 
+    def _create_simulator(self, device: Device, profile: IndustryProfile) -> DeviceSimulator:
+        """Create a simulator wired to the fleet-wide clients."""
+        return DeviceSimulator(
+            device,
+            profile,
+            self.config,
+            self.db,
+            session=self.session,
+            auth_client=self.auth_client,
+            inventory_client=self.inventory_client,
+            deployments_client=self.deployments_client,
+            auth_semaphore=self.auth_semaphore
+        )
+
     async def _initialize_devices(self) -> None:
         """Load existing devices or create new ones based on config."""
         enabled_industries = get_enabled_industries(self.config)
@@ -131,6 +226,9 @@ class FleetOrchestrator:
 
         logger.info(f"Enabled industries: {list(enabled_industries.keys())}")
 
+        # (profile, count, start_index) of the devices still to be created
+        pending = []
+
         for industry_name, industry_config in enabled_industries.items():
             profile = IndustryProfile(industry_config)
 
@@ -146,19 +244,30 @@ class FleetOrchestrator:
 
             # Create simulators for existing devices
             for device in existing:
-                simulator = DeviceSimulator(device, profile, self.config, self.db)
+                simulator = self._create_simulator(device, profile)
                 self.simulators.append(simulator)
 
             # Create new devices if needed
             if existing_count < target_count:
-                new_devices = await self._create_devices(
-                    profile,
-                    target_count - existing_count,
-                    existing_count
-                )
-                for device in new_devices:
-                    simulator = DeviceSimulator(device, profile, self.config, self.db)
-                    self.simulators.append(simulator)
+                pending.append((profile, target_count - existing_count, existing_count))
+
+        if pending:
+            # Queue the key generation of every industry up front, so the
+            # workers keep producing keys while earlier industries are saved
+            key_type = self.config.simulator.key_type
+            loop = asyncio.get_running_loop()
+            with _keygen_pool() as pool:
+                keypair_batches = [
+                    [loop.run_in_executor(pool, generate_keypair, key_type) for _ in range(count)]
+                    for _, count, _ in pending
+                ]
+                for (profile, count, start_index), keypairs in zip(pending, keypair_batches):
+                    new_devices = await self._create_devices(
+                        profile, count, start_index, keypairs=keypairs
+                    )
+                    for device in new_devices:
+                        simulator = self._create_simulator(device, profile)
+                        self.simulators.append(simulator)
 
         # Summary
         counts = await self.db.count_devices_by_industry()
@@ -171,28 +280,43 @@ class FleetOrchestrator:
         self,
         profile: IndustryProfile,
         count: int,
-        start_index: int
+        start_index: int,
+        keypairs: Optional[List["asyncio.Future"]] = None
     ) -> List[Device]:
-        """Create new devices for an industry profile."""
+        """
+        Create new devices for an industry profile.
+
+        Args:
+            profile: Industry profile of the new devices
+            count: Number of devices to create
+            start_index: Index of the first new device
+            keypairs: Already submitted key generation futures, one per
+                device; generated here when not given
+        """
         devices = []
 
         logger.info(f"Creating {count} new devices for {profile.name}")
 
-        for i in range(count):
-            index = start_index + i
+        if keypairs is not None:
+            keypairs = await asyncio.gather(*keypairs)
+        else:
+            # Key generation is CPU-bound: spread it over all cores
+            key_type = self.config.simulator.key_type
+            loop = asyncio.get_running_loop()
+            with _keygen_pool() as pool:
+                keypairs = await asyncio.gather(
+                    *(loop.run_in_executor(pool, generate_keypair, key_type) for _ in range(count))
+                )
 
-            # Generate identity
-            identity = profile.generate_device_identity(index)
-            device_id = f"{profile.config.id_prefix}-{profile.name}-{index:06d}"
+        poll_interval = self.config.server.poll_interval
+        now_iso = _now_iso()
+        indices = range(start_index, start_index + count)
 
-            # Generate RSA keypair
-            private_key, public_key = generate_rsa_keypair()
+        # Identity plus static and initial telemetry inventory, per batch
+        created = profile.create_devices(indices, poll_interval, now_iso)
 
-            # Generate initial static inventory
-            inventory = profile.generate_static_inventory(
-                device_id,
-                poll_interval=self.config.server.poll_interval
-            )
+        for (identity, inventory), (private_key, public_key) in zip(created, keypairs):
+            device_id = inventory["device_id"]
 
             # Create device
             device = Device(
@@ -205,12 +329,12 @@ class FleetOrchestrator:
                 inventory_data=inventory
             )
 
-            # Save to database
-            await self.db.save_device(device)
             devices.append(device)
-
             logger.debug(f"Created device: {device_id}")
 
+        # Save all new devices in one transaction
+        await self.db.save_devices_bulk(devices)
+
         logger.info(f"Created {len(devices)} devices for {profile.name}")
         return devices
 
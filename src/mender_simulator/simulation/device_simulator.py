@@ -3,8 +3,10 @@
 import asyncio
 import logging
 import random
-from datetime import datetime
-from typing import Optional, List, Dict, Any
+import aiohttp
+import orjson
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from ..db.models import Device, DeploymentStatus
 from ..db.database import DatabaseManager
@@ -13,10 +15,68 @@ from ..client.inventory import InventoryClient
 from ..client.deployments import DeploymentsClient, DeploymentState, Deployment
 from ..client.exceptions import AuthenticationError
 from ..utils.config import Config
+from ..utils.crypto import load_private_key
+from ..utils.timestamps import now_rfc3339, utcnow
 from .profiles import IndustryProfile
 
 logger = logging.getLogger(__name__)
 
+# (level, message) for each failure log line; "{artifact}" and "{error}"
+# are filled in per deployment
+_FAILURE_LOG_TEMPLATE = (
+    ("info", "Starting update to {artifact}"),
+    ("info", "Artifact downloaded"),
+    ("warning", "Potential issue detected during installation"),
+    ("error", "Update failed: {error}"),
+    ("info", "Initiating rollback to previous version"),
+    ("info", "Rollback completed, system stable"),
+)
+
+# Download progress checkpoints (percent) written while downloading
+DOWNLOAD_PROGRESS_STEPS = (25, 100)
+
+# What each concurrent _stage_success side effect does, for error logs
+_SUCCESS_SIDE_EFFECTS = ("save the deployment status", "save the device", "update the inventory")
+
+# Mixed into every device's RNG seed so jitter and deployment outcomes
+# differ between runs of the simulator
+_PROCESS_SEED = random.SystemRandom().getrandbits(64)
+
+
+@lru_cache(maxsize=512)
+def _failure_log_messages(artifact_name: str, error_message: str) -> Tuple[Tuple[str, str], ...]:
+    """
+    (level, message) lines for a failed deployment.
+
+    Failures across the fleet mostly share the same artifact and error,
+    so the formatted lines are built once per combination.
+    """
+    return tuple(
+        (level, message.format(artifact=artifact_name, error=error_message))
+        for level, message in _FAILURE_LOG_TEMPLATE
+    )
+
+
+@lru_cache(maxsize=512)
+def _failure_log_fragments(artifact_name: str, error_message: str) -> Tuple[bytes, ...]:
+    """
+    Encoded failure log lines without their leading timestamp.
+
+    Each fragment is ``"level":...,"message":...}`` so a full entry is
+    ``{"timestamp":"<ts>",`` + fragment; only the timestamp is new per call.
+    """
+    return tuple(
+        orjson.dumps({"level": level, "message": message})[1:]
+        for level, message in _failure_log_messages(artifact_name, error_message)
+    )
+
+
+def _failure_logs_payload(artifact_name: str, error_message: str, timestamp: str) -> bytes:
+    """Encoded ``{"messages": [...]}`` body for a failed deployment's logs."""
+    prefix = b'{"timestamp":"' + timestamp.encode() + b'",'
+    fragments = _failure_log_fragments(artifact_name, error_message)
+    return b'{"messages":[' + b",".join(prefix + f for f in fragments) + b"]}"
+
 
 class DeviceSimulator:
     """Simulates a single Mender device's behavior."""
@@ -26,22 +86,65 @@ class DeviceSimulator:
         device: Device,
         profile: IndustryProfile,
         config: Config,
-        db: DatabaseManager
+        db: DatabaseManager,
+        session: Optional[aiohttp.ClientSession] = None,
+        auth_client: Optional[AuthClient] = None,
+        inventory_client: Optional[InventoryClient] = None,
+        deployments_client: Optional[DeploymentsClient] = None,
+        auth_semaphore: Optional[asyncio.Semaphore] = None,
+        startup_jitter: Optional[float] = None
     ):
         self.device = device
         self.profile = profile
         self.config = config
         self.db = db
 
-        self.auth_client = AuthClient(
-            config.server.url,
-            config.server.tenant_token
-        )
-        self.inventory_client = InventoryClient(config.server.url)
-        self.deployments_client = DeploymentsClient(config.server.url)
+        # The orchestrator normally passes fleet-wide clients (their caches
+        # are keyed per device/token); otherwise build private ones on the
+        # shared session (if given) and close them on cleanup.
+        self._owned_clients = []
+        if auth_client is None:
+            auth_client = AuthClient(
+                config.server.url,
+                config.server.tenant_token,
+                session=session
+            )
+            self._owned_clients.append(auth_client)
+        if inventory_client is None:
+            inventory_client = InventoryClient(config.server.url, session=session)
+            self._owned_clients.append(inventory_client)
+        if deployments_client is None:
+            deployments_client = DeploymentsClient(config.server.url, session=session)
+            self._owned_clients.append(deployments_client)
+        self.auth_client = auth_client
+        self.inventory_client = inventory_client
+        self.deployments_client = deployments_client
+
+        # Settings fixed for the simulator's lifetime, resolved once instead
+        # of walking config objects on every poll
+        self._poll_interval = config.server.poll_interval
+        self._success_rate = config.simulator.success_rate
+
+        # Own RNG per device, seeded from its id and the process seed: fixed
+        # for the device within a run, independent of other simulators'
+        # draws, and different on every restart
+        self._rng = random.Random(f"{_PROCESS_SEED}:{device.device_id}")
+
+        # Parsed private key, loaded on first authentication and reused
+        self._signing_key = None
+
+        # Caps fleet-wide concurrent (CPU-bound, RSA-signing) authentications
+        self._auth_semaphore = auth_semaphore
+        # Random delay before the first poll so devices don't run in
+        # lockstep; defaults to up to one poll interval
+        if startup_jitter is None:
+            startup_jitter = config.server.poll_interval
+        self.startup_jitter = startup_jitter
 
         self._running = False
         self._current_deployment: Optional[Deployment] = None
+        # Reused for every deployment this device processes
+        self._status: Optional[DeploymentStatus] = None
         self._force_poll_event = asyncio.Event()
 
     async def start(self) -> None:
@@ -50,6 +153,10 @@ class DeviceSimulator:
         logger.info(f"Device {self.device.device_id} starting simulation")
 
         try:
+            # Spread the fleet's first polls over the poll interval
+            if self.startup_jitter > 0:
+                await asyncio.sleep(self._rng.uniform(0, self.startup_jitter))
+
             # Initial authentication
             if not await self._authenticate():
                 logger.warning(
@@ -58,16 +165,19 @@ class DeviceSimulator:
                 )
 
             # Main simulation loop
+            forced = False
             while self._running:
-                await self._poll_cycle()
+                await self._poll_cycle(force=forced)
+                forced = False
                 # Wait for poll_interval or force_poll signal
                 try:
                     await asyncio.wait_for(
                         self._force_poll_event.wait(),
-                        timeout=self.config.server.poll_interval
+                        timeout=self._poll_interval
                     )
                     # Force poll was triggered
                     self._force_poll_event.clear()
+                    forced = True
                     logger.info(f"Device {self.device.device_id} - Force poll triggered")
                 except asyncio.TimeoutError:
                     # Normal timeout, continue with next poll
@@ -88,20 +198,20 @@ class DeviceSimulator:
         logger.info(f"Device {self.device.device_id} stopping")
 
     async def _cleanup(self) -> None:
-        """Clean up resources."""
-        await self.auth_client.close()
-        await self.inventory_client.close()
-        await self.deployments_client.close()
+        """Clean up resources (shared clients are closed by their owner)."""
+        for client in self._owned_clients:
+            await client.close()
 
     async def _authenticate(self) -> bool:
         """Authenticate device with Mender server."""
-        logger.debug(f"Device {self.device.device_id} authenticating")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Device {self.device.device_id} authenticating")
 
-        token = await self.auth_client.authenticate(
-            self.device.identity_data,
-            self.device.rsa_public_key,
-            self.device.rsa_private_key
-        )
+        if self._auth_semaphore is None:
+            token = await self._get_token()
+        else:
+            async with self._auth_semaphore:
+                token = await self._get_token()
 
         if token:
             self.device.auth_token = token
@@ -111,12 +221,35 @@ class DeviceSimulator:
 
         return False
 
-    async def _poll_cycle(self) -> None:
-        """Execute one polling cycle."""
-        # Ensure we have valid auth
-        if not self.device.auth_token:
+    async def _get_token(self) -> Optional[str]:
+        """Get a valid (cached or refreshed) token for this device."""
+        if self._signing_key is None:
+            self._signing_key = load_private_key(self.device.rsa_private_key)
+
+        return await self.auth_client.get_valid_token(
+            self.device.device_id,
+            self.device.identity_data,
+            self.device.rsa_public_key,
+            self.device.rsa_private_key,
+            signing_key=self._signing_key
+        )
+
+    async def _poll_cycle(self, force: bool = False) -> None:
+        """
+        Execute one polling cycle.
+
+        Args:
+            force: Triggered by force_poll(); bypasses client-side caching
+                of "no deployment" answers
+        """
+        # Ensure we have valid auth, refreshing before the token expires
+        if (
+            not self.device.auth_token
+            or self.auth_client.token_expires_soon(self.device.auth_token)
+        ):
             if not await self._authenticate():
-                return
+                if not self.device.auth_token:
+                    return
 
         # Update last poll time
         await self.db.update_last_poll(self.device.device_id)
@@ -126,7 +259,7 @@ class DeviceSimulator:
             await self._update_inventory()
 
             # Check for deployments
-            deployment = await self._check_deployment()
+            deployment = await self._check_deployment(force=force)
             if deployment:
                 await self._process_deployment(deployment)
 
@@ -134,6 +267,7 @@ class DeviceSimulator:
             # Token expired or device decommissioned, clear token and re-auth next cycle
             logger.warning(f"Device {self.device.device_id} token invalid, will re-authenticate")
             self.device.auth_token = None
+            self.auth_client.invalidate_token(self.device.device_id)
             await self.db.update_device_auth_token(self.device.device_id, None)
 
     async def _update_inventory(self) -> None:
@@ -147,15 +281,17 @@ class DeviceSimulator:
 
         success = await self.inventory_client.update_inventory(
             self.device.auth_token,
-            inventory
+            inventory,
+            device_id=self.device.device_id
         )
 
         if success:
-            await self.db.save_device(self.device)
-            logger.debug(f"Device {self.device.device_id} telemetry updated")
+            await self.db.update_device_inventory(self.device.device_id, inventory)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Device {self.device.device_id} telemetry updated")
 
-    async def _check_deployment(self) -> Optional[Deployment]:
-        """Check for pending deployments."""
+    async def _check_deployment(self, force: bool = False) -> Optional[Deployment]:
+        """Check for pending deployments (always asking the server when forced)."""
         if not self.device.auth_token:
             return None
 
@@ -165,7 +301,8 @@ class DeviceSimulator:
         deployment = await self.deployments_client.check_for_deployment(
             self.device.auth_token,
             device_type,
-            artifact_name
+            artifact_name,
+            force=force
         )
 
         return deployment
@@ -182,18 +319,13 @@ class DeviceSimulator:
         await self.db.update_device_status(self.device.device_id, "updating")
 
         # Create deployment status record
-        status = DeploymentStatus(
-            device_id=self.device.device_id,
-            deployment_id=deployment.id,
-            artifact_name=deployment.artifact_name,
-            status="downloading"
-        )
+        status = self._reset_status(deployment)
         await self.db.save_deployment_status(status)
 
         # Determine if this update will succeed
         # Use config success_rate if set, otherwise use industry-specific rate
-        success_rate = self.config.simulator.success_rate
-        will_succeed = random.random() < success_rate
+        success_rate = self._success_rate
+        will_succeed = self._rng.random() < success_rate
 
         try:
             # Stage 1: Downloading
@@ -209,7 +341,7 @@ class DeviceSimulator:
             if will_succeed:
                 await self._stage_success(deployment, status)
             else:
-                error_msg = random.choice(self.config.error_messages)
+                error_msg = self._rng.choice(self.config.error_messages)
                 await self._stage_failure(deployment, status, error_msg)
 
         except Exception as e:
@@ -221,6 +353,36 @@ class DeviceSimulator:
             self.device.current_status = "idle"
             await self.db.update_device_status(self.device.device_id, "idle")
 
+    def _reset_status(self, deployment: Deployment) -> DeploymentStatus:
+        """Get this device's status object, reset for a new deployment."""
+        status = self._status
+        if status is None:
+            status = self._status = DeploymentStatus(
+                device_id=self.device.device_id,
+                deployment_id=deployment.id,
+                artifact_name=deployment.artifact_name,
+                status="downloading"
+            )
+            return status
+
+        status.deployment_id = deployment.id
+        status.artifact_name = deployment.artifact_name
+        status.status = "downloading"
+        status.progress = 0
+        status.started_at = utcnow()
+        status.completed_at = None
+        status.error_message = None
+        return status
+
+    async def _save_progress(self, status: DeploymentStatus) -> None:
+        """Queue an in-flight status change (the record already exists)."""
+        await self.db.queue_deployment_progress(
+            status.device_id,
+            status.deployment_id,
+            status.status,
+            status.progress
+        )
+
     async def _stage_downloading(
         self,
         deployment: Deployment,
@@ -239,19 +401,21 @@ class DeviceSimulator:
         download_time = self.profile.calculate_download_time(deployment.artifact_size)
         download_time = max(download_time, 2.0)  # Minimum 2 seconds
 
-        # Simulate progress updates
-        steps = 10
-        for i in range(steps):
-            progress = int((i + 1) / steps * 100)
-            status.progress = progress
-            status.status = "downloading"
-            await self.db.save_deployment_status(status)
+        # Simulate progress: a couple of checkpoints rather than a write
+        # (and task switch) per 10% step
+        status.status = "downloading"
+        previous = 0
+        for progress in DOWNLOAD_PROGRESS_STEPS:
+            await asyncio.sleep(download_time * (progress - previous) / 100)
+            previous = progress
 
-            logger.debug(
-                f"Device {self.device.device_id} downloading: {progress}%"
-            )
+            status.progress = progress
+            await self._save_progress(status)
 
-            await asyncio.sleep(download_time / steps)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"Device {self.device.device_id} downloading: {progress}%"
+                )
 
     async def _stage_installing(
         self,
@@ -268,10 +432,10 @@ class DeviceSimulator:
         )
 
         status.status = "installing"
-        await self.db.save_deployment_status(status)
+        await self._save_progress(status)
 
         # Simulate installation time (5-15 seconds)
-        install_time = random.uniform(5, 15)
+        install_time = self._rng.uniform(5, 15)
         await asyncio.sleep(install_time)
 
     async def _stage_rebooting(
@@ -289,10 +453,10 @@ class DeviceSimulator:
         )
 
         status.status = "rebooting"
-        await self.db.save_deployment_status(status)
+        await self._save_progress(status)
 
         # Simulate reboot time (3-8 seconds)
-        reboot_time = random.uniform(3, 8)
+        reboot_time = self._rng.uniform(3, 8)
         await asyncio.sleep(reboot_time)
 
     async def _stage_success(
@@ -306,28 +470,42 @@ class DeviceSimulator:
             f"Updated to {deployment.artifact_name}"
         )
 
-        await self.deployments_client.update_deployment_status(
-            self.device.auth_token,
-            deployment.id,
-            DeploymentState.SUCCESS
-        )
-
         status.status = "success"
-        status.completed_at = datetime.utcnow()
-        await self.db.save_deployment_status(status)
+        status.completed_at = utcnow()
 
         # Update device artifact name and rootfs-image.version
         # deployment.artifact_name already has full name (e.g., tcu-4g-lte-v1.1.0)
         self.device.inventory_data["artifact_name"] = deployment.artifact_name
         self.device.inventory_data["rootfs-image.version"] = deployment.artifact_name
-        await self.db.save_device(self.device)
 
-        # Send updated inventory immediately so Mender shows "Current software"
-        await self.inventory_client.update_inventory(
+        # Persist and send the updated inventory (so Mender shows "Current
+        # software") concurrently. The update itself has succeeded, so a
+        # failing side effect is only logged and must not turn the
+        # deployment into a failure.
+        results = await asyncio.gather(
+            self.db.save_deployment_status(status),
+            self.db.save_device(self.device),
+            self.inventory_client.update_inventory(
+                self.device.auth_token,
+                self.device.inventory_data,
+                device_id=self.device.device_id
+            ),
+            return_exceptions=True
+        )
+        for action, result in zip(_SUCCESS_SIDE_EFFECTS, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"Device {self.device.device_id} - failed to {action} after success: {result}"
+                )
+        if not isinstance(results[2], BaseException):
+            logger.info(f"Device {self.device.device_id} - Inventory updated with new artifact_name")
+
+        # Reported once everything else has settled
+        await self.deployments_client.update_deployment_status(
             self.device.auth_token,
-            self.device.inventory_data
+            deployment.id,
+            DeploymentState.SUCCESS
         )
-        logger.info(f"Device {self.device.device_id} - Inventory updated with new artifact_name")
         # Note: No logs sent on success, only on failure
 
     async def _stage_failure(
@@ -349,54 +527,16 @@ class DeviceSimulator:
         )
 
         status.status = "failure"
-        status.completed_at = datetime.utcnow()
+        status.completed_at = utcnow()
         status.error_message = error_message
         await self.db.save_deployment_status(status)
 
-        # Send failure logs
-        logs = self._generate_failure_logs(deployment, error_message)
-        await self.deployments_client.send_deployment_logs(
+        # Send failure logs (encoded from cached fragments, no re-dump)
+        payload = _failure_logs_payload(
+            deployment.artifact_name, error_message, now_rfc3339()
+        )
+        await self.deployments_client.send_deployment_logs_raw(
             self.device.auth_token,
             deployment.id,
-            logs
+            payload
         )
-
-    def _generate_failure_logs(
-        self,
-        deployment: Deployment,
-        error_message: str
-    ) -> List[Dict[str, Any]]:
-        """Generate realistic failure logs."""
-        now = datetime.utcnow().isoformat() + "Z"  # RFC3339 format required by Mender
-        return [
-            {
-                "timestamp": now,
-                "level": "info",
-                "message": f"Starting update to {deployment.artifact_name}"
-            },
-            {
-                "timestamp": now,
-                "level": "info",
-                "message": "Artifact downloaded"
-            },
-            {
-                "timestamp": now,
-                "level": "warning",
-                "message": "Potential issue detected during installation"
-            },
-            {
-                "timestamp": now,
-                "level": "error",
-                "message": f"Update failed: {error_message}"
-            },
-            {
-                "timestamp": now,
-                "level": "info",
-                "message": "Initiating rollback to previous version"
-            },
-            {
-                "timestamp": now,
-                "level": "info",
-                "message": "Rollback completed, system stable"
-            }
-        ]
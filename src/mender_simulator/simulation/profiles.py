@@ -1,21 +1,174 @@
 """Industry profiles for device identity and inventory generation."""
 
 import random
-import string
-import hashlib
-from typing import Dict, Any, Tuple
-from datetime import datetime
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 
 from ..utils.config import IndustryConfig
+from ..utils.timestamps import now_iso as _now_iso
+
+# Update success probability by industry (DEFAULT_SUCCESS_PROBABILITY otherwise).
+# Medical devices are more stable; industrial ones fail more often due to
+# harsh environments.
+SUCCESS_PROBABILITIES = {
+    "medical": 0.95,
+    "industrial_iot": 0.75,
+}
+DEFAULT_SUCCESS_PROBABILITY = 0.80
+
+# Defaults for the per-industry choice pools (overridable in config)
+_DEFAULT_MANUFACTURERS = ("WVWZZZ", "3VWDP7")
+_DEFAULT_OUI_PREFIXES = ("00:1A:2B", "DC:A6:32")
+_DEFAULT_OEM_VARIANTS = ("standard",)
+_DEFAULT_ZONE_TYPES = ("hvac",)
+_DEFAULT_DEVICE_CLASSES = ("II", "III")
+_DEFAULT_PLANTS = ("PLANT-A", "PLANT-B")
+_DEFAULT_REGIONS = ("NA", "EU")
+
+_VIN_YEAR_CODES = "ABCDEFGHJKLMNPRSTVWXY"
+_HVAC_MODES = ("cooling", "heating", "idle", "auto")
+# randint() ranges as populations for choices() in the batch paths
+_ODOMETER_INCREMENTS = range(0, 11)
+_LINE_NUMBERS = range(1, 11)
+_UNIT_NUMBERS = range(0, 100)
+_STORE_IDS = range(1000, 10000)
+
+# Upper-case hex pair for every byte value, for MAC formatting
+_HEX = tuple(f"{i:02X}" for i in range(256))
+# MACs drawn per refill of a profile's MAC pool
+MAC_BATCH_SIZE = 256
 
 
 class IndustryProfile:
     """Generates realistic device identities and inventory for each industry."""
 
+    __slots__ = (
+        "config", "name", "success_probability",
+        "_random", "_randint", "_choice", "_uniform", "_randbytes", "_choices",
+        "_getrandbits",
+        "_generate_identity", "_enrich_static", "_update_industry_telemetry",
+        "_update_industry_telemetry_batch", "_generate_identities_batch",
+        "_enrich_static_batch",
+        "_manufacturers", "_fixed_vin_layout", "_oui_prefixes", "_device_classes",
+        "_plants", "_regions", "_oem_variants", "_zone_types",
+        "_compliance", "_protocols", "_payment_modules",
+        "_inventory_template", "_device_id_prefix", "_seconds_per_byte",
+        "_mac_pool",
+    )
+
+    # Industry-specific methods by industry name, resolved once per profile
+    _IDENTITY_GENERATORS = {
+        "automotive": "_generate_automotive_identity",
+        "smart_buildings": "_generate_smart_buildings_identity",
+        "medical": "_generate_medical_identity",
+        "industrial_iot": "_generate_industrial_identity",
+        "retail": "_generate_retail_identity",
+    }
+    _STATIC_ENRICHERS = {
+        "automotive": "_enrich_automotive_static",
+        "smart_buildings": "_enrich_smart_buildings_static",
+        "medical": "_enrich_medical_static",
+        "industrial_iot": "_enrich_industrial_static",
+        "retail": "_enrich_retail_static",
+    }
+    _TELEMETRY_UPDATERS = {
+        "automotive": "_update_automotive_telemetry",
+        "smart_buildings": "_update_smart_buildings_telemetry",
+        "medical": "_update_medical_telemetry",
+        "industrial_iot": "_update_industrial_telemetry",
+        "retail": "_update_retail_telemetry",
+    }
+    # Batch variants drawing the random values of a whole batch at once
+    _BATCH_IDENTITY_GENERATORS = {
+        "automotive": "_generate_automotive_identities",
+    }
+    _BATCH_STATIC_ENRICHERS = {
+        "industrial_iot": "_enrich_industrial_static_batch",
+        "retail": "_enrich_retail_static_batch",
+    }
+    _BATCH_TELEMETRY_UPDATERS = {
+        "automotive": "_update_automotive_telemetry_batch",
+        "industrial_iot": "_update_industrial_telemetry_batch",
+    }
+
     def __init__(self, config: IndustryConfig):
         self.config = config
         self.name = config.name
 
+        # Private generator with pre-bound draws: telemetry runs on every
+        # poll of every device, so skip the module-level lookups
+        rng = random.Random()
+        self._random = rng.random
+        self._randint = rng.randint
+        self._choice = rng.choice
+        self._uniform = rng.uniform
+        self._randbytes = rng.randbytes
+        self._choices = rng.choices
+        self._getrandbits = rng.getrandbits
+        self._mac_pool: List[str] = []
+
+        # Bound industry handlers (no per-call dispatch dict)
+        self._generate_identity = getattr(
+            self, self._IDENTITY_GENERATORS.get(self.name, "_generate_generic_identity")
+        )
+        batch_generator = self._BATCH_IDENTITY_GENERATORS.get(self.name)
+        self._generate_identities_batch = (
+            getattr(self, batch_generator) if batch_generator else None
+        )
+        enricher = self._STATIC_ENRICHERS.get(self.name)
+        self._enrich_static = getattr(self, enricher) if enricher else None
+        batch_enricher = self._BATCH_STATIC_ENRICHERS.get(self.name)
+        self._enrich_static_batch = getattr(self, batch_enricher) if batch_enricher else None
+        updater = self._TELEMETRY_UPDATERS.get(self.name)
+        self._update_industry_telemetry = getattr(self, updater) if updater else None
+        batch_updater = self._BATCH_TELEMETRY_UPDATERS.get(self.name)
+        self._update_industry_telemetry_batch = (
+            getattr(self, batch_updater) if batch_updater else None
+        )
+
+        # Config-driven pools and lists, looked up once instead of per device.
+        # Choice pools are frozen to tuples so later config edits can't leak in.
+        extra = config.extra_config
+        inventory = config.inventory
+        self._manufacturers = tuple(extra.get("manufacturers", _DEFAULT_MANUFACTURERS))
+        # WMI + year code + 6-digit serial is 13 chars, so standard 6-char
+        # manufacturer codes always need the same 4-char zero padding
+        self._fixed_vin_layout = all(len(m) == 6 for m in self._manufacturers)
+        self._oui_prefixes = tuple(extra.get("oui_prefixes", _DEFAULT_OUI_PREFIXES))
+        self._device_classes = tuple(extra.get("device_classes", _DEFAULT_DEVICE_CLASSES))
+        self._plants = tuple(extra.get("plants", _DEFAULT_PLANTS))
+        self._regions = tuple(extra.get("regions", _DEFAULT_REGIONS))
+        self._oem_variants = tuple(inventory.get("oem_variant", _DEFAULT_OEM_VARIANTS))
+        self._zone_types = tuple(inventory.get("zone_types", _DEFAULT_ZONE_TYPES))
+        # These are reported as inventory lists, so the defaults stay lists
+        self._compliance = inventory.get("compliance", ["FDA-510k"])
+        self._protocols = inventory.get("protocols", ["modbus"])
+        self._payment_modules = inventory.get("payment_modules", ["chip"])
+
+        # Static inventory shared by every device of this industry; each
+        # device starts from a shallow copy
+        template = dict(config.inventory)
+        template["industry"] = self.name
+        template["simulator_version"] = "1.0.0"
+
+        # Format artifact_name as {device_type}-{version} for Mender compatibility
+        version = template.get("artifact_name", "unknown")
+        device_type = template.get("device_type", "unknown")
+        full_artifact_name = f"{device_type}-{version}"
+        template["artifact_name"] = full_artifact_name
+        template["rootfs-image.version"] = full_artifact_name
+        self._inventory_template = template
+        self._device_id_prefix = f"{config.id_prefix}-{self.name}-"
+
+        # Simulated transfer cost; None means no bandwidth configured
+        bandwidth_bytes_per_sec = config.bandwidth_kbps * 1024
+        self._seconds_per_byte = (
+            1.0 / bandwidth_bytes_per_sec if bandwidth_bytes_per_sec > 0 else None
+        )
+
+        self.success_probability = SUCCESS_PROBABILITIES.get(
+            self.name, DEFAULT_SUCCESS_PROBABILITY
+        )
+
     def generate_device_identity(self, index: int) -> Dict[str, str]:
         """
         Generate unique device identity based on industry.
@@ -26,16 +179,42 @@ class IndustryProfile:
         Returns:
             Identity data dictionary
         """
-        generators = {
-            "automotive": self._generate_automotive_identity,
-            "smart_buildings": self._generate_smart_buildings_identity,
-            "medical": self._generate_medical_identity,
-            "industrial_iot": self._generate_industrial_identity,
-            "retail": self._generate_retail_identity,
-        }
+        return self._generate_identity(index)
 
-        generator = generators.get(self.name, self._generate_generic_identity)
-        return generator(index)
+    def generate_device_identities(self, indices: Iterable[int]) -> List[Dict[str, str]]:
+        """
+        Generate identities for many devices at once (fleet provisioning).
+
+        The industry generator is resolved once for the whole batch, and
+        industries with a batch generator draw their random parts in bulk.
+
+        Args:
+            indices: Device indexes within this industry
+
+        Returns:
+            Identity data dictionaries, in the order of indices
+        """
+        if self._generate_identities_batch:
+            return self._generate_identities_batch(list(indices))
+        generator = self._generate_identity
+        return [generator(index) for index in indices]
+
+    def generate_macs_batch(self, count: int) -> List[str]:
+        """
+        Generate many random MAC addresses from a single random draw.
+
+        Args:
+            count: Number of MAC addresses
+
+        Returns:
+            MAC addresses as upper-case colon-separated hex pairs
+        """
+        b = self._randbytes(6 * count)
+        h = _HEX
+        return [
+            f"{h[b[i]]}:{h[b[i + 1]]}:{h[b[i + 2]]}:{h[b[i + 3]]}:{h[b[i + 4]]}:{h[b[i + 5]]}"
+            for i in range(0, 6 * count, 6)
+        ]
 
     def generate_static_inventory(self, device_id: str, poll_interval: int = 30) -> Dict[str, Any]:
         """
@@ -48,64 +227,167 @@ class IndustryProfile:
         Returns:
             Static inventory data dictionary
         """
-        base_inventory = dict(self.config.inventory)
+        base_inventory = self._inventory_template.copy()
 
-        # Add common static attributes
+        # Add per-device static attributes
         base_inventory["device_id"] = device_id
-        base_inventory["industry"] = self.name
-        base_inventory["simulator_version"] = "1.0.0"
         base_inventory["poll_interval_seconds"] = poll_interval
 
-        # Format artifact_name as {device_type}-{version} for Mender compatibility
-        version = base_inventory.get("artifact_name", "unknown")
-        device_type = base_inventory.get("device_type", "unknown")
-        full_artifact_name = f"{device_type}-{version}"
-        base_inventory["artifact_name"] = full_artifact_name
-        base_inventory["rootfs-image.version"] = full_artifact_name
-
         # Add industry-specific static attributes
-        enrichers = {
-            "automotive": self._enrich_automotive_static,
-            "smart_buildings": self._enrich_smart_buildings_static,
-            "medical": self._enrich_medical_static,
-            "industrial_iot": self._enrich_industrial_static,
-            "retail": self._enrich_retail_static,
-        }
-
-        enricher = enrichers.get(self.name)
-        if enricher:
-            enricher(base_inventory)
+        if self._enrich_static:
+            self._enrich_static(base_inventory)
 
         return base_inventory
 
-    def update_telemetry(self, inventory: Dict[str, Any]) -> Dict[str, Any]:
+    def generate_static_inventories(
+        self,
+        device_ids: Iterable[str],
+        poll_interval: int = 30
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate static inventory of many devices at once.
+
+        Args:
+            device_ids: The device identifiers
+            poll_interval: Polling interval in seconds
+
+        Returns:
+            Static inventory data dictionaries, in the order of device_ids
+        """
+        template = self._inventory_template
+        inventories = []
+        for device_id in device_ids:
+            inventory = template.copy()
+            inventory["device_id"] = device_id
+            inventory["poll_interval_seconds"] = poll_interval
+            inventories.append(inventory)
+
+        if self._enrich_static_batch:
+            self._enrich_static_batch(inventories)
+        elif self._enrich_static:
+            enricher = self._enrich_static
+            for inventory in inventories:
+                enricher(inventory)
+
+        return inventories
+
+    def create_device(
+        self,
+        index: int,
+        poll_interval: int = 30,
+        now_iso: Optional[str] = None
+    ) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        """
+        Generate identity and initial inventory of a new device in one pass.
+
+        Equivalent to generate_device_identity, generate_static_inventory
+        and update_telemetry, with the inventory built only once.
+
+        Args:
+            index: Device index within this industry
+            poll_interval: Polling interval in seconds
+            now_iso: last_seen timestamp to use (default: now)
+
+        Returns:
+            Tuple of (identity_data, inventory_data); the device ID is
+            inventory_data["device_id"]
+        """
+        identity = self._generate_identity(index)
+
+        inventory = self._inventory_template.copy()
+        inventory["device_id"] = f"{self._device_id_prefix}{index:06d}"
+        inventory["poll_interval_seconds"] = poll_interval
+        if self._enrich_static:
+            self._enrich_static(inventory)
+
+        inventory["last_seen"] = now_iso or _now_iso()
+        if self._update_industry_telemetry:
+            self._update_industry_telemetry(inventory)
+
+        return identity, inventory
+
+    def create_devices(
+        self,
+        indices: Iterable[int],
+        poll_interval: int = 30,
+        now_iso: Optional[str] = None
+    ) -> List[Tuple[Dict[str, str], Dict[str, Any]]]:
+        """
+        Batch form of create_device() for fleet provisioning.
+
+        Identities, static inventory and initial telemetry are each
+        generated for the whole batch, with random values drawn in bulk.
+
+        Args:
+            indices: Device indexes within this industry
+            poll_interval: Polling interval in seconds
+            now_iso: last_seen timestamp to use (default: now)
+
+        Returns:
+            (identity_data, inventory_data) tuples, in the order of indices
+        """
+        indices = list(indices)
+        identities = self.generate_device_identities(indices)
+        prefix = self._device_id_prefix
+        inventories = self.generate_static_inventories(
+            [f"{prefix}{index:06d}" for index in indices], poll_interval
+        )
+        self.update_telemetry_batch(inventories, now_iso)
+        return list(zip(identities, inventories))
+
+    def update_telemetry(
+        self,
+        inventory: Dict[str, Any],
+        now_iso: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
         Update telemetry/dynamic attributes (called on each poll).
 
         Args:
             inventory: Existing inventory to update
+            now_iso: last_seen timestamp to use; callers updating many
+                devices in the same tick can compute it once and share it
 
         Returns:
             Updated inventory with new telemetry values
         """
         # Update common dynamic attributes
-        inventory["last_seen"] = datetime.utcnow().isoformat()
+        inventory["last_seen"] = now_iso or _now_iso()
 
         # Add industry-specific telemetry
-        updaters = {
-            "automotive": self._update_automotive_telemetry,
-            "smart_buildings": self._update_smart_buildings_telemetry,
-            "medical": self._update_medical_telemetry,
-            "industrial_iot": self._update_industrial_telemetry,
-            "retail": self._update_retail_telemetry,
-        }
-
-        updater = updaters.get(self.name)
-        if updater:
-            updater(inventory)
+        if self._update_industry_telemetry:
+            self._update_industry_telemetry(inventory)
 
         return inventory
 
+    def update_telemetry_batch(
+        self,
+        inventories: Iterable[Dict[str, Any]],
+        now_iso: Optional[str] = None
+    ) -> None:
+        """
+        Update telemetry of many devices of this industry in place.
+
+        All devices get the same last_seen timestamp and, for industries
+        with a batch updater, the random values of the whole batch are
+        drawn in bulk instead of once per device.
+
+        Args:
+            inventories: Existing inventories to update
+            now_iso: last_seen timestamp to use (default: now)
+        """
+        inventories = list(inventories)
+        now = now_iso or _now_iso()
+        for inventory in inventories:
+            inventory["last_seen"] = now
+
+        if self._update_industry_telemetry_batch:
+            self._update_industry_telemetry_batch(inventories)
+        elif self._update_industry_telemetry:
+            updater = self._update_industry_telemetry
+            for inventory in inventories:
+                updater(inventory)
+
     def calculate_download_time(self, content_length_bytes: int) -> float:
         """
         Calculate simulated download time based on virtual bandwidth.
@@ -116,42 +398,49 @@ class IndustryProfile:
         Returns:
             Download time in seconds
         """
-        bandwidth_bytes_per_sec = self.config.bandwidth_kbps * 1024
-        if bandwidth_bytes_per_sec <= 0:
+        if self._seconds_per_byte is None:
             return 1.0
 
-        base_time = content_length_bytes / bandwidth_bytes_per_sec
-
-        # Add some jitter (±10%)
-        jitter = random.uniform(0.9, 1.1)
-        return base_time * jitter
+        # Add some jitter (±10%); same as uniform(0.9, 1.1) without the call
+        return content_length_bytes * self._seconds_per_byte * (0.9 + 0.2 * self._random())
 
     # Identity generators
 
     def _generate_automotive_identity(self, index: int) -> Dict[str, str]:
         """Generate VIN-based identity for automotive."""
-        manufacturers = self.config.extra_config.get(
-            "manufacturers", ["WVWZZZ", "3VWDP7"]
-        )
-        manufacturer = random.choice(manufacturers)
-        year = random.choice("ABCDEFGHJKLMNPRSTVWXY")  # VIN year codes
-        serial = f"{index:06d}"
+        manufacturer = self._choice(self._manufacturers)
+        year = self._choice(_VIN_YEAR_CODES)
 
-        vin = f"{manufacturer}{year}{serial}"[:17].ljust(17, "0")
+        if self._fixed_vin_layout and index < 1_000_000:
+            vin = f"{manufacturer}{year}{index:06d}0000"
+        else:
+            vin = f"{manufacturer}{year}{index:06d}"[:17].ljust(17, "0")
 
         return {
             "mac": self._generate_mac(),
             "vin": vin,
         }
 
+    def _generate_automotive_identities(self, indices: List[int]) -> List[Dict[str, str]]:
+        """Generate VIN-based identities for many vehicles."""
+        if not (self._fixed_vin_layout and all(0 <= i < 1_000_000 for i in indices)):
+            generator = self._generate_automotive_identity
+            return [generator(index) for index in indices]
+
+        n = len(indices)
+        manufacturers = self._choices(self._manufacturers, k=n)
+        years = self._choices(_VIN_YEAR_CODES, k=n)
+        macs = self.generate_macs_batch(n)
+        return [
+            {"mac": mac, "vin": f"{m}{y}{index:06d}0000"}
+            for mac, m, y, index in zip(macs, manufacturers, years, indices)
+        ]
+
     def _generate_smart_buildings_identity(self, index: int) -> Dict[str, str]:
         """Generate identity for smart buildings."""
-        oui_prefixes = self.config.extra_config.get(
-            "oui_prefixes", ["00:1A:2B", "DC:A6:32"]
-        )
-        oui = random.choice(oui_prefixes)
-        device_part = ":".join([f"{random.randint(0, 255):02X}" for _ in range(3)])
-        mac = f"{oui}:{device_part}"
+        oui = self._choice(self._oui_prefixes)
+        b = self._randbytes(3)
+        mac = f"{oui}:{_HEX[b[0]]}:{_HEX[b[1]]}:{_HEX[b[2]]}"
         serial_number = f"BMS{index:08d}"
 
         return {
@@ -199,45 +488,37 @@ class IndustryProfile:
 
     def _enrich_automotive_static(self, inventory: Dict[str, Any]) -> None:
         """Add static automotive attributes."""
-        variants = self.config.inventory.get("oem_variant", ["standard"])
-        inventory["oem_variant"] = random.choice(variants)
+        inventory["oem_variant"] = self._choice(self._oem_variants)
         # Initial odometer value (will increment in telemetry)
-        inventory["odometer_km"] = random.randint(0, 200000)
+        inventory["odometer_km"] = self._randint(0, 200000)
 
     def _enrich_smart_buildings_static(self, inventory: Dict[str, Any]) -> None:
         """Add static smart building attributes."""
-        zones = self.config.inventory.get("zone_types", ["hvac"])
-        inventory["zone_type"] = random.choice(zones)
-        inventory["floor"] = random.randint(1, 50)
-        inventory["room_count"] = random.randint(1, 20)
+        inventory["zone_type"] = self._choice(self._zone_types)
+        inventory["floor"] = self._randint(1, 50)
+        inventory["room_count"] = self._randint(1, 20)
 
     def _enrich_medical_static(self, inventory: Dict[str, Any]) -> None:
         """Add static medical device attributes."""
-        device_classes = self.config.extra_config.get("device_classes", ["II", "III"])
-        inventory["fda_device_class"] = random.choice(device_classes)
-        compliance = self.config.inventory.get("compliance", ["FDA-510k"])
-        inventory["compliance_standards"] = compliance
+        inventory["fda_device_class"] = self._choice(self._device_classes)
+        inventory["compliance_standards"] = self._compliance
         inventory["calibration_due"] = "2025-06-15"
         inventory["software_validated"] = True
 
     def _enrich_industrial_static(self, inventory: Dict[str, Any]) -> None:
         """Add static industrial IoT attributes."""
-        plants = self.config.extra_config.get("plants", ["PLANT-A", "PLANT-B"])
-        inventory["plant_id"] = random.choice(plants)
-        inventory["line"] = f"L{random.randint(1, 10):02d}"
-        inventory["unit"] = f"U{random.randint(0, 99):03d}"
-        protocols = self.config.inventory.get("protocols", ["modbus"])
-        inventory["supported_protocols"] = protocols
-        inventory["plc_connected"] = random.choice([True, False])
+        inventory["plant_id"] = self._choice(self._plants)
+        inventory["line"] = f"L{self._randint(1, 10):02d}"
+        inventory["unit"] = f"U{self._randint(0, 99):03d}"
+        inventory["supported_protocols"] = self._protocols
+        inventory["plc_connected"] = self._getrandbits(1) == 1
 
     def _enrich_retail_static(self, inventory: Dict[str, Any]) -> None:
         """Add static retail POS attributes."""
-        regions = self.config.extra_config.get("regions", ["NA", "EU"])
-        inventory["region"] = random.choice(regions)
-        inventory["store_id"] = str(random.randint(1000, 9999))
-        modules = self.config.inventory.get("payment_modules", ["chip"])
-        inventory["payment_modules"] = modules
-        inventory["receipt_printer"] = random.choice([True, False])
+        inventory["region"] = self._choice(self._regions)
+        inventory["store_id"] = str(self._randint(1000, 9999))
+        inventory["payment_modules"] = self._payment_modules
+        inventory["receipt_printer"] = self._getrandbits(1) == 1
 
     # Dynamic attribute updaters (called on each poll)
     # Note: Mender is NOT a real-time telemetry system. These are device
@@ -247,13 +528,13 @@ class IndustryProfile:
         """Update automotive status attributes."""
         # Odometer only increments slowly (device status, not real-time)
         current_km = inventory.get("odometer_km", 0)
-        inventory["odometer_km"] = current_km + random.randint(0, 10)
+        inventory["odometer_km"] = current_km + self._randint(0, 10)
 
     def _update_smart_buildings_telemetry(self, inventory: Dict[str, Any]) -> None:
         """Update smart building status attributes."""
         # HVAC mode changes infrequently
-        if random.random() < 0.1:  # 10% chance to change
-            inventory["hvac_mode"] = random.choice(["cooling", "heating", "idle", "auto"])
+        if self._random() < 0.1:  # 10% chance to change
+            inventory["hvac_mode"] = self._choice(_HVAC_MODES)
 
     def _update_medical_telemetry(self, inventory: Dict[str, Any]) -> None:
         """Update medical device status attributes."""
@@ -264,26 +545,79 @@ class IndustryProfile:
         """Update industrial IoT status attributes."""
         # Uptime increments (hours since last boot)
         current_uptime = inventory.get("uptime_hours", 0)
-        inventory["uptime_hours"] = current_uptime + round(random.uniform(0.5, 1), 2)
+        inventory["uptime_hours"] = current_uptime + round(self._uniform(0.5, 1), 2)
 
     def _update_retail_telemetry(self, inventory: Dict[str, Any]) -> None:
         """Update retail POS status attributes."""
         # Device operational status only
         pass  # POS terminals report static inventory only
 
+    # Batch enrichers and updaters (same distributions as the per-device ones)
+
+    def _flags(self, count: int) -> List[bool]:
+        """Draw count random booleans from a single getrandbits() call."""
+        bits = self._getrandbits(count) if count else 0
+        return [(bits >> i) & 1 == 1 for i in range(count)]
+
+    def _enrich_industrial_static_batch(self, inventories: List[Dict[str, Any]]) -> None:
+        """Add static industrial IoT attributes to many devices."""
+        n = len(inventories)
+        choices = self._choices
+        protocols = self._protocols
+        for inventory, plant, line, unit, plc in zip(
+            inventories,
+            choices(self._plants, k=n),
+            choices(_LINE_NUMBERS, k=n),
+            choices(_UNIT_NUMBERS, k=n),
+            self._flags(n)
+        ):
+            inventory["plant_id"] = plant
+            inventory["line"] = f"L{line:02d}"
+            inventory["unit"] = f"U{unit:03d}"
+            inventory["supported_protocols"] = protocols
+            inventory["plc_connected"] = plc
+
+    def _enrich_retail_static_batch(self, inventories: List[Dict[str, Any]]) -> None:
+        """Add static retail POS attributes to many devices."""
+        n = len(inventories)
+        choices = self._choices
+        payment_modules = self._payment_modules
+        for inventory, region, store_id, printer in zip(
+            inventories,
+            choices(self._regions, k=n),
+            choices(_STORE_IDS, k=n),
+            self._flags(n)
+        ):
+            inventory["region"] = region
+            inventory["store_id"] = str(store_id)
+            inventory["payment_modules"] = payment_modules
+            inventory["receipt_printer"] = printer
+
+    def _update_automotive_telemetry_batch(self, inventories: List[Dict[str, Any]]) -> None:
+        """Update automotive status attributes of many devices."""
+        increments = self._choices(_ODOMETER_INCREMENTS, k=len(inventories))
+        for inventory, km in zip(inventories, increments):
+            inventory["odometer_km"] = inventory.get("odometer_km", 0) + km
+
+    def _update_industrial_telemetry_batch(self, inventories: List[Dict[str, Any]]) -> None:
+        """Update industrial IoT status attributes of many devices."""
+        # uniform(0.5, 1) without the per-device Python-level call
+        rand = self._random
+        for inventory in inventories:
+            hours = round(0.5 + 0.5 * rand(), 2)
+            inventory["uptime_hours"] = inventory.get("uptime_hours", 0) + hours
+
     # Helpers
 
     def _generate_mac(self) -> str:
         """Generate random MAC address."""
-        return ":".join([f"{random.randint(0, 255):02X}" for _ in range(6)])
+        # Identities are generated in bursts at fleet creation, so draw
+        # and format MACs a batch at a time
+        pool = self._mac_pool
+        if not pool:
+            pool.extend(self.generate_macs_batch(MAC_BATCH_SIZE))
+        return pool.pop()
 
     def get_success_probability(self) -> float:
         """Get success probability for updates based on industry."""
-        # Medical devices should have higher success rate (more stable)
-        if self.name == "medical":
-            return 0.95
-        # Industrial devices may have more failures due to harsh environments
-        if self.name == "industrial_iot":
-            return 0.75
-        # Default
-        return 0.80
+        return self.success_probability
@@ -1,11 +1,21 @@
 """Configuration loading and validation utilities."""
 
+import copy
 import yaml
 import logging
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, field
 
+from .crypto import KEY_TYPES
+
+# libyaml-backed loader when PyYAML was built with it (much faster parsing)
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +34,7 @@ class SimulatorConfig:
     log_file: str = "simulator.log"
     log_level: str = "INFO"
     database_path: str = "devices.db"
+    key_type: str = "rsa"
 
 
 @dataclass
@@ -48,6 +59,23 @@ class Config:
     error_messages: list
 
 
+@lru_cache(maxsize=32)
+def _read_yaml(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """
+    Parse a YAML file, cached per path and modification time.
+
+    Args:
+        path: Path to the YAML file
+        mtime_ns: Modification time of the file; part of the cache key so
+            edited files are parsed again
+
+    Returns:
+        Parsed document (shared between calls, callers must not mutate it)
+    """
+    with open(path, 'r') as f:
+        return yaml.load(f, Loader=_YamlLoader)
+
+
 def load_config(config_path: str = "config/config.yaml") -> Config:
     """
     Load and validate configuration from YAML file.
@@ -66,8 +94,9 @@ def load_config(config_path: str = "config/config.yaml") -> Config:
     if not path.exists():
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
 
-    with open(path, 'r') as f:
-        raw_config = yaml.safe_load(f)
+    # Config objects keep references into the document, so each load gets
+    # its own copy of the cached parse
+    raw_config = copy.deepcopy(_read_yaml(str(path), path.stat().st_mtime_ns))
 
     # Parse server config
     server_data = raw_config.get('server', {})
@@ -83,7 +112,8 @@ def load_config(config_path: str = "config/config.yaml") -> Config:
         success_rate=sim_data.get('success_rate', 0.8),
         log_file=sim_data.get('log_file', 'simulator.log'),
         log_level=sim_data.get('log_level', 'INFO'),
-        database_path=sim_data.get('database_path', 'devices.db')
+        database_path=sim_data.get('database_path', 'devices.db'),
+        key_type=sim_data.get('key_type', 'rsa')
     )
 
     # Parse industry profiles
@@ -136,6 +166,9 @@ def _validate_config(config: Config) -> None:
     if not 0 <= config.simulator.success_rate <= 1:
         raise ValueError("Success rate must be between 0 and 1")
 
+    if config.simulator.key_type not in KEY_TYPES:
+        raise ValueError(f"Key type must be one of {', '.join(KEY_TYPES)}")
+
     enabled_industries = [i for i in config.industries.values() if i.enabled]
     if not enabled_industries:
         logger.warning("No industries are enabled")
@@ -1,32 +1,69 @@
-"""Cryptographic utilities for RSA key generation and signing."""
+"""Cryptographic utilities for device key generation and signing."""
 
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa, padding
 from cryptography.hazmat.backends import default_backend
-from typing import Tuple
+from functools import lru_cache
+from typing import Tuple, Union
 import base64
 
+# Device key types accepted by generate_keypair()
+KEY_TYPES = ("rsa", "ed25519")
 
-def generate_rsa_keypair(key_size: int = 3072) -> Tuple[str, str]:
+PrivateKey = Union[rsa.RSAPrivateKey, ed25519.Ed25519PrivateKey]
+PublicKey = Union[rsa.RSAPublicKey, ed25519.Ed25519PublicKey]
+
+RSA_PUBLIC_EXPONENT = 65537
+
+# Stateless objects shared by every key generation/parse call
+_BACKEND = default_backend()
+_NO_ENCRYPTION = serialization.NoEncryption()
+_PKCS1V15 = padding.PKCS1v15()
+_SHA256 = hashes.SHA256()
+
+# Parsed keys kept by sign_data()/verify_signature(), keyed by PEM. Note
+# this keeps private key material of recently used devices in memory.
+KEY_CACHE_SIZE = 4096
+
+
+def generate_keypair(key_type: str = "rsa") -> Tuple[str, str]:
+    """
+    Generate a device key pair of the given type.
+
+    Args:
+        key_type: One of KEY_TYPES
+
+    Returns:
+        Tuple of (private_key_pem, public_key_pem) as strings
+    """
+    if key_type == "ed25519":
+        return generate_ed25519_keypair()
+    if key_type == "rsa":
+        return generate_rsa_keypair()
+    raise ValueError(f"Unsupported key type: {key_type}")
+
+
+def generate_rsa_keypair(key_size: int = 2048) -> Tuple[str, str]:
     """
     Generate an RSA key pair for device authentication.
 
     Args:
-        key_size: RSA key size in bits (default 3072 for Mender compatibility)
+        key_size: RSA key size in bits (default 2048, the smallest size
+            Mender accepts; key generation cost grows steeply with size)
 
     Returns:
         Tuple of (private_key_pem, public_key_pem) as strings
     """
     private_key = rsa.generate_private_key(
-        public_exponent=65537,
+        public_exponent=RSA_PUBLIC_EXPONENT,
         key_size=key_size,
-        backend=default_backend()
+        backend=_BACKEND
     )
 
     private_pem = private_key.private_bytes(
         encoding=serialization.Encoding.PEM,
         format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption()
+        encryption_algorithm=_NO_ENCRYPTION
     ).decode('utf-8')
 
     public_key = private_key.public_key()
@@ -38,35 +75,152 @@ def generate_rsa_keypair(key_size: int = 3072) -> Tuple[str, str]:
     return private_pem, public_pem
 
 
-def sign_data(private_key_pem: str, data: bytes) -> str:
+def generate_ed25519_keypair() -> Tuple[str, str]:
+    """
+    Generate an Ed25519 key pair for device authentication.
+
+    Much cheaper than RSA: there is no prime search, key generation is a
+    single random scalar.
+
+    Returns:
+        Tuple of (private_key_pem, public_key_pem) as strings
     """
-    Sign data using RSA private key with SHA256.
+    private_key = ed25519.Ed25519PrivateKey.generate()
+
+    private_pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=_NO_ENCRYPTION
+    ).decode('utf-8')
+
+    public_pem = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode('utf-8')
+
+    return private_pem, public_pem
+
+
+def load_private_key(private_key_pem: str) -> PrivateKey:
+    """
+    Parse a PEM-encoded private key once so it can be reused for signing.
 
     Args:
         private_key_pem: PEM-encoded private key
-        data: Data to sign
 
     Returns:
-        Base64-encoded signature
+        Private key object accepted by sign_with_key()
     """
-    private_key = serialization.load_pem_private_key(
+    return serialization.load_pem_private_key(
         private_key_pem.encode('utf-8'),
         password=None,
-        backend=default_backend()
+        backend=_BACKEND
     )
 
-    signature = private_key.sign(
-        data,
-        padding.PKCS1v15(),
-        hashes.SHA256()
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _cached_private_key(private_key_pem: str) -> PrivateKey:
+    """Parse a private key once per PEM (see KEY_CACHE_SIZE)."""
+    return load_private_key(private_key_pem)
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def _cached_public_key(public_key_pem: str) -> PublicKey:
+    """Parse a public key once per PEM (see KEY_CACHE_SIZE)."""
+    return load_public_key(public_key_pem)
+
+
+def sign_data_raw(private_key: PrivateKey, data: bytes) -> bytes:
+    """
+    Sign data with an already parsed private key.
+
+    RSA keys sign with PKCS#1 v1.5 and SHA256, Ed25519 keys sign the data
+    directly.
+
+    Args:
+        private_key: Key returned by load_private_key()
+        data: Data to sign
+
+    Returns:
+        Binary signature
+    """
+    if isinstance(private_key, ed25519.Ed25519PrivateKey):
+        return private_key.sign(data)
+    return private_key.sign(data, _PKCS1V15, _SHA256)
+
+
+def sign_with_key(private_key: PrivateKey, data: bytes) -> str:
+    """
+    Sign data with an already parsed private key (see sign_data_raw()).
+
+    Args:
+        private_key: Key returned by load_private_key()
+        data: Data to sign
+
+    Returns:
+        Base64-encoded signature
+    """
+    return base64.b64encode(sign_data_raw(private_key, data)).decode('utf-8')
+
+
+def sign_data(private_key_pem: str, data: bytes) -> str:
+    """
+    Sign data using a PEM-encoded private key (see sign_with_key()).
+
+    The parsed key is cached, so repeated signing with the same PEM skips
+    deserialization.
+
+    Args:
+        private_key_pem: PEM-encoded private key
+        data: Data to sign
+
+    Returns:
+        Base64-encoded signature
+    """
+    return sign_with_key(_cached_private_key(private_key_pem), data)
+
+
+def load_public_key(public_key_pem: str) -> PublicKey:
+    """
+    Parse a PEM-encoded public key once so it can be reused for verifying.
+
+    Args:
+        public_key_pem: PEM-encoded public key
+
+    Returns:
+        Public key object accepted by verify_signature_raw()
+    """
+    return serialization.load_pem_public_key(
+        public_key_pem.encode('utf-8'),
+        backend=_BACKEND
     )
 
-    return base64.b64encode(signature).decode('utf-8')
+
+def verify_signature_raw(public_key: PublicKey, data: bytes, signature: bytes) -> bool:
+    """
+    Verify a binary signature with an already parsed public key.
+
+    Args:
+        public_key: Key returned by load_public_key()
+        data: Original data that was signed
+        signature: Binary signature, as returned by sign_data_raw()
+
+    Returns:
+        True if signature is valid, False otherwise
+    """
+    try:
+        if isinstance(public_key, ed25519.Ed25519PublicKey):
+            public_key.verify(signature, data)
+        else:
+            public_key.verify(signature, data, _PKCS1V15, _SHA256)
+        return True
+    except Exception:
+        return False
 
 
 def verify_signature(public_key_pem: str, data: bytes, signature_b64: str) -> bool:
     """
-    Verify a signature using RSA public key.
+    Verify a signature using an RSA or Ed25519 public key.
 
     Args:
         public_key_pem: PEM-encoded public key
@@ -77,19 +231,8 @@ def verify_signature(public_key_pem: str, data: bytes, signature_b64: str) -> bo
         True if signature is valid, False otherwise
     """
     try:
-        public_key = serialization.load_pem_public_key(
-            public_key_pem.encode('utf-8'),
-            backend=default_backend()
-        )
-
+        public_key = _cached_public_key(public_key_pem)
         signature = base64.b64decode(signature_b64)
-
-        public_key.verify(
-            signature,
-            data,
-            padding.PKCS1v15(),
-            hashes.SHA256()
-        )
-        return True
     except Exception:
         return False
+    return verify_signature_raw(public_key, data, signature)
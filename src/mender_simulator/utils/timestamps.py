@@ -0,0 +1,51 @@
+"""Cheap UTC timestamps for hot paths.
+
+Formatting a datetime is comparatively expensive and thousands of
+simulated devices ask for "now" many times per second, so the formatted
+value is rebuilt only when the wall-clock second changes.
+"""
+
+import time
+from datetime import datetime
+
+# [epoch second, datetime, ISO string] for the current second
+_clock_cache = [0, datetime.utcfromtimestamp(0), datetime.utcfromtimestamp(0).isoformat()]
+
+
+def utcnow() -> datetime:
+    """UTC now truncated to the second, rebuilt only when the second changes."""
+    t = int(time.time())
+    cache = _clock_cache
+    if cache[0] != t:
+        dt = datetime.utcfromtimestamp(t)
+        cache[0], cache[1], cache[2] = t, dt, dt.isoformat()
+    return cache[1]
+
+
+def now_iso() -> str:
+    """ISO-8601 form of utcnow() (second precision), cached per second."""
+    utcnow()
+    return _clock_cache[2]
+
+
+def isoformat(dt: datetime) -> str:
+    """dt.isoformat(), reusing the cached string when dt came from utcnow()."""
+    if dt is _clock_cache[1]:
+        return _clock_cache[2]
+    return dt.isoformat()
+
+
+def now_rfc3339() -> str:
+    """
+    UTC now as RFC 3339 with microseconds, e.g. ``2024-01-01T12:00:00.123456Z``.
+
+    Only the fractional part is formatted per call; the date/time prefix
+    comes from the per-second cache.
+    """
+    t = time.time_ns()
+    sec, nanos = divmod(t, 1_000_000_000)
+    cache = _clock_cache
+    if cache[0] != sec:
+        dt = datetime.utcfromtimestamp(sec)
+        cache[0], cache[1], cache[2] = sec, dt, dt.isoformat()
+    return f"{cache[2]}.{nanos // 1000:06d}Z"
@@ -0,0 +1,512 @@
+"""Tests for Mender API clients."""
+
+import pytest
+import asyncio
+import json
+import base64
+import time
+import orjson
+
+from mender_simulator.client.auth import AuthClient, _jwt_expiry
+from mender_simulator.client.inventory import InventoryClient
+from mender_simulator.client import deployments
+from mender_simulator.client.deployments import DeploymentsClient
+from mender_simulator.client.session import HeaderCache, create_session
+from mender_simulator.utils.crypto import generate_rsa_keypair, load_private_key, verify_signature
+from mender_simulator.utils.config import load_config
+from mender_simulator.simulation.profiles import IndustryProfile
+from mender_simulator.simulation.device_simulator import DeviceSimulator
+from mender_simulator.db.models import Device
+
+
+def make_jwt(claims):
+    """Build an unsigned JWT carrying the given claims."""
+    def b64(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+    return f"{b64({'alg': 'none'})}.{b64(claims)}.sig"
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response."""
+
+    def __init__(self, status, body=b"", headers=None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._body.decode()
+
+    async def json(self):
+        return json.loads(self._body)
+
+
+class FakeSession:
+    """Minimal stand-in for aiohttp.ClientSession that records requests."""
+
+    def __init__(self, status=200, body=b"", headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.closed = False
+        self.requests = []
+
+    def _request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return FakeResponse(self.status, self.body, self.headers)
+
+    def get(self, url, **kwargs):
+        return self._request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self._request("HEAD", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._request("PUT", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self._request("PATCH", url, **kwargs)
+
+    async def close(self):
+        self.closed = True
+
+
+class TestSharedSession:
+    """Tests for sharing one HTTP session across clients."""
+
+    async def test_clients_use_injected_session(self):
+        """Test that all clients reuse the injected session."""
+        session = create_session()
+        auth = AuthClient("https://test.mender.io", "token", session=session)
+        inventory = InventoryClient("https://test.mender.io", session=session)
+        deployments = DeploymentsClient("https://test.mender.io", session=session)
+
+        for client in (auth, inventory, deployments):
+            await client._ensure_session()
+            assert client._session is session
+
+        await session.close()
+
+    async def test_close_does_not_close_injected_session(self):
+        """Test that closing a client leaves a shared session open."""
+        session = create_session()
+        client = InventoryClient("https://test.mender.io", session=session)
+
+        await client.close()
+
+        assert not session.closed
+        await session.close()
+
+    async def test_close_closes_owned_session(self):
+        """Test that a lazily created session is closed by its client."""
+        client = DeploymentsClient("https://test.mender.io")
+        await client._ensure_session()
+        session = client._session
+
+        await client.close()
+
+        assert session.closed
+
+    async def test_simulators_share_injected_clients(self, sample_config_yaml):
+        """Test that simulators use fleet-wide clients and leave them open."""
+        config = load_config(str(sample_config_yaml))
+        profile = IndustryProfile(config.industries["automotive"])
+        session = create_session()
+        auth = AuthClient(config.server.url, config.server.tenant_token, session=session)
+        inventory = InventoryClient(config.server.url, session=session)
+        deployments = DeploymentsClient(config.server.url, session=session)
+
+        simulators = [
+            DeviceSimulator(
+                Device(
+                    device_id=f"VIN-{i}",
+                    identity_data={},
+                    rsa_private_key="",
+                    rsa_public_key="",
+                    industry_profile="automotive"
+                ),
+                profile,
+                config,
+                db=None,
+                session=session,
+                auth_client=auth,
+                inventory_client=inventory,
+                deployments_client=deployments
+            )
+            for i in range(2)
+        ]
+
+        assert simulators[0].auth_client is simulators[1].auth_client is auth
+        for simulator in simulators:
+            await simulator._cleanup()
+        assert not session.closed
+
+        await session.close()
+
+    async def test_session_connector_tuning(self):
+        """Test that the shared session uses the tuned connector and timeouts."""
+        session = create_session()
+
+        assert session.connector.limit == 0
+        assert session.connector.limit_per_host == 512
+        assert session.timeout.total == 30
+        assert session.timeout.connect == 5
+
+        await session.close()
+
+
+class TestHeaderCache:
+    """Tests for per-token header caching."""
+
+    def test_headers_built_once_per_token(self):
+        """Test that the same dict is returned for the same token."""
+        cache = HeaderCache()
+
+        headers = cache.for_token("abc")
+
+        assert headers == {"Authorization": "Bearer abc", "Content-Type": "application/json"}
+        assert cache.for_token("abc") is headers
+        assert cache.for_token("def") is not headers
+
+    def test_headers_without_content_type(self):
+        """Test auth-only headers for bodiless requests."""
+        assert HeaderCache(content_type=None).for_token("abc") == {"Authorization": "Bearer abc"}
+
+    def test_cache_is_bounded(self):
+        """Test that rotating tokens don't grow the cache forever."""
+        cache = HeaderCache(max_size=2)
+        for token in ("a", "b", "c"):
+            cache.for_token(token)
+        assert len(cache._headers) <= 2
+
+class TestTokenValidityCache:
+    """Tests for AuthClient token validity caching."""
+
+    def test_jwt_expiry(self):
+        """Test decoding the exp claim from a JWT."""
+        assert _jwt_expiry(make_jwt({"exp": 1700000000})) == 1700000000
+        assert _jwt_expiry(make_jwt({"sub": "device"})) is None
+        assert _jwt_expiry("not-a-jwt") is None
+
+    async def test_valid_token_is_cached(self):
+        """Test that repeated checks of a valid token hit the server once."""
+        session = FakeSession(status=200)
+        client = AuthClient("https://test.mender.io", "token", session=session)
+        token = make_jwt({"exp": time.time() + 3600})
+
+        assert await client.check_token_valid(token) is True
+        assert await client.check_token_valid(token) is True
+        assert len(session.requests) == 1
+
+    async def test_invalid_token_is_cached(self):
+        """Test that a rejected token is remembered as invalid."""
+        session = FakeSession(status=401)
+        client = AuthClient("https://test.mender.io", "token", session=session)
+
+        assert await client.check_token_valid("expired") is False
+        assert await client.check_token_valid("expired") is False
+        assert len(session.requests) == 1
+
+    async def test_expired_jwt_not_cached(self):
+        """Test that a token past its exp claim is always re-checked."""
+        session = FakeSession(status=200)
+        client = AuthClient("https://test.mender.io", "token", session=session)
+        token = make_jwt({"exp": time.time() - 10})
+
+        await client.check_token_valid(token)
+        await client.check_token_valid(token)
+        assert len(session.requests) == 2
+
+
+class TestPayloadEncoding:
+    """Tests for request/response JSON encoding."""
+
+    async def test_authenticate_signs_sent_body(self):
+        """Test that the signature covers exactly the bytes that are sent."""
+        private_key, public_key = generate_rsa_keypair(key_size=2048)
+        session = FakeSession(status=200, body=b"jwt-token")
+        client = AuthClient("https://test.mender.io", "tenant", session=session)
+
+        token = await client.authenticate({"mac": "AA:BB"}, public_key, private_key)
+
+        assert token == "jwt-token"
+        _, _, kwargs = session.requests[0]
+        body = kwargs["data"]
+        assert json.loads(body)["id_data"] == json.dumps({"mac": "AA:BB"})
+        assert verify_signature(public_key, body, kwargs["headers"]["X-MEN-Signature"])
+
+    async def test_get_inventory_parses_attributes(self):
+        """Test that inventory attributes are converted back to a dict."""
+        body = json.dumps([{"name": "device_type", "value": "tcu"}]).encode()
+        session = FakeSession(status=200, body=body)
+        client = InventoryClient("https://test.mender.io", session=session)
+
+        inventory = await client.get_inventory("token")
+
+        assert inventory == {"device_type": "tcu"}
+
+    def test_format_values(self):
+        """Test conversion of inventory values to what Mender stores."""
+        formatted = InventoryClient._format_values({
+            "protocols": ["modbus", "opcua"],
+            "plc_connected": True,
+            "receipt_printer": False,
+            "floor": 3,
+        })
+
+        assert formatted == {
+            "protocols": ["modbus", "opcua"],
+            "plc_connected": "true",
+            "receipt_printer": "false",
+            "floor": "3",
+        }
+
+    async def test_unchanged_inventory_is_skipped(self):
+        """Test that an identical inventory is only sent once per token."""
+        session = FakeSession(status=200)
+        client = InventoryClient("https://test.mender.io", session=session)
+        inventory = {"device_type": "tcu", "floor": 3}
+
+        assert await client.update_inventory("token", inventory, device_id="dev-1")
+        assert await client.update_inventory("token", inventory, device_id="dev-1")
+        assert len(session.requests) == 1
+
+        await client.update_inventory("token", {**inventory, "floor": 4}, device_id="dev-1")
+        await client.update_inventory("new-token", {**inventory, "floor": 4}, device_id="dev-1")
+        assert len(session.requests) == 3
+
+    async def test_only_changed_attributes_are_sent(self):
+        """Test that follow-up updates only carry the changed attributes."""
+        session = FakeSession(status=200)
+        client = InventoryClient("https://test.mender.io", session=session)
+        inventory = {"device_type": "tcu", "kernel": "5.10", "cpu_load": 10}
+
+        await client.update_inventory("token", inventory, device_id="dev-1")
+        await client.update_inventory("token", {**inventory, "cpu_load": 20}, device_id="dev-1")
+        await client.update_inventory("new-token", {**inventory, "cpu_load": 20}, device_id="dev-1")
+
+        sent = [orjson.loads(kwargs["data"]) for _, _, kwargs in session.requests]
+        assert len(sent[0]) == 3
+        assert sent[1] == [{"name": "cpu_load", "value": "20"}]
+        assert len(sent[2]) == 3
+
+    async def test_failed_update_is_resent_in_full(self):
+        """Test that a rejected update does not count as sent."""
+        session = FakeSession(status=500)
+        client = InventoryClient("https://test.mender.io", session=session)
+        inventory = {"device_type": "tcu", "cpu_load": 10}
+
+        assert not await client.update_inventory("token", inventory, device_id="dev-1")
+        session.status = 200
+        assert await client.update_inventory("token", inventory, device_id="dev-1")
+
+        assert len(orjson.loads(session.requests[1][2]["data"])) == 2
+
+
+class TestDeploymentCheckCache:
+    """Tests for conditional/cached deployment checks."""
+
+    async def test_send_raw_logs(self):
+        """Test that pre-encoded logs are sent without re-encoding."""
+        session = FakeSession(status=204)
+        client = DeploymentsClient("https://test.mender.io", session=session)
+        payload = b'{"messages":[]}'
+
+        assert await client.send_deployment_logs_raw("token", "dep-1", payload)
+
+        method, url, kwargs = session.requests[0]
+        assert method == "PUT"
+        assert url.endswith("/deployments/device/deployments/dep-1/log")
+        assert kwargs["data"] is payload
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+
+    async def test_no_deployment_is_cached(self):
+        """Test that a 204 answer suppresses the next request for a while."""
+        session = FakeSession(status=204)
+        client = DeploymentsClient("https://test.mender.io", session=session)
+
+        assert await client.check_for_deployment("token", "tcu", "v1") is None
+        assert await client.check_for_deployment("token", "tcu", "v1") is None
+        assert len(session.requests) == 1
+
+    async def test_no_deployment_cache_disabled(self):
+        """Test that a zero TTL always asks the server."""
+        session = FakeSession(status=204)
+        client = DeploymentsClient(
+            "https://test.mender.io", session=session, no_deployment_ttl=0
+        )
+
+        await client.check_for_deployment("token", "tcu", "v1")
+        await client.check_for_deployment("token", "tcu", "v1")
+        assert len(session.requests) == 2
+
+    async def test_forced_check_bypasses_no_deployment_cache(self):
+        """Test that a forced check always asks the server."""
+        session = FakeSession(status=204)
+        client = DeploymentsClient("https://test.mender.io", session=session)
+
+        await client.check_for_deployment("token", "tcu", "v1")
+        await client.check_for_deployment("token", "tcu", "v1", force=True)
+        assert len(session.requests) == 2
+
+    async def test_etag_sent_and_not_modified(self):
+        """Test that the last ETag is sent and a 304 yields the same deployment."""
+        body = json.dumps({
+            "id": "dep-1",
+            "artifact": {"artifact_name": "v2", "source": {"uri": "http://a", "size": 10}}
+        }).encode()
+        session = FakeSession(status=200, body=body, headers={"ETag": '"abc"'})
+        client = DeploymentsClient("https://test.mender.io", session=session)
+
+        deployment = await client.check_for_deployment("token", "tcu", "v1")
+        assert deployment.id == "dep-1"
+
+        session.status = 304
+        assert await client.check_for_deployment("token", "tcu", "v1") is deployment
+        _, _, kwargs = session.requests[1]
+        assert kwargs["headers"]["If-None-Match"] == '"abc"'
+
+    async def test_artifact_head_reused_per_device(self):
+        """Test that a device reuses its own HEAD check but not another device's."""
+        session = FakeSession(status=200, headers={"Content-Length": "1024"})
+        client = DeploymentsClient("https://test.mender.io", session=session)
+
+        results = await asyncio.gather(
+            client.download_artifact("token-1", "https://s3/artifact.mender"),
+            client.download_artifact("token-1", "https://s3/artifact.mender"),
+            client.download_artifact("token-2", "https://s3/artifact.mender")
+        )
+
+        assert results == [True, True, True]
+        assert len(session.requests) == 2
+
+    async def test_malformed_content_length(self):
+        """Test that an invalid Content-Length doesn't fail the download check."""
+        session = FakeSession(status=200, headers={"Content-Length": "lots"})
+        client = DeploymentsClient("https://test.mender.io", session=session)
+
+        assert await client.download_artifact("token", "https://s3/artifact.mender") is True
+        assert client._head_cache[("token", "https://s3/artifact.mender")][0] == 0
+
+    async def test_artifact_head_cache_is_bounded(self, monkeypatch):
+        """Test that the HEAD cache doesn't grow past its size limit."""
+        monkeypatch.setattr(deployments, "CACHE_MAX_ENTRIES", 2)
+        session = FakeSession(status=200, headers={"Content-Length": "1"})
+        client = DeploymentsClient("https://test.mender.io", session=session)
+
+        for i in range(5):
+            await client.download_artifact("token", f"https://s3/artifact-{i}.mender")
+
+        assert len(client._head_cache) <= 2
+        assert len(client._head_locks) <= 2
+
+    async def test_inaccessible_artifact_not_cached(self):
+        """Test that failed HEAD checks are retried."""
+        session = FakeSession(status=403)
+        client = DeploymentsClient("https://test.mender.io", session=session)
+
+        assert await client.download_artifact("token", "https://s3/denied") is False
+        assert await client.download_artifact("token", "https://s3/denied") is False
+        assert len(session.requests) == 2
+
+class TestTokenRefresh:
+    """Tests for proactive token refresh."""
+
+    @pytest.fixture(scope="class")
+    @classmethod
+    def keypair(cls):
+        """Generate one keypair for the whole class."""
+        return generate_rsa_keypair(key_size=2048)
+
+    def test_token_expires_soon(self):
+        """Test detection of tokens close to expiry."""
+        client = AuthClient("https://test.mender.io", "tenant")
+
+        assert client.token_expires_soon(make_jwt({"exp": time.time() + 30})) is True
+        assert client.token_expires_soon(make_jwt({"exp": time.time() + 3600})) is False
+        assert client.token_expires_soon("opaque-token") is False
+
+    async def test_get_valid_token_reuses_fresh_token(self, keypair):
+        """Test that a fresh token is returned without re-authenticating."""
+        private_key, public_key = keypair
+        token = make_jwt({"exp": time.time() + 3600})
+        session = FakeSession(status=200, body=token.encode())
+        client = AuthClient("https://test.mender.io", "tenant", session=session)
+
+        first = await client.get_valid_token("dev-1", {"mac": "AA"}, public_key, private_key)
+        second = await client.get_valid_token("dev-1", {"mac": "AA"}, public_key, private_key)
+
+        assert first == second == token
+        assert len(session.requests) == 1
+
+    async def test_concurrent_refresh_collapses(self, keypair):
+        """Test that concurrent callers for one device share one refresh."""
+        private_key, public_key = keypair
+        token = make_jwt({"exp": time.time() + 3600})
+        session = FakeSession(status=200, body=token.encode())
+        client = AuthClient("https://test.mender.io", "tenant", session=session)
+
+        tokens = await asyncio.gather(*(
+            client.get_valid_token("dev-1", {"mac": "AA"}, public_key, private_key)
+            for _ in range(5)
+        ))
+
+        assert set(tokens) == {token}
+        assert len(session.requests) == 1
+
+    async def test_expiring_token_is_refreshed(self, keypair):
+        """Test that a token inside the refresh window triggers re-auth."""
+        private_key, public_key = keypair
+        session = FakeSession(status=200, body=make_jwt({"exp": time.time() + 10}).encode())
+        client = AuthClient("https://test.mender.io", "tenant", session=session)
+
+        await client.get_valid_token("dev-1", {"mac": "AA"}, public_key, private_key)
+        await client.get_valid_token("dev-1", {"mac": "AA"}, public_key, private_key)
+
+        assert len(session.requests) == 2
+
+
+    async def test_authenticate_many(self, keypair):
+        """Test bounded fan-out authentication keeps results in order."""
+        private_key, public_key = keypair
+        session = FakeSession(status=200, body=b"jwt")
+        client = AuthClient("https://test.mender.io", "tenant", session=session)
+        specs = [
+            {
+                "identity_data": {"mac": f"AA:{i:02X}"},
+                "public_key_pem": public_key,
+                "private_key_pem": private_key,
+            }
+            for i in range(4)
+        ]
+
+        results = await client.authenticate_many(specs, concurrency=2)
+
+        assert results == ["jwt"] * 4
+        assert len(session.requests) == 4
+
+    async def test_authenticate_with_parsed_key(self, keypair):
+        """Test that a pre-parsed signing key produces a valid signature."""
+        private_pem, public_pem = keypair
+        session = FakeSession(status=200, body=b"token")
+        client = AuthClient("https://test.mender.io", "tenant", session=session)
+
+        token = await client.authenticate(
+            {"mac": "AA"}, public_pem, "not-a-pem", signing_key=load_private_key(private_pem)
+        )
+
+        assert token == "token"
+        method, url, kwargs = session.requests[0]
+        assert verify_signature(public_pem, kwargs["data"], kwargs["headers"]["X-MEN-Signature"])
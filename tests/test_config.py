@@ -1,18 +1,16 @@
 """Tests for configuration loading."""
 
 import pytest
-import sys
 import os
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
 from mender_simulator.utils.config import (
     load_config,
     get_enabled_industries,
     Config,
     ServerConfig,
     SimulatorConfig,
-    IndustryConfig
+    IndustryConfig,
+    _read_yaml
 )
 
 
@@ -41,6 +39,7 @@ class TestLoadConfig:
 
         assert config.simulator.success_rate == 0.8
         assert config.simulator.log_level == "DEBUG"
+        assert config.simulator.key_type == "rsa"
 
     def test_load_config_industries(self, sample_config_yaml):
         """Test that industries are loaded correctly."""
@@ -58,6 +57,31 @@ class TestLoadConfig:
         assert len(config.error_messages) == 2
         assert "Test error 1" in config.error_messages
 
+    def test_load_config_caches_parse(self, sample_config_yaml):
+        """Test that reloading an unchanged file reuses the parsed YAML."""
+        _read_yaml.cache_clear()
+
+        first = load_config(str(sample_config_yaml))
+        second = load_config(str(sample_config_yaml))
+
+        assert _read_yaml.cache_info().hits == 1
+        assert first == second
+        # Each load still gets independent objects
+        first.industries["automotive"].inventory["device_type"] = "changed"
+        assert second.industries["automotive"].inventory["device_type"] == "test-automotive"
+
+    def test_load_config_reparses_modified_file(self, sample_config_yaml):
+        """Test that edits to the file are picked up."""
+        load_config(str(sample_config_yaml))
+        content = sample_config_yaml.read_text().replace("poll_interval: 10", "poll_interval: 20")
+        sample_config_yaml.write_text(content)
+        stat = sample_config_yaml.stat()
+        os.utime(sample_config_yaml, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        config = load_config(str(sample_config_yaml))
+
+        assert config.server.poll_interval == 20
+
     def test_load_config_file_not_found(self):
         """Test error handling for missing config file."""
         with pytest.raises(FileNotFoundError):
@@ -101,6 +125,25 @@ industries: {}
         with pytest.raises(ValueError, match="Success rate"):
             load_config(str(config_path))
 
+    def test_load_config_invalid_key_type(self, temp_dir):
+        """Test validation of the device key type."""
+        config_content = """
+server:
+  url: "https://test.mender.io"
+  tenant_token: "test"
+  poll_interval: 30
+
+simulator:
+  key_type: "dsa"
+
+industries: {}
+"""
+        config_path = temp_dir / "invalid_config.yaml"
+        config_path.write_text(config_content)
+
+        with pytest.raises(ValueError, match="Key type"):
+            load_config(str(config_path))
+
 
 class TestGetEnabledIndustries:
     """Tests for filtering enabled industries."""
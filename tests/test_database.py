@@ -1,25 +1,37 @@
 """Tests for database operations."""
 
+import asyncio
 import pytest
+import pytest_asyncio
 import sys
-import os
 from datetime import datetime
 
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
-
+from mender_simulator.db import database
 from mender_simulator.db.database import DatabaseManager
 from mender_simulator.db.models import Device, DeploymentStatus
 
 
-@pytest.fixture
-async def db_manager(temp_db_path):
-    """Create a database manager for testing."""
-    manager = DatabaseManager(temp_db_path)
+@pytest_asyncio.fixture(scope="module")
+async def shared_db_manager():
+    """Connect one in-memory database manager (and create the schema) per module."""
+    manager = DatabaseManager("file:mender_test_db?mode=memory&cache=shared")
     await manager.connect()
     yield manager
     await manager.close()
 
 
+@pytest_asyncio.fixture
+async def db_manager(shared_db_manager):
+    """Database manager for testing, emptied again after each test."""
+    yield shared_db_manager
+    shared_db_manager._pending_polls.clear()
+    shared_db_manager._pending_progress.clear()
+    await shared_db_manager._connection.executescript(
+        "DELETE FROM deployment_status; DELETE FROM devices;"
+    )
+    await shared_db_manager._connection.commit()
+
+
 @pytest.fixture
 def sample_device():
     """Create a sample device for testing."""
@@ -34,10 +46,24 @@ def sample_device():
     )
 
 
+@pytest.fixture
+def sample_devices(sample_device):
+    """Create an automotive and a medical device for multi-device tests."""
+    return [
+        sample_device,
+        Device(
+            device_id="TEST-002",
+            identity_data={"mac": "11:22:33:44:55:66"},
+            rsa_private_key="key",
+            rsa_public_key="key",
+            industry_profile="medical"
+        )
+    ]
+
+
 class TestDatabaseManager:
     """Tests for DatabaseManager."""
 
-    @pytest.mark.asyncio
     async def test_connect_creates_tables(self, temp_db_path):
         """Test that connecting creates required tables."""
         manager = DatabaseManager(temp_db_path)
@@ -49,7 +75,18 @@ class TestDatabaseManager:
 
         await manager.close()
 
-    @pytest.mark.asyncio
+    async def test_indexes_exist(self, db_manager):
+        """Test that the filtered query paths keep their indexes."""
+        async with db_manager._connection.execute(
+            "SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'index'"
+        ) as cursor:
+            indexes = {row[0]: (row[1], row[2]) for row in await cursor.fetchall()}
+
+        assert indexes["idx_devices_industry"][0] == "devices"
+        assert "industry_profile" in indexes["idx_devices_industry"][1]
+        assert indexes["idx_deployment_active"][0] == "deployment_status"
+        assert "WHERE status NOT IN ('success', 'failure')" in indexes["idx_deployment_active"][1]
+
     async def test_save_and_get_device(self, db_manager, sample_device):
         """Test saving and retrieving a device."""
         await db_manager.save_device(sample_device)
@@ -60,44 +97,23 @@ class TestDatabaseManager:
         assert retrieved.device_id == sample_device.device_id
         assert retrieved.industry_profile == "automotive"
 
-    @pytest.mark.asyncio
     async def test_get_nonexistent_device(self, db_manager):
         """Test getting a device that doesn't exist."""
         result = await db_manager.get_device("NONEXISTENT")
         assert result is None
 
-    @pytest.mark.asyncio
-    async def test_get_all_devices(self, db_manager, sample_device):
+    async def test_get_all_devices(self, db_manager, sample_devices):
         """Test getting all devices."""
         # Save multiple devices
-        await db_manager.save_device(sample_device)
-
-        device2 = Device(
-            device_id="TEST-002",
-            identity_data={"mac": "11:22:33:44:55:66"},
-            rsa_private_key="key",
-            rsa_public_key="key",
-            industry_profile="medical"
-        )
-        await db_manager.save_device(device2)
+        await db_manager.save_devices_bulk(sample_devices)
 
         devices = await db_manager.get_all_devices()
 
         assert len(devices) == 2
 
-    @pytest.mark.asyncio
-    async def test_get_devices_by_industry(self, db_manager, sample_device):
+    async def test_get_devices_by_industry(self, db_manager, sample_devices):
         """Test filtering devices by industry."""
-        await db_manager.save_device(sample_device)
-
-        device2 = Device(
-            device_id="TEST-002",
-            identity_data={"mac": "11:22:33:44:55:66"},
-            rsa_private_key="key",
-            rsa_public_key="key",
-            industry_profile="medical"
-        )
-        await db_manager.save_device(device2)
+        await db_manager.save_devices_bulk(sample_devices)
 
         automotive_devices = await db_manager.get_devices_by_industry("automotive")
         medical_devices = await db_manager.get_devices_by_industry("medical")
@@ -106,17 +122,294 @@ class TestDatabaseManager:
         assert len(medical_devices) == 1
         assert automotive_devices[0].device_id == "TEST-001"
 
-    @pytest.mark.asyncio
+    async def test_iter_devices_streams_in_batches(self, db_manager):
+        """Test streaming devices with a batch size smaller than the table."""
+        await db_manager.save_devices_bulk(
+            Device(
+                device_id=f"TEST-{i:03d}",
+                identity_data={},
+                rsa_private_key="key",
+                rsa_public_key="key",
+                industry_profile="medical" if i % 2 else "automotive"
+            )
+            for i in range(5)
+        )
+
+        all_ids = [d.device_id async for d in db_manager.iter_devices(batch_size=2)]
+        medical_ids = [
+            d.device_id
+            async for d in db_manager.iter_devices_by_industry("medical", batch_size=2)
+        ]
+
+        assert sorted(all_ids) == [f"TEST-{i:03d}" for i in range(5)]
+        assert sorted(medical_ids) == ["TEST-001", "TEST-003"]
+
+    async def test_abandoned_iteration_releases_reader(self, temp_db_path):
+        """Test that breaking out of a device stream doesn't hold a pooled reader."""
+        manager = DatabaseManager(temp_db_path, reader_count=1)
+        await manager.connect()
+        await manager.save_devices_bulk(
+            Device(
+                device_id=f"TEST-{i:03d}",
+                identity_data={},
+                rsa_private_key="key",
+                rsa_public_key="key",
+                industry_profile="medical"
+            )
+            for i in range(5)
+        )
+
+        stream = manager.iter_devices_by_industry("medical", batch_size=2)
+        first = await stream.__anext__()
+
+        # The stream is left suspended; the only reader must still be free
+        assert first.device_id == "TEST-000"
+        assert await asyncio.wait_for(manager.count_devices(), timeout=1) == 5
+
+        await stream.aclose()
+        await manager.close()
+
+    async def test_save_devices_bulk(self, db_manager):
+        """Test saving many devices in one batch."""
+        devices = [
+            Device(
+                device_id=f"BULK-{i:03d}",
+                identity_data={"mac": f"00:00:00:00:00:{i:02X}"},
+                rsa_private_key="key",
+                rsa_public_key="key",
+                industry_profile="retail"
+            )
+            for i in range(10)
+        ]
+
+        await db_manager.save_devices_bulk(devices)
+
+        assert await db_manager.count_devices() == 10
+        device = await db_manager.get_device("BULK-003")
+        assert device.identity_data == {"mac": "00:00:00:00:00:03"}
+
+    async def test_transaction_commits_together(self, db_manager, sample_device):
+        """Test that writes inside a transaction are committed at the end."""
+        async with db_manager.transaction():
+            await db_manager.save_device(sample_device)
+            await db_manager.update_device_status(sample_device.device_id, "updating")
+
+        device = await db_manager.get_device(sample_device.device_id)
+        assert device.current_status == "updating"
+
+    async def test_transaction_rolls_back_on_error(self, db_manager, sample_device):
+        """Test that a failing transaction leaves no partial writes."""
+        with pytest.raises(RuntimeError):
+            async with db_manager.transaction():
+                await db_manager.save_device(sample_device)
+                raise RuntimeError("boom")
+
+        assert await db_manager.get_device(sample_device.device_id) is None
+
+    async def test_concurrent_single_and_bulk_saves(self, db_manager, sample_devices):
+        """Test that a single-row save and a bulk save can run concurrently."""
+        single, *bulk = sample_devices
+        bulk.append(Device(
+            device_id="TEST-003",
+            identity_data={},
+            rsa_private_key="key",
+            rsa_public_key="key",
+            industry_profile="retail"
+        ))
+
+        await asyncio.gather(
+            db_manager.save_device(single),
+            db_manager.save_devices_bulk(bulk)
+        )
+
+        assert await db_manager.count_devices() == 3
+
+    async def test_rollback_keeps_other_tasks_writes(self, db_manager, sample_devices):
+        """Test that rolling back a transaction doesn't discard another task's save."""
+        first, second = sample_devices
+        transaction_open = asyncio.Event()
+
+        async def failing_transaction():
+            with pytest.raises(RuntimeError):
+                async with db_manager.transaction():
+                    await db_manager.save_device(first)
+                    transaction_open.set()
+                    await asyncio.sleep(0.01)
+                    raise RuntimeError("boom")
+
+        async def concurrent_save():
+            await transaction_open.wait()
+            await db_manager.save_device(second)
+
+        await asyncio.gather(failing_transaction(), concurrent_save())
+
+        assert await db_manager.get_device(first.device_id) is None
+        assert await db_manager.get_device(second.device_id) is not None
+
     async def test_update_device_status(self, db_manager, sample_device):
         """Test updating device status."""
         await db_manager.save_device(sample_device)
 
-        await db_manager.update_device_status(sample_device.device_id, "updating")
+        updated = await db_manager.update_device_status(sample_device.device_id, "updating")
+
+        assert updated is True
+        device = await db_manager.get_device(sample_device.device_id)
+        assert device.current_status == "updating"
+
+    async def test_update_nonexistent_device_status(self, db_manager):
+        """Test that updating a missing device reports no change."""
+        updated = await db_manager.update_device_status("NONEXISTENT", "updating")
+        assert updated is False
+
+    async def test_json_columns_stored_as_blobs(self, db_manager, sample_device):
+        """Test that JSON columns hold raw encoded bytes."""
+        await db_manager.save_device(sample_device)
+
+        async with db_manager._connection.execute(
+            "SELECT typeof(identity_data), typeof(inventory_data) FROM devices"
+        ) as cursor:
+            row = await cursor.fetchone()
+
+        assert tuple(row) == ("blob", "blob")
+
+    async def test_reads_legacy_text_json_columns(self, db_manager, sample_device):
+        """Test that TEXT JSON written by older versions still loads."""
+        await db_manager.save_device(sample_device)
+        await db_manager._connection.execute(
+            "UPDATE devices SET identity_data = ?, inventory_data = ?",
+            ('{"mac": "AA:BB:CC:DD:EE:FF"}', '{"device_type": "old"}')
+        )
+        await db_manager._connection.commit()
+
+        device = await db_manager.get_device(sample_device.device_id)
+
+        assert device.identity_data == {"mac": "AA:BB:CC:DD:EE:FF"}
+        assert device.inventory_data == {"device_type": "old"}
+
+    async def test_update_device_inventory(self, db_manager, sample_device):
+        """Test that the narrow inventory update only touches inventory."""
+        await db_manager.save_device(sample_device)
+
+        updated = await db_manager.update_device_inventory(
+            sample_device.device_id, {"device_type": "test-device", "cpu_load": 42}
+        )
 
+        assert updated is True
         device = await db_manager.get_device(sample_device.device_id)
+        assert device.inventory_data == {"device_type": "test-device", "cpu_load": 42}
+        assert device.rsa_private_key == sample_device.rsa_private_key
+        assert await db_manager.update_device_inventory("NONEXISTENT", {}) is False
+
+    async def test_reads_see_committed_writes(self, temp_db_path, sample_device):
+        """Test that pooled readers see writes made on the writer connection."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.connect()
+        await manager.save_device(sample_device)
+        await manager.update_device_status(sample_device.device_id, "updating")
+
+        device = await manager.get_device(sample_device.device_id)
         assert device.current_status == "updating"
+        await manager.close()
+
+    async def test_reader_connections_are_read_only(self, temp_db_path):
+        """Test that pooled reader connections reject writes."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.connect()
+        async with manager._reader() as conn:
+            assert conn is not manager._connection
+            with pytest.raises(Exception, match="readonly"):
+                await conn.execute("DELETE FROM devices")
+        await manager.close()
+
+    async def test_in_memory_database_skips_reader_pool(self, db_manager, sample_device):
+        """Test that in-memory databases read through the writer connection."""
+        assert db_manager._reader_connections == []
+        await db_manager.save_device(sample_device)
+
+        async with db_manager._reader() as conn:
+            assert conn is db_manager._connection
+        assert await db_manager.get_device(sample_device.device_id) is not None
+
+    async def test_without_reader_pool(self, temp_db_path, sample_device):
+        """Test that reader_count=0 reads through the writer connection."""
+        manager = DatabaseManager(temp_db_path, reader_count=0)
+        await manager.connect()
+        await manager.save_device(sample_device)
+
+        assert await manager.count_devices() == 1
+        await manager.close()
+
+    async def test_update_last_poll_is_buffered(self, db_manager, sample_device):
+        """Test that last poll updates are written on flush."""
+        await db_manager.save_device(sample_device)
+
+        await db_manager.update_last_poll(sample_device.device_id)
+        device = await db_manager.get_device(sample_device.device_id)
+        assert device.last_poll is None
+
+        await db_manager.flush_pending_polls()
+        device = await db_manager.get_device(sample_device.device_id)
+        assert device.last_poll is not None
+
+    async def test_close_flushes_last_poll(self, temp_db_path, sample_device):
+        """Test that buffered last poll updates survive close()."""
+        manager = DatabaseManager(temp_db_path)
+        await manager.connect()
+        await manager.save_device(sample_device)
+        await manager.update_last_poll(sample_device.device_id)
+        await manager.close()
+
+        manager = DatabaseManager(temp_db_path)
+        await manager.connect()
+        device = await manager.get_device(sample_device.device_id)
+        await manager.close()
+
+        assert device.last_poll is not None
+
+    async def test_failed_poll_flush_keeps_batch(self, temp_db_path, sample_devices, monkeypatch):
+        """Test that a failed flush re-buffers its polls without overwriting newer ones."""
+        manager = DatabaseManager(temp_db_path, poll_flush_interval=3600)
+        await manager.connect()
+        first, second = sample_devices
+        manager._pending_polls = {first.device_id: "old", second.device_id: "old"}
+
+        async def failing_executemany(sql, params):
+            manager._pending_polls[first.device_id] = "newer"
+            raise RuntimeError("disk I/O error")
+
+        monkeypatch.setattr(manager._connection, "executemany", failing_executemany)
+        with pytest.raises(RuntimeError):
+            await manager.flush_pending_polls()
+        monkeypatch.undo()
+
+        assert manager._pending_polls == {first.device_id: "newer", second.device_id: "old"}
+        await manager.close()
+
+    async def test_cancelled_poll_flush_keeps_batch(self, db_manager, sample_device):
+        """Test that cancelling a flush waiting for the writer loses nothing."""
+        await db_manager.update_last_poll(sample_device.device_id)
+
+        async with db_manager._write_lock:
+            flush = asyncio.create_task(db_manager.flush_pending_polls())
+            await asyncio.sleep(0)
+            flush.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await flush
+
+        assert sample_device.device_id in db_manager._pending_polls
+
+    async def test_single_row_updates_without_returning(
+        self, db_manager, sample_device, monkeypatch
+    ):
+        """Test the fallback for SQLite libraries older than 3.35 (no RETURNING)."""
+        monkeypatch.setattr(database, "_SUPPORTS_RETURNING", False)
+        await db_manager.save_device(sample_device)
+
+        assert await db_manager.update_device_status(sample_device.device_id, "updating") is True
+        assert await db_manager.update_device_status("NONEXISTENT", "updating") is False
+        assert await db_manager.delete_device(sample_device.device_id) is True
+        assert await db_manager.delete_device(sample_device.device_id) is False
 
-    @pytest.mark.asyncio
     async def test_delete_device(self, db_manager, sample_device):
         """Test deleting a device."""
         await db_manager.save_device(sample_device)
@@ -127,13 +420,11 @@ class TestDatabaseManager:
         device = await db_manager.get_device(sample_device.device_id)
         assert device is None
 
-    @pytest.mark.asyncio
     async def test_delete_nonexistent_device(self, db_manager):
         """Test deleting a device that doesn't exist."""
         deleted = await db_manager.delete_device("NONEXISTENT")
         assert deleted is False
 
-    @pytest.mark.asyncio
     async def test_count_devices(self, db_manager, sample_device):
         """Test counting devices."""
         assert await db_manager.count_devices() == 0
@@ -141,11 +432,8 @@ class TestDatabaseManager:
         await db_manager.save_device(sample_device)
         assert await db_manager.count_devices() == 1
 
-    @pytest.mark.asyncio
     async def test_count_devices_by_industry(self, db_manager, sample_device):
         """Test counting devices grouped by industry."""
-        await db_manager.save_device(sample_device)
-
         device2 = Device(
             device_id="TEST-002",
             identity_data={},
@@ -153,17 +441,51 @@ class TestDatabaseManager:
             rsa_public_key="key",
             industry_profile="automotive"
         )
-        await db_manager.save_device(device2)
+        await db_manager.save_devices_bulk([sample_device, device2])
 
         counts = await db_manager.count_devices_by_industry()
 
         assert counts.get("automotive") == 2
 
 
+class TestDeviceModel:
+    """Tests for Device (de)serialization."""
+
+    def test_round_trip(self, sample_device):
+        """Test that to_dict/from_dict preserve JSON columns."""
+        sample_device.inventory_data = {"device_type": "test-device", "cpu_load": 12.5}
+        restored = Device.from_dict(sample_device.to_dict())
+
+        assert restored.identity_data == sample_device.identity_data
+        assert restored.inventory_data == sample_device.inventory_data
+
+    def test_reads_stdlib_formatted_rows(self, sample_device):
+        """Test that rows written with stdlib json still load."""
+        data = sample_device.to_dict()
+        data["identity_data"] = '{"mac": "AA:BB:CC:DD:EE:FF"}'
+
+        assert Device.from_dict(data).identity_data == {"mac": "AA:BB:CC:DD:EE:FF"}
+
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need 3.10+")
+    def test_models_are_slotted(self, sample_device):
+        """Test that model instances use __slots__ instead of a __dict__."""
+        status = DeploymentStatus(
+            device_id="TEST-001",
+            deployment_id="deploy-001",
+            artifact_name="v2.0.0",
+            status="downloading"
+        )
+        assert not hasattr(sample_device, "__dict__")
+        assert not hasattr(status, "__dict__")
+
+    def test_identity_string_format_is_stable(self, sample_device):
+        """Test that the identity string keeps stdlib json formatting."""
+        assert sample_device.get_identity_string() == '{"mac": "AA:BB:CC:DD:EE:FF"}'
+
+
 class TestDeploymentStatus:
     """Tests for deployment status operations."""
 
-    @pytest.mark.asyncio
     async def test_save_deployment_status(self, db_manager, sample_device):
         """Test saving deployment status."""
         await db_manager.save_device(sample_device)
@@ -186,7 +508,142 @@ class TestDeploymentStatus:
         assert retrieved.status == "downloading"
         assert retrieved.progress == 50
 
-    @pytest.mark.asyncio
+    async def test_update_deployment_progress(self, db_manager, sample_device):
+        """Test the narrow status/progress update of a deployment record."""
+        await db_manager.save_device(sample_device)
+        await db_manager.save_deployment_status(DeploymentStatus(
+            device_id=sample_device.device_id,
+            deployment_id="deploy-001",
+            artifact_name="v2.0.0",
+            status="downloading"
+        ))
+
+        updated = await db_manager.update_deployment_progress(
+            sample_device.device_id, "deploy-001", "downloading", 60
+        )
+
+        assert updated is True
+        status = await db_manager.get_deployment_status(sample_device.device_id, "deploy-001")
+        assert status.progress == 60
+        assert status.artifact_name == "v2.0.0"
+        assert await db_manager.update_deployment_progress(
+            sample_device.device_id, "missing", "installing", 0
+        ) is False
+
+    async def test_queued_progress_is_coalesced(self, temp_db_path, sample_device):
+        """Test that queued progress ticks are written once, latest value wins."""
+        manager = DatabaseManager(temp_db_path, progress_flush_interval=3600)
+        await manager.connect()
+        await manager.save_device(sample_device)
+        await manager.save_deployment_status(DeploymentStatus(
+            device_id=sample_device.device_id,
+            deployment_id="deploy-001",
+            artifact_name="v2.0.0",
+            status="downloading"
+        ))
+
+        for progress in (10, 20, 30):
+            await manager.queue_deployment_progress(
+                sample_device.device_id, "deploy-001", "downloading", progress
+            )
+        status = await manager.get_deployment_status(sample_device.device_id, "deploy-001")
+        assert status.progress == 0
+
+        await manager.close()
+
+        manager = DatabaseManager(temp_db_path)
+        await manager.connect()
+        status = await manager.get_deployment_status(sample_device.device_id, "deploy-001")
+        await manager.close()
+        assert status.progress == 30
+
+    async def test_save_supersedes_queued_progress(self, temp_db_path, sample_device):
+        """Test that a full save is not overwritten by stale queued progress."""
+        manager = DatabaseManager(temp_db_path, progress_flush_interval=3600)
+        await manager.connect()
+        await manager.save_device(sample_device)
+        status = DeploymentStatus(
+            device_id=sample_device.device_id,
+            deployment_id="deploy-001",
+            artifact_name="v2.0.0",
+            status="downloading"
+        )
+        await manager.save_deployment_status(status)
+        await manager.queue_deployment_progress(
+            sample_device.device_id, "deploy-001", "rebooting", 100
+        )
+
+        status.status = "success"
+        status.progress = 100
+        await manager.save_deployment_status(status)
+        await manager.flush_pending_progress()
+
+        saved = await manager.get_deployment_status(sample_device.device_id, "deploy-001")
+        await manager.close()
+        assert saved.status == "success"
+
+    async def test_failed_progress_flush_keeps_batch(self, temp_db_path, monkeypatch):
+        """Test that a failed flush re-buffers progress and schedules a retry."""
+        manager = DatabaseManager(temp_db_path, progress_flush_interval=3600)
+        await manager.connect()
+        manager._pending_progress = {("TEST-001", "deploy-001"): ("downloading", 25)}
+        manager._progress_queued.clear()
+
+        async def failing_executemany(sql, params):
+            manager._pending_progress[("TEST-001", "deploy-001")] = ("downloading", 100)
+            raise RuntimeError("disk I/O error")
+
+        monkeypatch.setattr(manager._connection, "executemany", failing_executemany)
+        with pytest.raises(RuntimeError):
+            await manager.flush_pending_progress()
+        monkeypatch.undo()
+
+        assert manager._pending_progress == {("TEST-001", "deploy-001"): ("downloading", 100)}
+        assert manager._progress_queued.is_set()
+        await manager.close()
+
+    async def test_progress_flusher_idles_until_progress_is_queued(self, temp_db_path, monkeypatch):
+        """Test that the progress flush loop only wakes up for queued progress."""
+        manager = DatabaseManager(temp_db_path, progress_flush_interval=0.001)
+        flushes = []
+
+        async def counting_flush():
+            flushes.append(dict(manager._pending_progress))
+
+        monkeypatch.setattr(manager, "flush_pending_progress", counting_flush)
+        await manager.connect()
+
+        await asyncio.sleep(0.05)
+        assert flushes == []
+
+        await manager.queue_deployment_progress("TEST-001", "deploy-001", "downloading", 25)
+        await asyncio.sleep(0.05)
+        assert flushes == [{("TEST-001", "deploy-001"): ("downloading", 25)}]
+
+        monkeypatch.undo()
+        manager._pending_progress.clear()
+        await manager.close()
+
+    async def test_save_deployment_statuses_bulk(self, db_manager, sample_device):
+        """Test saving a wave of deployment status transitions at once."""
+        await db_manager.save_device(sample_device)
+        statuses = [
+            DeploymentStatus(
+                device_id=sample_device.device_id,
+                deployment_id=f"deploy-{i:03d}",
+                artifact_name="v2.0.0",
+                status="installing"
+            )
+            for i in range(3)
+        ]
+
+        await db_manager.save_deployment_statuses_bulk(statuses)
+
+        active = await db_manager.get_active_deployments()
+        assert sorted(s.deployment_id for s in active) == [
+            "deploy-000", "deploy-001", "deploy-002"
+        ]
+
     async def test_get_active_deployments(self, db_manager, sample_device):
         """Test getting active deployments."""
         await db_manager.save_device(sample_device)
@@ -213,3 +670,12 @@ class TestDeploymentStatus:
 
         assert len(active) == 1
         assert active[0].deployment_id == "deploy-001"
+
+    async def test_active_deployments_use_partial_index(self, db_manager):
+        """Test that the active deployments query is served by the partial index."""
+        async with db_manager._connection.execute(
+            "EXPLAIN QUERY PLAN " + database._ACTIVE_DEPLOYMENTS_SQL
+        ) as cursor:
+            plan = " ".join(str(row[-1]) for row in await cursor.fetchall())
+
+        assert "idx_deployment_active" in plan
@@ -0,0 +1,360 @@
+"""Tests for the device simulator."""
+
+import pytest
+import asyncio
+import orjson
+
+from mender_simulator.client.deployments import Deployment
+from mender_simulator.client.exceptions import AuthenticationError
+from mender_simulator.db.models import Device
+from mender_simulator.simulation import device_simulator
+from mender_simulator.simulation.device_simulator import (
+    DeviceSimulator,
+    _failure_log_messages,
+    _failure_logs_payload
+)
+from mender_simulator.simulation.profiles import IndustryProfile
+from mender_simulator.utils.config import load_config
+from mender_simulator.utils.crypto import generate_rsa_keypair
+
+
+@pytest.fixture
+def simulator(sample_config_yaml):
+    """Create a simulator for a single device (no database)."""
+    config = load_config(str(sample_config_yaml))
+    device = Device(
+        device_id="VIN-TEST-000001",
+        identity_data={"vin": "TEST0000000000001"},
+        rsa_private_key="",
+        rsa_public_key="",
+        industry_profile="automotive",
+        inventory_data={"device_type": "test-automotive", "artifact_name": "v1.0.0"}
+    )
+    profile = IndustryProfile(config.industries["automotive"])
+    return DeviceSimulator(device, profile, config, db=None)
+
+
+@pytest.fixture(scope="module")
+def keypair():
+    """One RSA keypair shared by the tests in this module."""
+    return generate_rsa_keypair(2048)
+
+
+def make_deployment(deployment_id="deploy-001", artifact_name="v1.1.0"):
+    """Create a deployment as returned by the deployments client."""
+    return Deployment(
+        id=deployment_id,
+        artifact_name=artifact_name,
+        artifact_uri="https://test.mender.io/artifact",
+        artifact_size=1024
+    )
+
+
+class FakeDatabase:
+    """Records buffered deployment progress writes."""
+
+    def __init__(self):
+        self.progress = []
+        self.saved = []
+
+    async def queue_deployment_progress(self, device_id, deployment_id, status, progress):
+        self.progress.append((status, progress))
+
+    async def update_device_auth_token(self, device_id, token):
+        return True
+
+    async def save_deployment_status(self, status):
+        self.saved.append(("status", status.status))
+
+    async def save_device(self, device):
+        self.saved.append(("device", device.inventory_data["artifact_name"]))
+
+
+class FakeInventoryClient:
+    """Records inventory updates without any network I/O."""
+
+    def __init__(self):
+        self.sent = []
+
+    async def update_inventory(self, token, inventory_data, device_id=None):
+        self.sent.append(dict(inventory_data))
+        return True
+
+    async def close(self):
+        pass
+
+
+class FakeDeploymentsClient:
+    """Accepts deployment status updates without any network I/O."""
+
+    def __init__(self):
+        self.states = []
+
+    async def update_deployment_status(self, token, deployment_id, state, substate=None):
+        self.states.append(state)
+        return True
+
+    async def close(self):
+        pass
+
+
+class SlowAuthClient:
+    """Tracks how many token requests run at the same time."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.signing_keys = []
+
+    async def get_valid_token(self, device_id, identity_data, public_key_pem,
+                              private_key_pem, signing_key=None):
+        self.signing_keys.append(signing_key)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        return f"token-{device_id}"
+
+
+class TestFailureLogs:
+    """Tests for generated failure logs."""
+
+    def test_failure_logs_content(self):
+        """Test that failure logs mention the artifact and the error."""
+        timestamp = "2024-01-01T00:00:00.000000Z"
+        logs = orjson.loads(_failure_logs_payload("v1.1.0", "Disk full", timestamp))["messages"]
+
+        assert len(logs) == 6
+        assert logs[0]["message"] == "Starting update to v1.1.0"
+        assert logs[3] == {
+            "timestamp": timestamp,
+            "level": "error",
+            "message": "Update failed: Disk full"
+        }
+        assert all(log["timestamp"] == timestamp for log in logs)
+
+    def test_error_message_with_braces(self):
+        """Test that error messages are inserted verbatim."""
+        messages = _failure_log_messages("v1.1.0", "bad {value}")
+        assert messages[3] == ("error", "Update failed: bad {value}")
+
+    def test_failure_logs_payload_matches_messages(self):
+        """Test that the pre-encoded payload equals encoding the log lines."""
+        error = 'Quote " and \\ backslash'
+        timestamp = "2024-01-01T00:00:00.000000Z"
+
+        payload = _failure_logs_payload("v1.1.0", error, timestamp)
+
+        assert orjson.loads(payload) == {"messages": [
+            {"timestamp": timestamp, "level": level, "message": message}
+            for level, message in _failure_log_messages("v1.1.0", error)
+        ]}
+
+    def test_failure_messages_are_memoized(self):
+        """Test that identical failures reuse the formatted lines."""
+        first = _failure_log_messages("v9.9.9", "Checksum mismatch")
+        second = _failure_log_messages("v9.9.9", "Checksum mismatch")
+        assert first is second
+
+        payload = _failure_logs_payload("v9.9.9", "Checksum mismatch", "2024-01-01T00:00:00Z")
+        logs = orjson.loads(payload)["messages"]
+        assert [log["message"] for log in logs] == [message for _, message in first]
+
+
+class TestDeploymentStatusReuse:
+    """Tests for reusing the per-device deployment status object."""
+
+    def test_status_is_reset_for_each_deployment(self, simulator):
+        """Test that one status object is reused and fully reset."""
+        first = simulator._reset_status(make_deployment("deploy-001"))
+        first.status = "failure"
+        first.progress = 100
+        first.error_message = "Disk full"
+
+        second = simulator._reset_status(make_deployment("deploy-002", "v1.2.0"))
+
+        assert second is first
+        assert second.deployment_id == "deploy-002"
+        assert second.artifact_name == "v1.2.0"
+        assert second.status == "downloading"
+        assert second.progress == 0
+        assert second.completed_at is None
+        assert second.error_message is None
+
+
+class TestDownloadStage:
+    """Tests for the simulated download stage."""
+
+    async def test_download_writes_progress_checkpoints(self, simulator, monkeypatch):
+        """Test that the download sleeps its full time and writes few updates."""
+        slept = []
+
+        async def fake_sleep(delay):
+            slept.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        simulator.db = FakeDatabase()
+        simulator.deployments_client = FakeDeploymentsClient()
+        deployment = make_deployment()
+        status = simulator._reset_status(deployment)
+
+        await simulator._stage_downloading(deployment, status)
+
+        download_time = max(simulator.profile.calculate_download_time(1024), 2.0)
+        assert sum(slept) == pytest.approx(download_time)
+        assert simulator.db.progress == [("downloading", 25), ("downloading", 100)]
+
+
+class TestStartup:
+    """Tests for startup staggering and auth concurrency."""
+
+    def test_startup_jitter_defaults_to_poll_interval(self, simulator):
+        """Test that the first poll is spread over one poll interval."""
+        assert simulator.startup_jitter == simulator.config.server.poll_interval
+
+    async def test_start_waits_for_jitter_before_authenticating(self, simulator, monkeypatch):
+        """Test that the jitter delay runs before the initial authentication."""
+        events = []
+
+        async def fake_sleep(delay):
+            events.append(("sleep", delay))
+
+        async def fake_authenticate():
+            events.append(("auth", None))
+            simulator._running = False
+            return True
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        monkeypatch.setattr(simulator, "_authenticate", fake_authenticate)
+        monkeypatch.setattr(simulator, "_cleanup", FakeDeploymentsClient().close)
+
+        await simulator.start()
+
+        assert events[0][0] == "sleep"
+        assert 0 <= events[0][1] <= simulator.startup_jitter
+        assert events[1] == ("auth", None)
+
+    async def test_forced_poll_is_passed_on(self, simulator, monkeypatch):
+        """Test that the cycle after force_poll() asks the server unconditionally."""
+        forced = []
+
+        async def fake_authenticate():
+            return True
+
+        async def fake_poll_cycle(force=False):
+            forced.append(force)
+            # Wake the loop up right away; it stops after the second cycle
+            simulator._running = len(forced) < 2
+            simulator.force_poll()
+
+        simulator.startup_jitter = 0
+        monkeypatch.setattr(simulator, "_authenticate", fake_authenticate)
+        monkeypatch.setattr(simulator, "_poll_cycle", fake_poll_cycle)
+        monkeypatch.setattr(simulator, "_cleanup", FakeDeploymentsClient().close)
+
+        await simulator.start()
+
+        assert forced == [False, True]
+
+    async def test_auth_semaphore_caps_concurrency(self, sample_config_yaml, keypair):
+        """Test that a shared semaphore bounds concurrent authentications."""
+        config = load_config(str(sample_config_yaml))
+        profile = IndustryProfile(config.industries["automotive"])
+        auth_client = SlowAuthClient()
+        semaphore = asyncio.Semaphore(2)
+        simulators = [
+            DeviceSimulator(
+                Device(
+                    device_id=f"VIN-{i}",
+                    identity_data={},
+                    rsa_private_key=keypair[0],
+                    rsa_public_key=keypair[1],
+                    industry_profile="automotive"
+                ),
+                profile,
+                config,
+                FakeDatabase(),
+                auth_client=auth_client,
+                auth_semaphore=semaphore
+            )
+            for i in range(6)
+        ]
+
+        results = await asyncio.gather(*(sim._authenticate() for sim in simulators))
+
+        assert all(results)
+        assert auth_client.max_active == 2
+
+    async def test_private_key_parsed_once(self, simulator, keypair):
+        """Test that the PEM is parsed on first auth and reused afterwards."""
+        simulator.device.rsa_private_key, simulator.device.rsa_public_key = keypair
+        simulator.auth_client = SlowAuthClient()
+        simulator.db = FakeDatabase()
+
+        await simulator._authenticate()
+        await simulator._authenticate()
+
+        first, second = simulator.auth_client.signing_keys
+        assert first is not None
+        assert second is first
+
+
+class TestRandomness:
+    """Tests for the per-device random number generator."""
+
+    def test_rng_is_seeded_per_device(self, simulator, sample_config_yaml):
+        """Test that simulators of the same device in one run draw the same sequence."""
+        config = load_config(str(sample_config_yaml))
+        twin = DeviceSimulator(simulator.device, simulator.profile, config, db=None)
+
+        assert simulator._rng is not twin._rng
+        assert [simulator._rng.random() for _ in range(3)] == [twin._rng.random() for _ in range(3)]
+
+    def test_rng_differs_between_runs(self, simulator, sample_config_yaml, monkeypatch):
+        """Test that a restart (new process seed) gives the device a new sequence."""
+        config = load_config(str(sample_config_yaml))
+        monkeypatch.setattr(device_simulator, "_PROCESS_SEED", device_simulator._PROCESS_SEED + 1)
+        restarted = DeviceSimulator(simulator.device, simulator.profile, config, db=None)
+
+        assert [simulator._rng.random() for _ in range(3)] != [
+            restarted._rng.random() for _ in range(3)
+        ]
+
+
+class TestSuccessStage:
+    """Tests for the final success stage."""
+
+    async def test_success_reports_persists_and_updates_inventory(self, simulator):
+        """Test that every success side effect happens with the new artifact."""
+        simulator.db = FakeDatabase()
+        simulator.deployments_client = FakeDeploymentsClient()
+        simulator.inventory_client = FakeInventoryClient()
+        deployment = make_deployment(artifact_name="test-automotive-v1.1.0")
+        status = simulator._reset_status(deployment)
+
+        await simulator._stage_success(deployment, status)
+
+        assert simulator.deployments_client.states[-1].value == "success"
+        assert sorted(simulator.db.saved) == [
+            ("device", "test-automotive-v1.1.0"),
+            ("status", "success"),
+        ]
+        assert simulator.inventory_client.sent[0]["rootfs-image.version"] == "test-automotive-v1.1.0"
+        assert status.completed_at is not None
+
+    async def test_failing_side_effect_keeps_success(self, simulator):
+        """Test that an inventory error after the update doesn't report a failure."""
+        class ExpiredInventoryClient(FakeInventoryClient):
+            async def update_inventory(self, token, inventory_data, device_id=None):
+                raise AuthenticationError("Token expired")
+
+        simulator.db = FakeDatabase()
+        simulator.deployments_client = FakeDeploymentsClient()
+        simulator.inventory_client = ExpiredInventoryClient()
+        deployment = make_deployment(artifact_name="test-automotive-v1.1.0")
+        status = simulator._reset_status(deployment)
+
+        await simulator._stage_success(deployment, status)
+
+        assert [state.value for state in simulator.deployments_client.states] == ["success"]
+        assert ("status", "success") in simulator.db.saved
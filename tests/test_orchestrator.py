@@ -0,0 +1,96 @@
+"""Tests for the fleet orchestrator."""
+
+import pytest
+import time
+
+from mender_simulator.db.database import DatabaseManager
+from mender_simulator.main import _KEYGEN_MP_CONTEXT, FleetOrchestrator, _keygen_pool
+from mender_simulator.simulation.profiles import IndustryProfile
+from mender_simulator.utils.config import load_config
+from mender_simulator.utils.crypto import sign_data, verify_signature
+
+
+class TestDeviceCreation:
+    """Tests for creating new devices."""
+
+    async def test_create_devices_generates_keys_and_saves(self, sample_config_yaml, temp_db_path):
+        """Test that new devices get distinct working keys and are persisted."""
+        config = load_config(str(sample_config_yaml))
+        orchestrator = FleetOrchestrator(config)
+        orchestrator.db = DatabaseManager(temp_db_path)
+        await orchestrator.db.connect()
+
+        profile = IndustryProfile(config.industries["automotive"])
+        devices = await orchestrator._create_devices(profile, 2, 5)
+
+        assert [d.device_id for d in devices] == [
+            "VIN-automotive-000005", "VIN-automotive-000006"
+        ]
+        assert devices[0].rsa_private_key != devices[1].rsa_private_key
+        for device in devices:
+            signature = sign_data(device.rsa_private_key, b"data")
+            assert verify_signature(device.rsa_public_key, b"data", signature)
+        assert await orchestrator.db.count_devices() == 2
+
+        await orchestrator.db.close()
+
+    async def test_initialize_devices_creates_missing_only(self, sample_config_yaml, temp_db_path):
+        """Test that initialization tops industries up to their configured count."""
+        config = load_config(str(sample_config_yaml))
+        db = DatabaseManager(temp_db_path)
+        await db.connect()
+
+        first = FleetOrchestrator(config)
+        first.db = db
+        await first._initialize_devices()
+        second = FleetOrchestrator(config)
+        second.db = db
+        await second._initialize_devices()
+
+        assert len(first.simulators) == 2
+        assert len(second.simulators) == 2
+        assert await db.count_devices() == 2
+        assert sorted(s.device.device_id for s in second.simulators) == sorted(
+            s.device.device_id for s in first.simulators
+        )
+
+        await db.close()
+
+
+class TestShutdown:
+    """Tests for stopping the orchestrator."""
+
+    async def test_repeated_shutdown_signals_stop_once(self, sample_config_yaml):
+        """Test that several signals schedule a single shutdown."""
+        orchestrator = FleetOrchestrator(load_config(str(sample_config_yaml)))
+
+        orchestrator.signal_shutdown()
+        first = orchestrator._stop_task
+        orchestrator.signal_shutdown()
+
+        assert orchestrator._stop_task is first
+        await first
+        assert orchestrator._shutdown_event.is_set()
+
+
+class TestKeygenPool:
+    """Tests for the key generation process pool."""
+
+    def test_workers_are_not_forked(self):
+        """Test that workers don't inherit this process's threads and locks."""
+        assert _KEYGEN_MP_CONTEXT.get_start_method() != "fork"
+
+    def test_error_cancels_queued_work_without_waiting(self):
+        """Test that leaving the pool on error doesn't wait for queued jobs."""
+        start = time.monotonic()
+        with pytest.raises(RuntimeError):
+            with _keygen_pool() as pool:
+                futures = [pool.submit(time.sleep, 0.5) for _ in range(64)]
+                raise RuntimeError("boom")
+
+        assert time.monotonic() - start < 5
+        # The pool's manager thread cancels queued jobs in the background
+        deadline = time.monotonic() + 5
+        while not futures[-1].done() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert futures[-1].cancelled()
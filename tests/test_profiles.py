@@ -1,17 +1,13 @@
 """Tests for industry profiles."""
 
 import pytest
-import sys
-import os
-
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import random
 
 from mender_simulator.simulation.profiles import IndustryProfile
 from mender_simulator.utils.config import IndustryConfig
 
 
-@pytest.fixture
-def automotive_config():
+def make_automotive_config():
     """Create automotive industry config."""
     return IndustryConfig(
         name="automotive",
@@ -32,8 +28,7 @@ def automotive_config():
     )
 
 
-@pytest.fixture
-def medical_config():
+def make_medical_config():
     """Create medical industry config."""
     return IndustryConfig(
         name="medical",
@@ -53,25 +48,116 @@ def medical_config():
     )
 
 
+@pytest.fixture
+def automotive_config():
+    """Fresh automotive config, for tests that modify it."""
+    return make_automotive_config()
+
+
+@pytest.fixture
+def medical_config():
+    """Fresh medical config, for tests that modify it."""
+    return make_medical_config()
+
+
+@pytest.fixture(scope="module")
+def automotive_profile():
+    """Automotive profile shared by the read-only tests of this module."""
+    return IndustryProfile(make_automotive_config())
+
+
+@pytest.fixture(scope="module")
+def medical_profile():
+    """Medical profile shared by the read-only tests of this module."""
+    return IndustryProfile(make_medical_config())
+
+
 class TestIndustryProfile:
     """Tests for IndustryProfile."""
 
-    def test_generate_automotive_identity(self, automotive_config):
+    def test_generate_automotive_identity(self, automotive_profile):
         """Test automotive identity generation."""
-        profile = IndustryProfile(automotive_config)
-
-        identity = profile.generate_device_identity(0)
+        identity = automotive_profile.generate_device_identity(0)
 
         assert "mac" in identity
         assert "vin" in identity
         assert "device_type" not in identity  # device_type is inventory only
         assert len(identity["vin"]) == 17  # VIN is 17 characters
 
-    def test_generate_medical_identity(self, medical_config):
-        """Test medical device identity generation."""
-        profile = IndustryProfile(medical_config)
+    def test_generated_mac_format(self, medical_profile):
+        """Test that MACs are six upper-case hex pairs."""
+        for _ in range(20):
+            mac = medical_profile.generate_device_identity(0)["mac"]
+            parts = mac.split(":")
+            assert len(parts) == 6
+            assert all(len(p) == 2 and p == p.upper() and int(p, 16) < 256 for p in parts)
+
+    def test_generate_macs_batch(self, medical_profile):
+        """Test batched MAC generation format and uniqueness."""
+        macs = medical_profile.generate_macs_batch(500)
+
+        assert len(macs) == 500
+        assert len(set(macs)) == 500
+        for mac in macs:
+            parts = mac.split(":")
+            assert len(parts) == 6
+            assert all(len(p) == 2 and p == p.upper() and int(p, 16) < 256 for p in parts)
+
+    def test_identities_span_mac_batches(self, medical_profile):
+        """Test that identities keep unique MACs across pool refills."""
+        identities = medical_profile.generate_device_identities(range(600))
+
+        assert len({identity["mac"] for identity in identities}) == 600
+
+    def test_smart_buildings_mac_uses_oui(self):
+        """Test that smart building MACs are an OUI prefix plus three hex pairs."""
+        config = IndustryConfig(
+            name="smart_buildings",
+            enabled=True,
+            count=1,
+            bandwidth_kbps=1000,
+            id_prefix="BMS",
+            id_format="BMS-{serial}",
+            inventory={"device_type": "bms-controller"},
+            extra_config={"oui_prefixes": ["00:1A:2B"]}
+        )
+        profile = IndustryProfile(config)
+
+        identity = profile.generate_device_identity(3)
+
+        assert identity["serial_number"] == "BMS00000003"
+        parts = identity["mac"].split(":")
+        assert parts[:3] == ["00", "1A", "2B"]
+        assert len(parts) == 6
+        assert all(len(p) == 2 and p == p.upper() and int(p, 16) < 256 for p in parts[3:])
+
+    def test_vin_layout(self, automotive_config):
+        """Test VIN composition for standard and non-standard inputs."""
+        profile = IndustryProfile(automotive_config)
+
+        vin = profile.generate_device_identity(42)["vin"]
+        assert vin[7:] == "0000420000"
+
+        long_vin = profile.generate_device_identity(12345678)["vin"]
+        assert len(long_vin) == 17
+        assert long_vin[7:15] == "12345678"
 
-        identity = profile.generate_device_identity(0)
+        automotive_config.extra_config = {"manufacturers": ["ABC"]}
+        short = IndustryProfile(automotive_config).generate_device_identity(7)["vin"]
+        assert short.startswith("ABC")
+        assert short[4:] == "0000070000000"
+
+    def test_choice_pools_are_frozen(self, automotive_config):
+        """Test that later config edits don't change an existing profile's pools."""
+        profile = IndustryProfile(automotive_config)
+
+        automotive_config.extra_config["manufacturers"].append("ZZZZZZ")
+
+        assert profile._manufacturers == ("WVWZZZ", "3VWDP7")
+
+    def test_generate_medical_identity(self, medical_profile):
+        """Test medical device identity generation."""
+        identity = medical_profile.generate_device_identity(0)
 
         # Medical identity only has mac and serial_number
         assert "mac" in identity
@@ -80,21 +166,75 @@ class TestIndustryProfile:
         # fda_udi is NOT in identity (moved to inventory)
         assert "fda_udi" not in identity
 
-    def test_generate_unique_identities(self, automotive_config):
+    def test_generate_unique_identities(self, automotive_profile):
         """Test that identities are unique."""
-        profile = IndustryProfile(automotive_config)
-
-        identities = [profile.generate_device_identity(i) for i in range(10)]
-        vins = [id["vin"] for id in identities]
+        count = 1000
+        vins = {automotive_profile.generate_device_identity(i)["vin"] for i in range(count)}
 
         # All VINs should be unique
-        assert len(set(vins)) == len(vins)
+        assert len(vins) == count
 
-    def test_generate_static_inventory(self, automotive_config):
-        """Test static inventory generation."""
+    def test_generate_device_identities_batch(self, automotive_profile):
+        """Test batch identity generation matches per-device generation."""
+        identities = automotive_profile.generate_device_identities(range(5, 8))
+
+        assert len(identities) == 3
+        assert [identity["vin"][7:13] for identity in identities] == ["000005", "000006", "000007"]
+        assert all(len(identity["vin"]) == 17 for identity in identities)
+
+    def test_batch_vins_match_single_layout(self, automotive_config):
+        """Test that batched VINs use the same layout as single generation."""
         profile = IndustryProfile(automotive_config)
 
-        inventory = profile.generate_static_inventory("TEST-001")
+        batch = profile.generate_device_identities([42, 12345678])
+
+        assert batch[0]["vin"][7:] == "0000420000"
+        assert batch[0]["vin"][:6] in ("WVWZZZ", "3VWDP7")
+        assert batch[1]["vin"][7:15] == "12345678"
+        assert len(batch[1]["vin"]) == 17
+        assert len({identity["mac"] for identity in batch}) == 2
+
+        automotive_config.extra_config = {"manufacturers": ["ABC"]}
+        short = IndustryProfile(automotive_config).generate_device_identities([7])
+        assert short[0]["vin"][4:] == "0000070000000"
+
+    def test_profile_does_not_consume_global_random(self, automotive_profile):
+        """Test that profiles draw from their own generator."""
+        state = random.getstate()
+
+        automotive_profile.generate_device_identity(0)
+        automotive_profile.update_telemetry(automotive_profile.generate_static_inventory("TEST-001"))
+        automotive_profile.calculate_download_time(1024)
+
+        assert random.getstate() == state
+
+    def test_unknown_industry_uses_generic_handlers(self):
+        """Test that industries without specific handlers still work."""
+        config = IndustryConfig(
+            name="agriculture",
+            enabled=True,
+            count=1,
+            bandwidth_kbps=100,
+            id_prefix="AGR",
+            id_format="AGR-{serial}",
+            inventory={"device_type": "sensor", "artifact_name": "v1.0.0"}
+        )
+        profile = IndustryProfile(config)
+
+        identity = profile.generate_device_identity(3)
+        inventory = profile.update_telemetry(profile.generate_static_inventory("AGR-1"))
+
+        assert identity["serial"] == "DEV-00000003"
+        assert inventory["artifact_name"] == "sensor-v1.0.0"
+        assert "last_seen" in inventory
+
+    def test_profile_is_slotted(self, automotive_profile):
+        """Test that profiles store their state in __slots__."""
+        assert not hasattr(automotive_profile, "__dict__")
+
+    def test_generate_static_inventory(self, automotive_profile):
+        """Test static inventory generation."""
+        inventory = automotive_profile.generate_static_inventory("TEST-001")
 
         assert inventory["device_id"] == "TEST-001"
         assert inventory["industry"] == "automotive"
@@ -103,11 +243,79 @@ class TestIndustryProfile:
         # last_seen is telemetry, not in static inventory
         assert "last_seen" not in inventory
 
-    def test_generate_static_inventory_enrichment(self, automotive_config):
-        """Test that industry-specific static attributes are added."""
+    def test_static_inventories_are_independent(self, automotive_profile):
+        """Test that devices don't share (or leak into) the inventory template."""
+        first = automotive_profile.generate_static_inventory("TEST-001", poll_interval=10)
+        first["artifact_name"] = "tcu-4g-lte-v2.0.0"
+        second = automotive_profile.generate_static_inventory("TEST-002", poll_interval=20)
+
+        assert second["device_id"] == "TEST-002"
+        assert second["poll_interval_seconds"] == 20
+        assert second["artifact_name"] == "tcu-4g-lte-v1.0.0"
+        assert second["rootfs-image.version"] == "tcu-4g-lte-v1.0.0"
+
+    def test_create_device(self, automotive_config):
+        """Test that create_device builds identity and full initial inventory."""
         profile = IndustryProfile(automotive_config)
 
-        inventory = profile.generate_static_inventory("TEST-001")
+        identity, inventory = profile.create_device(42, poll_interval=15, now_iso="2024-01-01T00:00:00")
+
+        assert "vin" in identity
+        assert inventory["device_id"] == f"{automotive_config.id_prefix}-automotive-000042"
+        assert inventory["poll_interval_seconds"] == 15
+        assert inventory["last_seen"] == "2024-01-01T00:00:00"
+        # Static enrichment and telemetry both ran on the new inventory
+        assert "oem_variant" in inventory
+        assert "odometer_km" in inventory
+        assert "odometer_km" not in profile._inventory_template
+
+    def test_create_devices_batch(self, automotive_profile):
+        """Test that create_devices matches create_device for a batch."""
+        created = automotive_profile.create_devices(
+            range(3, 6), poll_interval=15, now_iso="2024-01-01T00:00:00"
+        )
+
+        assert [inv["device_id"] for _, inv in created] == [
+            "VIN-automotive-000003", "VIN-automotive-000004", "VIN-automotive-000005"
+        ]
+        single_identity, single_inventory = automotive_profile.create_device(3, 15, "2024-01-01T00:00:00")
+        for identity, inventory in created:
+            assert set(identity) == set(single_identity)
+            assert set(inventory) == set(single_inventory)
+            assert inventory["last_seen"] == "2024-01-01T00:00:00"
+
+    @pytest.mark.parametrize("industry", ["industrial_iot", "retail"])
+    def test_batch_static_enrichment(self, industry):
+        """Test that batch enrichers produce the same attributes and ranges as single ones."""
+        config = IndustryConfig(
+            name=industry,
+            enabled=True,
+            count=1,
+            bandwidth_kbps=250,
+            id_prefix="DEV",
+            id_format="DEV-{serial}",
+            inventory={"device_type": "test"}
+        )
+        profile = IndustryProfile(config)
+
+        batch = profile.generate_static_inventories([f"DEV-{i}" for i in range(100)])
+        single = profile.generate_static_inventory("DEV-X")
+
+        for inventory in batch:
+            assert set(inventory) == set(single)
+            for key, value in inventory.items():
+                assert type(value) is type(single[key])
+        if industry == "retail":
+            assert all(1000 <= int(inv["store_id"]) <= 9999 for inv in batch)
+            assert {inv["receipt_printer"] for inv in batch} == {True, False}
+        else:
+            assert all(1 <= int(inv["line"][1:]) <= 10 for inv in batch)
+            assert all(0 <= int(inv["unit"][1:]) <= 99 for inv in batch)
+            assert {inv["plc_connected"] for inv in batch} == {True, False}
+
+    def test_generate_static_inventory_enrichment(self, automotive_profile):
+        """Test that industry-specific static attributes are added."""
+        inventory = automotive_profile.generate_static_inventory("TEST-001")
 
         # Automotive-specific static attributes
         assert "oem_variant" in inventory
@@ -115,12 +323,39 @@ class TestIndustryProfile:
         # battery_voltage is telemetry, not in static inventory
         assert "battery_voltage" not in inventory
 
-    def test_update_telemetry(self, automotive_config):
-        """Test telemetry update adds dynamic attributes."""
-        profile = IndustryProfile(automotive_config)
+    def test_config_pools_override_defaults(self):
+        """Test that configured choice pools replace the built-in defaults."""
+        config = IndustryConfig(
+            name="industrial_iot",
+            enabled=True,
+            count=1,
+            bandwidth_kbps=250,
+            id_prefix="IND",
+            id_format="IND-{serial}",
+            inventory={"protocols": ["opcua"]},
+            extra_config={"plants": ["PLANT-Z"]}
+        )
+        profile = IndustryProfile(config)
+
+        inventory = profile.generate_static_inventory("IND-1")
 
-        inventory = profile.generate_static_inventory("TEST-001")
-        inventory = profile.update_telemetry(inventory)
+        assert inventory["plant_id"] == "PLANT-Z"
+        assert inventory["supported_protocols"] == ["opcua"]
+        # Reported as a JSON boolean, not 0/1
+        assert inventory["plc_connected"] in (True, False)
+        assert isinstance(inventory["plc_connected"], bool)
+
+    def test_medical_static_defaults(self, medical_profile):
+        """Test static medical attributes with the default pools."""
+        inventory = medical_profile.generate_static_inventory("MED-1")
+
+        assert inventory["fda_device_class"] in ("II", "III")
+        assert isinstance(inventory["compliance_standards"], list)
+
+    def test_update_telemetry(self, automotive_profile):
+        """Test telemetry update adds dynamic attributes."""
+        inventory = automotive_profile.generate_static_inventory("TEST-001")
+        inventory = automotive_profile.update_telemetry(inventory)
 
         # Dynamic attributes should be present
         # Note: Mender is NOT real-time telemetry, only device status
@@ -128,20 +363,77 @@ class TestIndustryProfile:
         assert "odometer_km" in inventory
 
 
+    def test_update_telemetry_with_shared_timestamp(self, automotive_profile):
+        """Test that a caller-provided tick timestamp is used as last_seen."""
+        inventory = automotive_profile.update_telemetry(
+            automotive_profile.generate_static_inventory("TEST-001"), now_iso="2024-01-01T00:00:00"
+        )
+
+        assert inventory["last_seen"] == "2024-01-01T00:00:00"
+
+    def test_update_telemetry_default_timestamp_is_shared(self, automotive_profile):
+        """Test that devices updated within one second share the cached last_seen string."""
+        first = automotive_profile.update_telemetry(automotive_profile.generate_static_inventory("TEST-001"))
+        second = automotive_profile.update_telemetry(automotive_profile.generate_static_inventory("TEST-002"))
+
+        # Second precision, e.g. 2024-01-01T00:00:00
+        assert len(first["last_seen"]) == 19
+        assert first["last_seen"] <= second["last_seen"]
+        if first["last_seen"] == second["last_seen"]:
+            assert first["last_seen"] is second["last_seen"]
+
+    def test_update_telemetry_batch(self, automotive_profile):
+        """Test that a batch update touches every inventory consistently."""
+        inventories = [automotive_profile.generate_static_inventory(f"TEST-{i}") for i in range(3)]
+        odometers = [inv["odometer_km"] for inv in inventories]
+
+        automotive_profile.update_telemetry_batch(inventories)
+
+        assert len({inv["last_seen"] for inv in inventories}) == 1
+        assert all(
+            inv["odometer_km"] >= before for inv, before in zip(inventories, odometers)
+        )
+
+    def test_update_telemetry_batch_draw_ranges(self):
+        """Test that bulk-drawn telemetry stays within the per-device ranges."""
+        config = IndustryConfig(
+            name="industrial_iot",
+            enabled=True,
+            count=1,
+            bandwidth_kbps=1000,
+            id_prefix="IND",
+            id_format="IND-{serial}",
+            inventory={"device_type": "plc-gateway"}
+        )
+        profile = IndustryProfile(config)
+        inventories = [{"uptime_hours": 10} for _ in range(200)]
+
+        profile.update_telemetry_batch(inventories, now_iso="2024-01-01T00:00:00")
+
+        assert all(10.5 <= inv["uptime_hours"] <= 11 for inv in inventories)
+        assert all(inv["last_seen"] == "2024-01-01T00:00:00" for inv in inventories)
+
 class TestDownloadTimeCalculation:
     """Tests for download time calculation."""
 
-    def test_calculate_download_time(self, automotive_config):
+    def test_calculate_download_time(self, automotive_profile):
         """Test download time calculation."""
-        profile = IndustryProfile(automotive_config)
-
         # 500 KB/s bandwidth, 5MB file = ~10 seconds
         artifact_size = 5 * 1024 * 1024  # 5 MB
-        download_time = profile.calculate_download_time(artifact_size)
+        download_time = automotive_profile.calculate_download_time(artifact_size)
 
         # Should be approximately 10 seconds (with jitter)
         assert 9 < download_time < 12
 
+    def test_calculate_download_time_jitter_bounds(self, automotive_profile):
+        """Test that jitter stays within ±10% of the nominal time."""
+        nominal = 500 * 1024 * 10
+
+        times = [automotive_profile.calculate_download_time(nominal) for _ in range(200)]
+
+        assert all(9.0 <= t <= 11.0 for t in times)
+        assert len(set(times)) > 1
+
     def test_calculate_download_time_zero_bandwidth(self):
         """Test handling of zero bandwidth."""
         config = IndustryConfig(
@@ -159,12 +451,10 @@ class TestDownloadTimeCalculation:
 
         assert download_time == 1.0  # Default minimum
 
-    def test_calculate_download_time_small_file(self, automotive_config):
+    def test_calculate_download_time_small_file(self, automotive_profile):
         """Test download time for small files."""
-        profile = IndustryProfile(automotive_config)
-
         # Very small file
-        download_time = profile.calculate_download_time(1024)
+        download_time = automotive_profile.calculate_download_time(1024)
 
         # Should be very quick
         assert download_time < 1
@@ -173,15 +463,17 @@ class TestDownloadTimeCalculation:
 class TestSuccessProbability:
     """Tests for success probability."""
 
-    def test_medical_higher_success_rate(self, medical_config):
+    def test_medical_higher_success_rate(self, medical_profile):
         """Test that medical devices have higher success rate."""
-        profile = IndustryProfile(medical_config)
-        assert profile.get_success_probability() == 0.95
+        assert medical_profile.get_success_probability() == 0.95
 
-    def test_automotive_default_success_rate(self, automotive_config):
+    def test_automotive_default_success_rate(self, automotive_profile):
         """Test default success rate for automotive."""
-        profile = IndustryProfile(automotive_config)
-        assert profile.get_success_probability() == 0.80
+        assert automotive_profile.get_success_probability() == 0.80
+
+    def test_success_probability_attribute(self, medical_profile):
+        """Test that the probability is resolved once into an attribute."""
+        assert medical_profile.success_probability == medical_profile.get_success_probability()
 
     def test_industrial_lower_success_rate(self):
         """Test that industrial devices have lower success rate."""
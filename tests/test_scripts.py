@@ -1,6 +1,7 @@
 """Tests for bash scripts."""
 
 import os
+import stat
 import subprocess
 import tempfile
 import pytest
@@ -8,211 +9,184 @@ import pytest
 
 SCRIPTS_DIR = os.path.join(os.path.dirname(__file__), '..', 'scripts')
 
+# Environment of the test run without a Mender Personal Access Token
+ENV_WITHOUT_PAT = {k: v for k, v in os.environ.items() if k != 'MENDER_PAT'}
+
+# Documented in the usage text of cleanup-devices.sh
+EXPECTED_ACTIONS = (
+    'list',
+    'list-pending',
+    'list-accepted',
+    'list-rejected',
+    'list-noauth',
+    'decommission-all',
+    'decommission-pending',
+    'decommission-accepted',
+    'decommission-rejected',
+    'decommission-noauth',
+    'cleanup-local'
+)
+
+# Documented in the usage text of create-demo-artifacts.sh
+EXPECTED_INDUSTRIES = (
+    'automotive',
+    'smart_buildings',
+    'medical',
+    'industrial_iot',
+    'retail',
+    'all'
+)
+EXPECTED_DEVICE_TYPES = (
+    'tcu-4g-lte',
+    'bms-controller-hvac',
+    'patient-monitor-icu',
+    'plc-gateway-modbus',
+    'pos-terminal-emv'
+)
+
+
+@pytest.fixture(scope="session")
+def run_script():
+    """
+    Run a script and capture its output, memoized per invocation.
+
+    Several tests only inspect the output of the same command (e.g. the
+    usage text), so each distinct (script, args, env, cwd) runs once.
+    """
+    cache = {}
+
+    def _run(script_path, *args, env=None, cwd=None):
+        key = (
+            script_path,
+            args,
+            tuple(sorted(env.items())) if env is not None else None,
+            cwd
+        )
+        if key not in cache:
+            cache[key] = subprocess.run(
+                [script_path, *args],
+                capture_output=True,
+                text=True,
+                env=env,
+                cwd=cwd
+            )
+        return cache[key]
+
+    return _run
+
+
+@pytest.fixture(scope="session")
+def script_stat():
+    """os.stat() of a script, taken once per path and shared by the file checks."""
+    cache = {}
+
+    def _stat(script_path):
+        if script_path not in cache:
+            cache[script_path] = os.stat(script_path)
+        return cache[script_path]
+
+    return _stat
+
 
 class TestCleanupDevicesScript:
     """Tests for cleanup-devices.sh script."""
 
-    @property
-    def script_path(self):
-        return os.path.join(SCRIPTS_DIR, 'cleanup-devices.sh')
+    script_path = os.path.join(SCRIPTS_DIR, 'cleanup-devices.sh')
 
-    def test_script_exists(self):
+    def test_script_exists(self, script_stat):
         """Test that the script exists."""
-        assert os.path.exists(self.script_path)
+        assert stat.S_ISREG(script_stat(self.script_path).st_mode)
 
-    def test_script_is_executable(self):
+    def test_script_is_executable(self, script_stat):
         """Test that the script is executable."""
-        assert os.access(self.script_path, os.X_OK)
+        assert script_stat(self.script_path).st_mode & stat.S_IXUSR
 
-    def test_usage_without_arguments(self):
+    def test_usage_without_arguments(self, run_script):
         """Test that script shows usage without arguments."""
-        result = subprocess.run(
-            [self.script_path],
-            capture_output=True,
-            text=True
-        )
+        result = run_script(self.script_path)
         assert result.returncode == 1
         assert "Usage:" in result.stdout
         assert "Actions:" in result.stdout
         assert "list" in result.stdout
         assert "decommission-all" in result.stdout
 
-    def test_unknown_action(self):
+    def test_unknown_action(self, run_script):
         """Test that script handles unknown actions."""
-        result = subprocess.run(
-            [self.script_path, 'unknown-action'],
-            capture_output=True,
-            text=True
-        )
+        result = run_script(self.script_path, 'unknown-action')
         assert result.returncode == 1
         assert "Unknown action" in result.stdout
 
-    def test_list_without_pat_shows_error(self):
-        """Test that list action without PAT shows error."""
-        env = os.environ.copy()
-        env.pop('MENDER_PAT', None)
-
-        result = subprocess.run(
-            [self.script_path, 'list'],
-            capture_output=True,
-            text=True,
-            env=env
-        )
+    @pytest.mark.parametrize("action", ["list", "list-pending", "decommission-pending"])
+    def test_action_without_pat_shows_error(self, run_script, action):
+        """Test that API actions without PAT show an error."""
+        result = run_script(self.script_path, action, env=ENV_WITHOUT_PAT)
         assert result.returncode == 1
         assert "MENDER_PAT" in result.stdout
         assert "Personal Access Token" in result.stdout
 
-    def test_list_pending_without_pat_shows_error(self):
-        """Test that list-pending action without PAT shows error."""
-        env = os.environ.copy()
-        env.pop('MENDER_PAT', None)
-
-        result = subprocess.run(
-            [self.script_path, 'list-pending'],
-            capture_output=True,
-            text=True,
-            env=env
-        )
-        assert result.returncode == 1
-        assert "MENDER_PAT" in result.stdout
-
-    def test_decommission_without_pat_shows_error(self):
-        """Test that decommission action without PAT shows error."""
-        env = os.environ.copy()
-        env.pop('MENDER_PAT', None)
-
-        result = subprocess.run(
-            [self.script_path, 'decommission-pending'],
-            capture_output=True,
-            text=True,
-            env=env
-        )
-        assert result.returncode == 1
-        assert "MENDER_PAT" in result.stdout
-
-    def test_cleanup_local_no_files(self):
+    def test_cleanup_local_no_files(self, run_script):
         """Test cleanup-local when no files exist."""
         with tempfile.TemporaryDirectory() as tmpdir:
-            result = subprocess.run(
-                [self.script_path, 'cleanup-local'],
-                capture_output=True,
-                text=True,
-                cwd=tmpdir
-            )
+            result = run_script(self.script_path, 'cleanup-local', cwd=tmpdir)
             assert result.returncode == 0
             assert "No database files found" in result.stdout
             assert "Local cleanup complete" in result.stdout
 
-    def test_usage_shows_all_actions(self):
+    def test_usage_shows_all_actions(self, run_script):
         """Test that usage shows all documented actions."""
-        result = subprocess.run(
-            [self.script_path],
-            capture_output=True,
-            text=True
-        )
-        expected_actions = [
-            'list',
-            'list-pending',
-            'list-accepted',
-            'list-rejected',
-            'list-noauth',
-            'decommission-all',
-            'decommission-pending',
-            'decommission-accepted',
-            'decommission-rejected',
-            'decommission-noauth',
-            'cleanup-local'
-        ]
-        for action in expected_actions:
+        result = run_script(self.script_path)
+        for action in EXPECTED_ACTIONS:
             assert action in result.stdout, f"Missing action: {action}"
 
 
 class TestCreateDemoArtifactsScript:
     """Tests for create-demo-artifacts.sh script."""
 
-    @property
-    def script_path(self):
-        return os.path.join(SCRIPTS_DIR, 'create-demo-artifacts.sh')
+    script_path = os.path.join(SCRIPTS_DIR, 'create-demo-artifacts.sh')
 
-    def test_script_exists(self):
+    def test_script_exists(self, script_stat):
         """Test that the script exists."""
-        assert os.path.exists(self.script_path)
+        assert stat.S_ISREG(script_stat(self.script_path).st_mode)
 
-    def test_script_is_executable(self):
+    def test_script_is_executable(self, script_stat):
         """Test that the script is executable."""
-        assert os.access(self.script_path, os.X_OK)
+        assert script_stat(self.script_path).st_mode & stat.S_IXUSR
 
-    def test_usage_without_arguments(self):
+    def test_usage_without_arguments(self, run_script):
         """Test that script shows usage without arguments."""
-        result = subprocess.run(
-            [self.script_path],
-            capture_output=True,
-            text=True
-        )
+        result = run_script(self.script_path)
         assert result.returncode == 1
         assert "Usage:" in result.stdout
         assert "Industries:" in result.stdout
 
-    def test_usage_shows_all_industries(self):
+    def test_usage_shows_all_industries(self, run_script):
         """Test that usage shows all industries."""
-        result = subprocess.run(
-            [self.script_path],
-            capture_output=True,
-            text=True
-        )
-        expected_industries = [
-            'automotive',
-            'smart_buildings',
-            'medical',
-            'industrial_iot',
-            'retail',
-            'all'
-        ]
-        for industry in expected_industries:
+        result = run_script(self.script_path)
+        for industry in EXPECTED_INDUSTRIES:
             assert industry in result.stdout, f"Missing industry: {industry}"
 
-    def test_usage_shows_device_types(self):
+    def test_usage_shows_device_types(self, run_script):
         """Test that usage shows device types."""
-        result = subprocess.run(
-            [self.script_path],
-            capture_output=True,
-            text=True
-        )
-        expected_device_types = [
-            'tcu-4g-lte',
-            'bms-controller-hvac',
-            'patient-monitor-icu',
-            'plc-gateway-modbus',
-            'pos-terminal-emv'
-        ]
-        for device_type in expected_device_types:
+        result = run_script(self.script_path)
+        for device_type in EXPECTED_DEVICE_TYPES:
             assert device_type in result.stdout, f"Missing device type: {device_type}"
 
-    def test_unknown_industry_shows_error(self):
+    def test_unknown_industry_shows_error(self, run_script):
         """Test that script handles unknown industries."""
-        result = subprocess.run(
-            [self.script_path, 'unknown-industry'],
-            capture_output=True,
-            text=True
-        )
+        result = run_script(self.script_path, 'unknown-industry')
         # Script will fail if mender-artifact not installed (expected in CI)
         # or show unknown industry error
         assert result.returncode != 0
         # Either mender-artifact not found or unknown industry
         assert "mender-artifact" in result.stdout or "Unknown industry" in result.stdout
 
-    def test_mender_artifact_check(self):
+    def test_mender_artifact_check(self, run_script):
         """Test behavior when mender-artifact is not installed."""
         # Create a modified PATH that doesn't include mender-artifact
         env = os.environ.copy()
         env['PATH'] = '/usr/bin:/bin'  # Minimal PATH
 
-        result = subprocess.run(
-            [self.script_path, 'automotive'],
-            capture_output=True,
-            text=True,
-            env=env
-        )
+        result = run_script(self.script_path, 'automotive', env=env)
 
         # Should fail with helpful message about mender-artifact
         if result.returncode != 0:
@@ -0,0 +1,34 @@
+"""Tests for cached timestamp helpers."""
+
+from datetime import datetime, timedelta
+
+from mender_simulator.utils.timestamps import isoformat, now_iso, now_rfc3339, utcnow
+
+
+class TestTimestamps:
+    """Tests for the per-second timestamp cache."""
+
+    def test_utcnow_is_cached_within_a_second(self):
+        """Test that repeated calls return the same cached datetime."""
+        first = utcnow()
+        second = utcnow()
+        assert first.microsecond == 0
+        assert second is first or second > first
+
+    def test_now_iso_matches_utcnow(self):
+        """Test that now_iso() is the ISO form of utcnow()."""
+        assert datetime.fromisoformat(now_iso()) >= utcnow() - timedelta(seconds=1)
+
+    def test_now_rfc3339_format(self):
+        """Test the RFC 3339 string has microseconds and a Z suffix."""
+        value = now_rfc3339()
+        assert value.endswith("Z")
+        parsed = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
+        assert abs((datetime.utcnow() - parsed).total_seconds()) < 2
+
+    def test_isoformat_matches_datetime_isoformat(self):
+        """Test that isoformat() agrees with datetime.isoformat()."""
+        cached = utcnow()
+        other = datetime(2024, 1, 2, 3, 4, 5, 678)
+        assert isoformat(cached) == cached.isoformat()
+        assert isoformat(other) == other.isoformat()